@@ -3,37 +3,130 @@
 FastAPI backend for Nikolay.ai Hack Event Registration
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, EmailStr
-import mysql.connector
-from mysql.connector import Error
 from datetime import datetime
+import asyncio
+import csv
+import io
+import json
 import os
+import time
 from dotenv import load_dotenv
 import uvicorn
 
+from db import PoolExhaustedError
+from metrics import CONTENT_TYPE, MetricsMiddleware, Registry, SharedMetrics, add_request_db_time
+from page_cache import CachedPage, CachedStaticFiles
+from migrations import LATEST_VERSION
+from storage import REGISTRATION_FIELDS, create_store, db_config_from_env, decode_cursor, encode_cursor
+from write_behind import QueueFullError, RegistrationWriteBehind
+
 # Load environment variables
 load_dotenv()
 
 # Initialize FastAPI app
 app = FastAPI(title="Nikolay.ai Hack Event Registration", description="API for hack event registration")
 
-# Mount static files
-app.mount("/assets", StaticFiles(directory="assets"), name="assets")
+# Per-route latency, in-flight requests and DB time, served on /metrics
+metrics_registry = Registry()
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+db_query_seconds = metrics_registry.histogram(
+    "db_query_duration_seconds", "Time holding a pooled connection, by store operation", ("operation",))
+db_query_errors = metrics_registry.counter(
+    "db_query_errors_total", "Store operations that raised, by operation", ("operation",))
+startup_seconds = metrics_registry.gauge(
+    "app_startup_duration_seconds", "Time the startup hook took before serving requests")
+
+# Mount static files with cache headers (ETag, 304 and Range come from Starlette)
+ASSET_MAX_AGE = int(os.getenv("ASSET_MAX_AGE", "86400"))
+app.mount("/assets", CachedStaticFiles(directory="assets", max_age=ASSET_MAX_AGE), name="assets")
 
 # Setup templates
 templates = Jinja2Templates(directory="templates")
 
+# Invitation page held in memory, reloaded when the file changes
+PAGE_MAX_AGE = int(os.getenv("PAGE_MAX_AGE", "60"))
+invitation_page = CachedPage("hack_event_invitation.html", max_age=PAGE_MAX_AGE)
+
 # Database configuration
-db_config = {
-    'host': os.getenv("DB_HOST", "localhost"),
-    'user': os.getenv("DB_USER", "root"),
-    'password': os.getenv("DB_PASSWORD", ""),
-    'database': os.getenv("DB_NAME", "nikolay_hack_event")
-}
+db_config = db_config_from_env()
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+# Write-behind mode: acknowledge signups from memory and persist them in batches
+WRITE_BEHIND = os.getenv("REGISTRATION_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "0.5"))
+
+# Optional in-process news regeneration (cron expression, e.g. "0 9 * * 1")
+NEWS_SCHEDULE = os.getenv("NEWS_SCHEDULE", "")
+NEWS_SCHEDULE_JITTER = float(os.getenv("NEWS_SCHEDULE_JITTER", "0"))
+NEWS_SCHEDULE_CATCH_UP = os.getenv("NEWS_SCHEDULE_CATCH_UP", "once")
+
+# Registration storage backend (DB_BACKEND=mysql or sqlite)
+store = create_store(db_config)
+
+# Shared connection pool, created once at startup
+db_pool = None
+news_scheduler = None
+
+# Registration queue, created at startup when WRITE_BEHIND is enabled
+write_behind = None
+
+# Readiness check budget for the database round trip
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+
+# The schema is migrated by "python migrations.py" before the app starts;
+# DB_AUTO_MIGRATE=1 applies pending migrations at startup instead (local runs)
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "").lower() in ("1", "true", "yes")
+schema_version = None
+schema_check = None
+
+# Multi-worker serving (serve.py): the master process does the one-time
+# startup work and creates state shared by the workers it forks; only one
+# worker runs the news scheduler. Each worker shares its metrics through
+# metrics_dir so whichever worker answers /metrics reports all of them
+startup_done = False
+shared_emails = None
+shared_emails_warm = False
+run_scheduler = True
+worker_index = None
+metrics_dir = None
+shared_metrics = None
+shared_metrics_task = None
+
+# Runs on the pool's executor threads after every store operation
+def observe_db_query(operation, seconds, ok):
+    db_query_seconds.observe(seconds, operation=operation)
+    if not ok:
+        db_query_errors.inc(operation=operation)
+
+# Pool and queue metrics are read from their stats() at scrape time
+def pool_metric(key):
+    return lambda: db_pool.stats()[key] if db_pool is not None else None
+
+def queue_metric(key):
+    return lambda: write_behind.stats()[key] if write_behind is not None else None
+
+for _name, _key, _kind, _help in (
+    ("db_pool_size", "size", "gauge", "Maximum pooled connections"),
+    ("db_pool_connections_open", "open", "gauge", "Open pooled connections"),
+    ("db_pool_connections_in_use", "in_use", "gauge", "Connections checked out"),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Connection checkouts"),
+    ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out waiting for a connection"),
+    ("db_pool_connect_failures_total", "connect_failures", "counter", "Failed attempts to open a connection"),
+):
+    metrics_registry.callback(_name, _help, pool_metric(_key), kind=_kind)
+metrics_registry.callback("db_pool_wait_seconds_max", "Longest checkout wait",
+                          lambda: db_pool.stats()["wait_time_max_ms"] / 1000 if db_pool is not None else None)
+metrics_registry.callback("write_behind_pending", "Registrations waiting to be flushed", queue_metric("pending"))
+metrics_registry.callback("write_behind_flush_failures_total", "Failed write-behind flushes",
+                          queue_metric("flush_failures"), kind="counter")
 
 # Pydantic model for registration
 class Registration(BaseModel):
@@ -41,116 +134,327 @@ class Registration(BaseModel):
     name: str = None
     organization: str = None
 
-# Database connection function
-def get_db_connection():
+# Record the schema version, warning when migrations are pending
+def note_schema_version(version, warn=True):
+    global schema_version
+    schema_version = version
+    if warn and version < LATEST_VERSION:
+        print(f"Warning: Database schema is at version {version}, expected {LATEST_VERSION}. "
+              f"Run: python migrations.py")
+
+# Read the schema version through the pool, off the startup path
+async def check_schema(warn=True):
     try:
-        connection = mysql.connector.connect(**db_config)
-        return connection
-    except Error as e:
-        print(f"Error connecting to MySQL Database: {e}")
-        return None
-
-# Create database and table if they don't exist
-def setup_database():
-    connection = get_db_connection()
-    if connection is None:
-        return False
-    
-    cursor = connection.cursor()
+        note_schema_version(await db_pool.run(store.schema_version), warn)
+    except (PoolExhaustedError, store.Error) as e:
+        print(f"Warning: Could not read the database schema version: {e}")
+
+# One-time startup work for serve.py, run in its master process before any
+# worker is forked, so workers inherit the results instead of repeating them
+def prepare_workers(email_capacity=1_000_000):
+    global startup_done, shared_emails, shared_emails_warm
+    from shared_state import SharedCounter, SharedEmailSet
     
     try:
-        # Create database if it doesn't exist
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_config['database']}")
-        cursor.execute(f"USE {db_config['database']}")
-        
-        # Create registrations table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS registrations (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                email VARCHAR(255) NOT NULL UNIQUE,
-                name VARCHAR(255),
-                organization VARCHAR(255),
-                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        connection.commit()
-        return True
-    except Error as e:
-        print(f"Error setting up database: {e}")
-        return False
-    finally:
-        cursor.close()
-        connection.close()
+        invitation_page.get()
+    except FileNotFoundError:
+        print("Warning: hack_event_invitation.html not found. Run generate_invitation.py first.")
+    if DB_AUTO_MIGRATE and not store.setup():
+        print("Warning: Failed to migrate the database. Registration functionality may not work.")
+    try:
+        connection = store.connect()
+        try:
+            note_schema_version(store.schema_version(connection))
+        finally:
+            connection.close()
+    except store.Error as e:
+        print(f"Warning: Could not read the database schema version: {e}")
+    
+    # A swap in one worker makes the others reload the page straight away
+    invitation_page.generation = SharedCounter()
+    
+    if WRITE_BEHIND:
+        shared_emails = SharedEmailSet(email_capacity)
+        try:
+            connection = store.connect()
+            try:
+                shared_emails.update(store.load_emails(connection))
+            finally:
+                connection.close()
+            shared_emails_warm = True
+        except (store.Error, OverflowError) as e:
+            print(f"Warning: Could not load registered emails ({e}). Each worker will load them.")
+    startup_done = True
 
 # Root endpoint to serve the HTML invitation
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    # Read the HTML invitation file
+    # Serve the cached invitation, precompressed and with ETag/304 handling
     try:
-        with open("hack_event_invitation.html", "r", encoding="utf-8") as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content)
+        return invitation_page.response(request)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="HTML invitation file not found")
 
-# Registration endpoint
-@app.post("/api/register")
-async def register(registration: Registration):
-    connection = get_db_connection()
-    if connection is None:
+# Run a query function on a pooled connection without blocking the event loop
+async def run_db(fn, *args):
+    if db_pool is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    cursor = connection.cursor()
-    
+    started = time.perf_counter()
     try:
-        # Check if email already exists
-        cursor.execute("SELECT id FROM registrations WHERE email = %s", (registration.email,))
-        if cursor.fetchone():
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Insert new registration
-        query = "INSERT INTO registrations (email, name, organization) VALUES (%s, %s, %s)"
-        cursor.execute(query, (registration.email, registration.name, registration.organization))
-        connection.commit()
-        
-        return {"message": "Registration successful", "status": "success"}
-    except Error as e:
-        connection.rollback()
+        return await db_pool.run(fn, *args)
+    except PoolExhaustedError:
+        raise HTTPException(status_code=503, detail="Database busy, please try again")
+    except store.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     finally:
-        cursor.close()
-        connection.close()
+        add_request_db_time(time.perf_counter() - started)
 
-# Get all registrations (admin endpoint)
-@app.get("/api/registrations")
-async def get_registrations():
-    connection = get_db_connection()
-    if connection is None:
+# Stream batches from a generator query function on one pooled connection.
+# The first batch is fetched up front so connection errors still map to an
+# HTTP error status before the response starts.
+async def stream_db(fn, *args):
+    if db_pool is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    cursor = connection.cursor(dictionary=True)
-    
+    batches = db_pool.stream(fn, *args)
+    started = time.perf_counter()
     try:
-        cursor.execute("SELECT * FROM registrations ORDER BY registration_date DESC")
-        registrations = cursor.fetchall()
-        return {"registrations": registrations, "count": len(registrations)}
-    except Error as e:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except PoolExhaustedError:
+        raise HTTPException(status_code=503, detail="Database busy, please try again")
+    except store.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     finally:
-        cursor.close()
-        connection.close()
+        add_request_db_time(time.perf_counter() - started)
+    
+    async def resume():
+        if first is None:
+            return
+        yield first
+        while True:
+            started = time.perf_counter()
+            try:
+                batch = await batches.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                add_request_db_time(time.perf_counter() - started)
+            yield batch
+    
+    return resume()
 
-# Health check endpoint
+# Registration endpoint
+@app.post("/api/register")
+async def register(registration: Registration):
+    if write_behind is not None:
+        try:
+            accepted = write_behind.submit(registration.email, registration.name, registration.organization)
+        except QueueFullError:
+            raise HTTPException(status_code=503, detail="Registration queue full, please try again")
+        if not accepted:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        return {"message": "Registration successful", "status": "success"}
+    
+    inserted = await run_db(
+        store.insert_registration, registration.email, registration.name, registration.organization
+    )
+    if not inserted:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return {"message": "Registration successful", "status": "success"}
+
+# Parse the comma-separated field projection
+def parse_fields(fields):
+    if not fields:
+        return REGISTRATION_FIELDS
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in REGISTRATION_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(REGISTRATION_FIELDS)}"
+        )
+    return selected
+
+# Serialize row batches as they come off the database cursor
+async def export_rows(batches, fields, export_format):
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+    async for rows in batches:
+        if export_format == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([row[f] for f in fields] for row in rows)
+            yield buffer.getvalue()
+        else:
+            yield "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+# Get registrations, newest first (admin endpoint)
+@app.get("/api/registrations")
+async def get_registrations(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str = None,
+    fields: str = None,
+    format: str = "json",
+):
+    if format not in ("json", "ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be one of: json, ndjson, csv")
+    selected = parse_fields(fields)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if format == "json":
+        registrations, next_after = await run_db(store.fetch_registrations_page, limit, after, selected)
+        return {
+            "registrations": registrations,
+            "count": len(registrations),
+            "next_cursor": encode_cursor(next_after) if next_after else None,
+        }
+    
+    # Streaming export of every row after the cursor, in constant memory
+    batches = await stream_db(store.iter_registrations, after, selected)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_rows(batches, selected, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=registrations.{format}"},
+    )
+
+# Connection pool metrics
+@app.get("/api/db/pool")
+async def pool_stats():
+    if db_pool is None:
+        raise HTTPException(status_code=503, detail="Database pool not initialized")
+    return db_pool.stats()
+
+# Write-behind queue metrics
+@app.get("/api/db/queue")
+async def queue_stats():
+    if write_behind is None:
+        raise HTTPException(status_code=404, detail="Write-behind mode is not enabled")
+    return write_behind.stats()
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if shared_metrics is not None:
+        return PlainTextResponse(shared_metrics.render(), media_type=CONTENT_TYPE)
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
+# Readiness check: round-trips a query through the pool, 503 if the database is unusable
+# or its schema is behind the migrations this code expects
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    checks = {}
+    if db_pool is None:
+        checks["database"] = {"status": "down", "error": "Database pool not initialized"}
+    else:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(db_pool.run(store.ping), HEALTH_CHECK_TIMEOUT)
+        except asyncio.TimeoutError:
+            checks["database"] = {"status": "down", "error": f"No response within {HEALTH_CHECK_TIMEOUT:.1f}s"}
+        except (PoolExhaustedError, store.Error) as e:
+            checks["database"] = {"status": "down", "error": str(e)}
+        else:
+            checks["database"] = {"status": "up", "latency_ms": round((time.perf_counter() - started) * 1000, 3)}
+            # Re-read until current, so readiness recovers once migrations have run
+            if schema_version is None or schema_version < LATEST_VERSION:
+                await check_schema(warn=False)
+            checks["schema"] = {
+                "status": "up" if schema_version is not None and schema_version >= LATEST_VERSION else "down",
+                "version": schema_version,
+                "latest": LATEST_VERSION,
+            }
+        checks["pool"] = db_pool.stats()
+    if write_behind is not None:
+        checks["write_behind"] = write_behind.stats()
+    
+    healthy = checks["database"]["status"] == "up" and checks["schema"]["status"] == "up"
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "timestamp": datetime.now().isoformat(),
+            "checks": checks,
+        },
+    )
 
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    if not setup_database():
-        print("Warning: Failed to set up database. Registration functionality may not work.")
+    global db_pool, write_behind, news_scheduler, schema_check, shared_metrics, shared_metrics_task
+    started = time.perf_counter()
+    # Under serve.py the master has already done this once for every worker
+    if not startup_done:
+        # Load and compress the invitation before the first request
+        try:
+            invitation_page.get()
+        except FileNotFoundError:
+            print("Warning: hack_event_invitation.html not found. Run generate_invitation.py first.")
+        
+        if DB_AUTO_MIGRATE and not await asyncio.get_running_loop().run_in_executor(None, store.setup):
+            print("Warning: Failed to migrate the database. Registration functionality may not work.")
+    
+    db_pool = store.create_pool(size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+    db_pool.observer = observe_db_query
+    if not startup_done:
+        # Serving starts without waiting on the database; the check also opens
+        # the first pooled connection
+        schema_check = asyncio.get_running_loop().create_task(check_schema())
+    
+    if WRITE_BEHIND:
+        write_behind = RegistrationWriteBehind(
+            db_pool, store,
+            batch_size=WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=WRITE_BEHIND_FLUSH_INTERVAL,
+            emails=shared_emails,
+            warm_emails=not shared_emails_warm,
+        )
+        try:
+            await write_behind.start()
+        except store.Error as e:
+            print(f"Warning: Failed to start write-behind queue ({e}). Falling back to direct inserts.")
+            write_behind = None
+    
+    if NEWS_SCHEDULE and run_scheduler:
+        # Imported lazily so the API doesn't load the generator unless asked to
+        from scheduler import CronSchedule, Scheduler, make_regeneration_job
+        try:
+            news_scheduler = Scheduler(
+                make_regeneration_job(on_page=invitation_page.swap),
+                CronSchedule(NEWS_SCHEDULE),
+                jitter=NEWS_SCHEDULE_JITTER,
+                catch_up=NEWS_SCHEDULE_CATCH_UP,
+            )
+        except ValueError as e:
+            print(f"Warning: News scheduler not started: {e}")
+        else:
+            news_scheduler.start()
+    
+    startup_seconds.set(time.perf_counter() - started)
+    
+    if metrics_dir is not None:
+        shared_metrics = SharedMetrics(metrics_registry, metrics_dir, worker_index)
+        shared_metrics_task = asyncio.get_running_loop().create_task(shared_metrics.run())
+
+# Close pooled connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    if shared_metrics_task is not None:
+        shared_metrics_task.cancel()
+    if news_scheduler is not None:
+        news_scheduler.stop(timeout=0)
+    if write_behind is not None:
+        await write_behind.stop()
+    if db_pool is not None:
+        db_pool.close()
 
+# Development server; use serve.py to run several workers in production
 if __name__ == "__main__":
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
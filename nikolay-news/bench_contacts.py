@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark contact segmentation queries on a synthetic contacts file
+Writes a contacts.json-shaped file with N contacts, loads it into a
+ContactStore, builds the indexes and reports per-query latency percentiles.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+
+from contacts import ContactStore
+from stats import percentile
+
+FIRST_NAMES = "Alex Sam Priya Wei Maria John Fatima Diego Olga Kenji Aisha Tom Elena Raj Chloe Omar".split()
+LAST_NAMES = "Smith Chen Patel Garcia Kim Novak Okafor Silva Rossi Tanaka Haddad Brown Ivanova Singh".split()
+COMPANIES = ["Waters Corporation", "Harvard University", "MIT", "Moderna", "HubSpot", "Wayfair",
+             "Akamai", "Klaviyo", "DataRobot", "Insight Global", "Boston Dynamics", "Vertex",
+             "Toast", "Draftkings", "Rapid7", "Liberty Mutual"] + [f"Startup {i}" for i in range(2000)]
+LOCATIONS = ["Boston, Massachusetts, United States", "Greater Boston", "Cambridge, Massachusetts, United States",
+             "New York, New York, United States", "San Francisco Bay Area", "Seattle, Washington, United States",
+             "Austin, Texas, United States", "London, England, United Kingdom", "Berlin, Germany", "Toronto, Canada"]
+SENIORITY = ["", "Senior ", "Staff ", "Principal ", "Lead ", "Head of "]
+ROLES = ["ML Engineer", "Machine Learning Engineer", "Data Scientist", "Software Engineer", "Product Manager",
+         "ML Lead", "AI Researcher", "Founder and CTO", "Platform Engineering Lead", "Research Scientist",
+         "Quantitative Researcher", "Solutions Architect", "Engineering Manager", "Designer"]
+TOPICS = ("llm agents inference robotics genomics fintech healthcare computer vision nlp mlops "
+          "distributed systems startups open source kubernetes pytorch rust data platforms safety "
+          "evaluation retrieval search recommendation compilers gpu").split()
+
+QUERIES = [
+    ("Boston ML leads by connections", dict(location="Boston", title="ML lead")),
+    ("Boston founders, top 20", dict(location="Boston", title="founder", limit=20)),
+    ("Company exact match", dict(company="Moderna")),
+    ("Full text: pytorch robotics", dict(text="pytorch robotics")),
+    ("Rare conjunction", dict(company="Startup 7", location="Berlin", title="principal")),
+    ("Title + text, 1k+ connections", dict(title="data scientist", text="genomics", min_connections=1000)),
+    ("No filter, top 10", dict()),
+    ("Boston designers by name", dict(location="Boston", title="designer", sort="name", limit=25)),
+]
+
+
+def synthetic_contacts(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company = rng.choice(COMPANIES)
+        title = rng.choice(SENIORITY) + rng.choice(ROLES)
+        topics = rng.sample(TOPICS, 6)
+        yield {
+            "name": f"{first} {last}",
+            "firstName": first,
+            "lastName": last,
+            "email": f"{first.lower()}.{last.lower()}.{i}@example.com",
+            "company": company,
+            "title": title,
+            "location": rng.choice(LOCATIONS),
+            "linkedin": f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{i}",
+            "headline": f"{title} at {company} | {topics[0]} and {topics[1]}",
+            "summary": f"Working on {topics[2]}, {topics[3]} and {topics[4]}. Interested in {topics[5]}.",
+            "connections": int(rng.paretovariate(1.2) * 50) % 30000,
+        }
+
+
+def write_contacts(path, count, seed=0):
+    """Stream a {"contacts": [...]} file without holding every record in memory."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"contacts": [\n')
+        for i, record in enumerate(synthetic_contacts(count, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(record))
+        f.write('\n], "metadata": {"source": "synthetic"}}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contact segmentation queries")
+    parser.add_argument("--contacts", type=int, default=1_000_000, help="Synthetic contacts (default: 1000000)")
+    parser.add_argument("--file", help="Use an existing contacts file instead of generating one")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per query (default: 200)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".json", prefix="contacts-")
+        os.close(fd)
+        started = time.perf_counter()
+        write_contacts(path, args.contacts)
+        if not args.json:
+            print(f"Wrote {args.contacts} contacts ({os.path.getsize(path) / 1e6:.0f} MB) "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+    try:
+        started = time.perf_counter()
+        store = ContactStore.from_json(path)
+        load_s = time.perf_counter() - started
+        started = time.perf_counter()
+        stats = store.stats()  # Builds the indexes
+        index_s = time.perf_counter() - started
+    finally:
+        if args.file is None:
+            os.remove(path)
+
+    results = []
+    for label, filters in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            matches = store.query(**filters)
+            samples.append((time.perf_counter() - start) * 1000)
+        results.append({
+            "query": label,
+            "results": len(matches),
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p99_ms": round(percentile(samples, 99), 3),
+        })
+
+    report = {
+        "contacts": len(store),
+        "load_s": round(load_s, 2),
+        "index_s": round(index_s, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        "index": stats,
+        "queries": results,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Loaded {report['contacts']} contacts in {report['load_s']}s, indexed in {report['index_s']}s, "
+          f"max RSS {report['max_rss_mb']} MB")
+    print(f"{'query':<32} {'results':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['query']:<32} {r['results']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass markdown renderer against the old regex chain
+Renders synthetic news reports of growing size and reports time per KB
+(flat means linear) and peak traced memory relative to the input size.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+import tracemalloc
+
+from markdown_render import render_report
+from news import NEWS_SECTIONS
+
+
+def regex_pipeline(content):
+    """Previous extract_news_content body: a dozen whole-document re.sub passes."""
+    content = re.sub(r'# AI News Weekly Report.*?---\n\n', '', content, flags=re.DOTALL)
+    content = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
+    content = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
+    content = re.sub(r'^### (.*?)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
+    content = re.sub(r'^- (.*?)$', r'<li>\1</li>', content, flags=re.MULTILINE)
+    content = re.sub(r'(<li>.*?</li>)', r'<ul>\1</ul>', content, flags=re.DOTALL)
+    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
+    content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', content)
+    content = re.sub(r'\n\n', '</p><p>', content)
+    content = f'<p>{content}</p>'
+    content = re.sub(r'<p><ul>', '<ul>', content)
+    content = re.sub(r'</ul></p>', '</ul>', content)
+    return content
+
+
+def single_pass(content):
+    return render_report(content)
+
+
+def synthetic_report(items_per_section, seed=0):
+    """Build a report shaped like the LLM output, with nested lists and links."""
+    rng = random.Random(seed)
+    words = ("model release benchmark inference open weights agents safety policy "
+             "research startup funding chips latency context multimodal").split()
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n)).capitalize()
+
+    lines = ["# AI News Weekly Report", "", "*Generated on 2025-01-01*", "", "---", ""]
+    for section in NEWS_SECTIONS:
+        lines += [f"## {section}", ""]
+        for i in range(items_per_section):
+            lines.append(f"- **{sentence(3)}**: {sentence(14)}. "
+                         f"[Source](https://example.com/{section[:4].lower()}/{i})")
+            lines.append(f"  - Key players: {sentence(4)}")
+            lines.append(f"  - Impact: *{sentence(8)}* with `v{i}.0`")
+        lines += ["", sentence(30) + ".", ""]
+    return "\n".join(lines) + "\n"
+
+
+def measure(render, content, repeat):
+    """Best wall time over ``repeat`` runs and peak traced memory for one run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    render(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown rendering")
+    parser.add_argument("--items", default="50,200,800,3200",
+                        help="Comma-separated list items per section (default: 50,200,800,3200)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for items in [int(n) for n in args.items.split(",")]:
+        content = synthetic_report(items)
+        size_kb = len(content.encode("utf-8")) / 1024
+        for name, render in (("regex", regex_pipeline), ("single_pass", single_pass)):
+            seconds, peak = measure(render, content, args.repeat)
+            results.append({
+                "renderer": name,
+                "items_per_section": items,
+                "input_kb": round(size_kb, 1),
+                "ms": round(seconds * 1000, 2),
+                "us_per_kb": round(seconds * 1e6 / size_kb, 2),
+                "peak_kb": round(peak / 1024, 1),
+                "peak_per_input": round(peak / 1024 / size_kb, 2),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'renderer':<12} {'input KB':>9} {'ms':>9} {'us/KB':>8} {'peak KB':>9} {'peak/input':>10}")
+    for r in results:
+        print(f"{r['renderer']:<12} {r['input_kb']:>9} {r['ms']:>9} {r['us_per_kb']:>8} "
+              f"{r['peak_kb']:>9} {r['peak_per_input']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+End-to-end news pipeline benchmark against the local OpenRouter stand-in
+Starts mock_openrouter.py with the requested latency and failure profile and
+times each generation mode (single request, streaming, parallel sections,
+multi-model race/ensemble and the full run_hack_event.py pipeline) in a
+throwaway working directory with the response cache off, reporting
+latency percentiles, client retries and what the mock served.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from mock_openrouter import add_server_arguments, server_options, start_server
+from stats import percentile
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ("single", "stream", "parallel", "race", "ensemble", "pipeline")
+DEFAULT_MODES = "single,stream,parallel,pipeline"
+
+
+def prepare_workdir(workdir: str):
+    """Link the invitation's assets, with empty stand-ins for any not checked out (e.g. the video)."""
+    from run_hack_event import REQUIRED_ASSETS
+
+    for asset in REQUIRED_ASSETS:
+        source, target = os.path.join(APP_DIR, asset), os.path.join(workdir, asset)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(source):
+            os.symlink(source, target)
+        else:
+            open(target, "wb").close()
+
+
+def run_once(generator, mode: str, models: List[str]) -> Dict:
+    """One generation in ``mode``; returns per-stage seconds for the pipeline."""
+    if mode == "single":
+        generator.generate_news()
+    elif mode == "stream":
+        generator.generate_news(stream=True)
+    elif mode == "parallel":
+        generator.generate_news(parallel=True)
+    elif mode in ("race", "ensemble"):
+        generator.generate_news_multi(models, strategy=mode)
+    else:
+        from run_hack_event import build_pipeline
+
+        pipeline = build_pipeline(generator)
+        pipeline.run(force=True)
+        return {entry["stage"]: entry["seconds"] for entry in pipeline.report}
+    return {}
+
+
+def bench_mode(server, mode: str, runs: int, models: List[str], max_retries: int,
+               backoff_base: float, verbose: bool) -> Dict:
+    from news import AINewsGenerator
+
+    server.reset_stats()
+    generator = AINewsGenerator(api_key="mock", use_cache=False)
+    generator.base_url = server.base_url
+    generator.client.max_retries = max_retries
+    generator.client.backoff_base = backoff_base
+    if mode in ("single", "stream", "parallel", "pipeline"):
+        generator.model = models[0]
+
+    latencies, failures = [], 0
+    stages: Dict[str, List[float]] = {}
+    try:
+        for _ in range(runs):
+            output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+            started = time.perf_counter()
+            try:
+                with output:
+                    stage_seconds = run_once(generator, mode, models)
+            except Exception as e:  # A failed run is a data point, not the end of the benchmark
+                failures += 1
+                print(f"  {mode}: run failed: {e}")
+                continue
+            latencies.append(time.perf_counter() - started)
+            for stage, seconds in stage_seconds.items():
+                stages.setdefault(stage, []).append(seconds)
+    finally:
+        generator.client.close()
+
+    result = {
+        "mode": mode,
+        "runs": runs,
+        "failures": failures,
+        "requests_sent": generator.client.requests_sent,
+        "retries": generator.client.retries,
+        "server": server.stats(),
+    }
+    if latencies:
+        result.update(
+            mean_s=round(sum(latencies) / len(latencies), 3),
+            p50_s=round(percentile(latencies, 50), 3),
+            p95_s=round(percentile(latencies, 95), 3),
+            max_s=round(max(latencies), 3),
+        )
+    if stages:
+        result["stages_mean_s"] = {stage: round(sum(values) / len(values), 3) for stage, values in stages.items()}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the news pipeline against a local OpenRouter stand-in")
+    parser.add_argument("--modes", default=DEFAULT_MODES,
+                        help=f"Comma-separated modes from {', '.join(MODES)} (default: {DEFAULT_MODES})")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode (default: 5)")
+    parser.add_argument("--models", default="mock/fast,mock/slow",
+                        help="Models for race/ensemble; the first is used by the other modes "
+                             "(default: mock/fast,mock/slow)")
+    parser.add_argument("--max-retries", type=int, default=4, help="Client retries per request (default: 4)")
+    parser.add_argument("--backoff-base", type=float, default=0.1,
+                        help="Client backoff base in seconds for 5xx retries (default: 0.1)")
+    add_server_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Show the generator's own output")
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+    models = [model for model in args.models.split(",") if model]
+    try:
+        server = start_server(**server_options(args))
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Reports, the catalog and pipeline state go to a scratch directory
+    workdir = tempfile.mkdtemp(prefix="nikolay-pipeline-")
+    prepare_workdir(workdir)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results = [bench_mode(server, mode, args.runs, models, args.max_retries, args.backoff_base, args.verbose)
+                   for mode in modes]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.shutdown()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "json", "verbose")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'mode':<10} {'p50':>8} {'p95':>8} {'max':>8} {'fail':>5} {'retries':>8} {'injected':>9}")
+    for result in results:
+        if "p50_s" in result:
+            timings = f"{result['p50_s']:7.2f}s {result['p95_s']:7.2f}s {result['max_s']:7.2f}s"
+        else:
+            timings = f"{'-':>8} {'-':>8} {'-':>8}"
+        print(f"{result['mode']:<10} {timings} {result['failures']:>5} {result['retries']:>8} "
+              f"{result['server']['injected_errors']:>9}")
+        for stage, seconds in result.get("stages_mean_s", {}).items():
+            print(f"  {stage:<20} {seconds:7.2f}s")
+    if args.output:
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark contact relevance scoring
+Vectorizes N synthetic contacts, round-trips the vector cache, then times
+scoring plus attendee/sponsor ranking against a set of synthetic reports.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bench_contacts import synthetic_contacts
+from bench_markdown import synthetic_report
+from markdown_render import strip_report_header
+from scoring import ContactVectors
+from stats import percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contact relevance scoring")
+    parser.add_argument("--contacts", type=int, default=300_000, help="Synthetic contacts (default: 300000)")
+    parser.add_argument("--reports", type=int, default=20, help="Distinct reports to score against (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    vectors = ContactVectors.build(synthetic_contacts(args.contacts))
+    build_s = time.perf_counter() - started
+
+    fd, cache_path = tempfile.mkstemp(suffix=".npz", prefix="contact-vectors-")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        vectors.save(cache_path)
+        save_s = time.perf_counter() - started
+        cache_mb = os.path.getsize(cache_path) / 1e6
+        started = time.perf_counter()
+        vectors = ContactVectors.load(cache_path)
+        load_s = time.perf_counter() - started
+    finally:
+        os.remove(cache_path)
+
+    reports = [strip_report_header(synthetic_report(20, seed)) for seed in range(args.reports)]
+    score_ms, rank_ms = [], []
+    for text in reports:
+        started = time.perf_counter()
+        scores = vectors.score(text)
+        score_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        vectors.rank(scores, "attendee", 50)
+        vectors.rank(scores, "sponsor", 50)
+        rank_ms.append((time.perf_counter() - started) * 1000)
+
+    result = {
+        "contacts": len(vectors),
+        "vocabulary": len(vectors.vocabulary),
+        "nonzeros": len(vectors.values),
+        "build_s": round(build_s, 2),
+        "cache_save_s": round(save_s, 2),
+        "cache_load_s": round(load_s, 3),
+        "cache_mb": round(cache_mb, 1),
+        "score_p50_ms": round(percentile(score_ms, 50), 2),
+        "score_p99_ms": round(percentile(score_ms, 99), 2),
+        "rank_p50_ms": round(percentile(rank_ms, 50), 2),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<14} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for app.py
+Launches uvicorn repeatedly against a SQLite database and measures the time
+from process start to the first 200 for GET / and until /api/health reports
+ready, comparing a schema that is already migrated (startup only reads the
+version) with DB_AUTO_MIGRATE=1 on a fresh database each run.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+from benchmark import APP_DIR, free_port, prepare_workdir
+from load_test import Worker
+from stats import percentile
+from storage import SQLiteRegistrationStore
+
+
+def wait_for(worker: Worker, path: str, process: subprocess.Popen, started: float, timeout: float) -> float:
+    """Seconds since ``started`` until ``path`` answers 200."""
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited with code {process.returncode} during startup")
+        try:
+            status, _ = worker.request("GET", path)
+            if status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            worker.connection = None
+        time.sleep(0.002)
+    raise RuntimeError(f"{path} did not answer 200 within {timeout:.0f}s")
+
+
+def cold_start(workdir: str, env: Dict[str, str], timeout: float) -> Dict[str, float]:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", APP_DIR,
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    worker = Worker(f"http://127.0.0.1:{port}")
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=workdir, env={**os.environ, **env},
+                               stdout=subprocess.DEVNULL)
+    try:
+        first_response = wait_for(worker, "/", process, started, timeout)
+        ready = wait_for(worker, "/api/health", process, started, timeout)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"first_response": first_response, "ready": ready}
+
+
+def summarize(samples: list) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 1),
+        "p95_ms": round(percentile(samples, 95) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+    }
+
+
+def bench(workdir: str, runs: int, auto_migrate: bool, timeout: float) -> Dict:
+    first, ready = [], []
+    db_path: Optional[str] = None
+    for run in range(runs):
+        db_path = os.path.join(workdir, f"startup-{int(auto_migrate)}-{run}.db" if auto_migrate else "startup.db")
+        if not auto_migrate and run == 0:
+            SQLiteRegistrationStore(db_path).setup()
+        env = {
+            "DB_BACKEND": "sqlite",
+            "SQLITE_PATH": db_path,
+            "DB_AUTO_MIGRATE": "1" if auto_migrate else "0",
+            "REGISTRATION_WRITE_BEHIND": "0",
+            "NEWS_SCHEDULE": "",
+        }
+        timings = cold_start(workdir, env, timeout)
+        first.append(timings["first_response"])
+        ready.append(timings["ready"])
+    return {"first_response": summarize(first), "ready": summarize(ready)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app.py cold start to first response")
+    parser.add_argument("--runs", type=int, default=10, help="Process starts per mode (default: 10)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each start (default: 30)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="nikolay-startup-")
+    try:
+        prepare_workdir(workdir)
+        # One throwaway start so every measured run sees warm OS file caches
+        bench(workdir, 1, False, args.timeout)
+        results = {
+            "runs": args.runs,
+            "version_check": bench(workdir, args.runs, False, args.timeout),
+            "auto_migrate": bench(workdir, args.runs, True, args.timeout),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<14} {'first GET / p50':>16} {'p95':>8} {'ready p50':>10} {'p95':>8}")
+    for mode in ("version_check", "auto_migrate"):
+        first, ready = results[mode]["first_response"], results[mode]["ready"]
+        print(f"{mode:<14} {first['p50_ms']:>14.1f}ms {first['p95_ms']:>6.1f}ms "
+              f"{ready['p50_ms']:>8.1f}ms {ready['p95_ms']:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark registration inserts against the SQLite backend
+Compares the single-statement insert with the old SELECT-then-INSERT flow
+for throughput and correctness under concurrent (partly duplicate) signups.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from storage import SQLiteRegistrationStore
+
+
+def two_step_insert(connection, email, name, organization):
+    """Previous register() flow: look up the email, then insert."""
+    if connection.execute("SELECT id FROM registrations WHERE email = ?", (email,)).fetchone():
+        return False
+    connection.execute(
+        "INSERT INTO registrations (email, name, organization) VALUES (?, ?, ?)",
+        (email, name, organization),
+    )
+    connection.commit()
+    return True
+
+
+async def run_strategy(store, insert, emails, pool_size):
+    """Insert every email concurrently and tally the outcomes."""
+    pool = store.create_pool(size=pool_size, timeout=60)
+    outcomes = {"inserted": 0, "duplicate": 0, "error": 0}
+
+    async def one(email):
+        try:
+            inserted = await pool.run(insert, email, "Bench", "bench")
+            outcomes["inserted" if inserted else "duplicate"] += 1
+        except sqlite3.Error:
+            outcomes["error"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(email) for email in emails))
+    elapsed = time.perf_counter() - start
+    pool.close()
+
+    connection = store.connect()
+    rows = connection.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
+    connection.close()
+
+    return {
+        **outcomes,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "ops_per_sec": round(len(emails) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark registration inserts on SQLite")
+    parser.add_argument("--signups", type=int, default=5000, help="Total signup attempts")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="Fraction of attempts reusing an email")
+    parser.add_argument("--pool-size", type=int, default=8, help="Connection pool size")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the workload")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    unique = max(1, int(args.signups * (1 - args.duplicate_rate)))
+    emails = [f"user{i}@example.com" for i in range(unique)]
+    emails += [rng.choice(emails) for _ in range(args.signups - unique)]
+    rng.shuffle(emails)
+
+    results = {"signups": args.signups, "unique_emails": unique}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, insert in (("two_step", two_step_insert), ("single_statement", None)):
+            store = SQLiteRegistrationStore(os.path.join(tmp, f"{label}.db"))
+            store.setup()
+            results[label] = asyncio.run(
+                run_strategy(store, insert or store.insert_registration, emails, args.pool_size)
+            )
+            results[label]["correct"] = (
+                results[label]["rows"] == unique
+                and results[label]["inserted"] == unique
+                and results[label]["error"] == 0
+            )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
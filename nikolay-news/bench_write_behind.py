@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request commits against write-behind batched flushes
+Runs the same signup burst through both registration paths on SQLite and
+reports acknowledgement latency and time until every row is persisted.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from stats import percentile
+from storage import SQLiteRegistrationStore
+from write_behind import RegistrationWriteBehind
+
+
+async def burst(submit, signups, concurrency):
+    """Submit ``signups`` registrations with bounded concurrency, timing each ack."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await submit(f"user{i}@example.com", f"User {i}", "bench")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(signups)))
+    return latencies
+
+
+def summarize(latencies, total_seconds, signups):
+    return {
+        "ack_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "ack_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "persisted_after_s": round(total_seconds, 3),
+        "signups_per_sec": round(signups / total_seconds, 1),
+    }
+
+
+async def per_request(store, signups, concurrency, pool_size):
+    pool = store.create_pool(size=pool_size, timeout=60)
+
+    async def submit(email, name, organization):
+        await pool.run(store.insert_registration, email, name, organization)
+
+    start = time.perf_counter()
+    latencies = await burst(submit, signups, concurrency)
+    total = time.perf_counter() - start
+    pool.close()
+    return summarize(latencies, total, signups)
+
+
+async def write_behind(store, signups, concurrency, pool_size, batch_size, flush_interval):
+    pool = store.create_pool(size=pool_size, timeout=60)
+    queue = RegistrationWriteBehind(pool, store, batch_size=batch_size,
+                                    flush_interval=flush_interval, max_pending=signups)
+    await queue.start()
+
+    async def submit(email, name, organization):
+        queue.submit(email, name, organization)
+
+    start = time.perf_counter()
+    latencies = await burst(submit, signups, concurrency)
+    await queue.stop()
+    total = time.perf_counter() - start
+    pool.close()
+    return {**summarize(latencies, total, signups), "batches": queue.batches}
+
+
+def count_rows(store):
+    connection = store.connect()
+    try:
+        return connection.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request commits with write-behind batching")
+    parser.add_argument("--signups", type=int, default=5000, help="Signups in the burst")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent in-flight signups")
+    parser.add_argument("--pool-size", type=int, default=8, help="Connection pool size")
+    parser.add_argument("--batch-size", type=int, default=200, help="Write-behind flush batch size")
+    parser.add_argument("--flush-interval", type=float, default=0.05, help="Write-behind flush interval (seconds)")
+    args = parser.parse_args()
+
+    results = {"signups": args.signups, "concurrency": args.concurrency}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteRegistrationStore(os.path.join(tmp, "per_request.db"))
+        store.setup()
+        results["per_request"] = asyncio.run(per_request(store, args.signups, args.concurrency, args.pool_size))
+        results["per_request"]["rows"] = count_rows(store)
+
+        store = SQLiteRegistrationStore(os.path.join(tmp, "write_behind.db"))
+        store.setup()
+        results["write_behind"] = asyncio.run(write_behind(
+            store, args.signups, args.concurrency, args.pool_size, args.batch_size, args.flush_interval
+        ))
+        results["write_behind"]["rows"] = count_rows(store)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark for registration and page serving
+Boots app.py under uvicorn against a throwaway SQLite database, drives a
+seeded mix of page GETs, new signups, duplicate signups and admin listings
+at each concurrency level, and writes RPS and p50/p95/p99 latency per
+request kind as JSON. Compare against a saved run to catch regressions
+between commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from load_test import Worker
+from stats import percentile
+from storage import SQLiteRegistrationStore
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# kind -> (method, path, expected status)
+REQUESTS = {
+    "page": ("GET", "/", 200),
+    "signup": ("POST", "/api/register", 200),
+    "duplicate": ("POST", "/api/register", 400),
+    "list": ("GET", "/api/registrations?limit=50", 200),
+}
+DEFAULT_MIX = "page=50,signup=25,duplicate=15,list=10"
+PAGE_HEADERS = {"Accept-Encoding": "br, gzip"}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in REQUESTS:
+            raise ValueError(f"Unknown request kind '{kind}'. Choose from: {', '.join(REQUESTS)}")
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def prepare_workdir(workdir: str):
+    """Give the app its assets and a rendered invitation built from the sample report."""
+    from generate_invitation import generate_html_invitation, render_news
+    from mock_openrouter import SAMPLE_REPORT
+
+    os.symlink(os.path.join(APP_DIR, "assets"), os.path.join(workdir, "assets"))
+    os.makedirs(os.path.join(workdir, "templates"), exist_ok=True)
+    _, news_html = render_news(SAMPLE_REPORT)
+    with open(os.path.join(workdir, "hack_event_invitation.html"), "w", encoding="utf-8") as f:
+        f.write(generate_html_invitation(news_html))
+
+
+def boot_app(workdir: str, port: int, env: Dict[str, str], timeout: float = 30.0) -> subprocess.Popen:
+    """Start uvicorn on ``port`` and wait until /api/health reports ready."""
+    command = [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", APP_DIR,
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    process = subprocess.Popen(command, cwd=workdir, env={**os.environ, **env})
+    worker = Worker(f"http://127.0.0.1:{port}")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited with code {process.returncode} during startup")
+        try:
+            status, _ = worker.request("GET", "/api/health")
+            if status == 200:
+                return process
+        except OSError:
+            worker.connection = None
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"app.py was not ready after {timeout:.0f}s")
+
+
+def seed_registrations(base_url: str, count: int, run_id: str, concurrency: int = 8) -> List[str]:
+    """Register ``count`` emails up front, for duplicate signups and listing."""
+    local = threading.local()
+    emails = [f"seed-{run_id}-{i}@example.com" for i in range(count)]
+
+    def one(email):
+        if not hasattr(local, "worker"):
+            local.worker = Worker(base_url)
+        local.worker.request("POST", "/api/register", {"email": email, "name": "Seed", "organization": "bench"})
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, emails))
+    return emails
+
+
+def run_level(base_url: str, concurrency: int, schedule: List[str], seeded: List[str], run_id: str) -> Dict:
+    """Send ``schedule`` (a list of request kinds) using ``concurrency`` threads."""
+    local = threading.local()
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = {kind: [] for kind in REQUESTS}
+    statuses: Dict[str, Dict[int, int]] = {kind: {} for kind in REQUESTS}
+    errors: Dict[str, int] = {kind: 0 for kind in REQUESTS}
+
+    def one(i: int):
+        if not hasattr(local, "worker"):
+            local.worker = Worker(base_url)
+        kind = schedule[i]
+        method, path, expected = REQUESTS[kind]
+        body, headers = None, None
+        if kind == "signup":
+            body = {"email": f"bench-{run_id}-c{concurrency}-{i}@example.com", "name": f"Bench {i}",
+                    "organization": "bench"}
+        elif kind == "duplicate":
+            body = {"email": seeded[i % len(seeded)], "name": "Again"}
+        elif kind == "page":
+            headers = PAGE_HEADERS
+        start = time.perf_counter()
+        try:
+            status, _ = local.worker.request(method, path, body, headers)
+        except Exception:
+            status = 0
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies[kind].append(elapsed)
+            statuses[kind][status] = statuses[kind].get(status, 0) + 1
+            if status != expected:
+                errors[kind] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(len(schedule))))
+    wall = time.perf_counter() - start
+
+    def summary(samples: List[float], error_count: int) -> Dict:
+        return {
+            "requests": len(samples),
+            "rps": round(len(samples) / wall, 1),
+            "errors": error_count,
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        }
+
+    kinds = {}
+    for kind in REQUESTS:
+        if latencies[kind]:
+            kinds[kind] = {**summary(latencies[kind], errors[kind]), "statuses": statuses[kind]}
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "concurrency": concurrency,
+        "seconds": round(wall, 3),
+        "overall": summary(everything, sum(errors.values())),
+        "kinds": kinds,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> Tuple[List[str], bool]:
+    """Lines describing RPS and p99 changes per level and kind; True if any regressed past ``threshold``."""
+    lines = []
+    regressed = False
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in current["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        pairs = [("overall", level["overall"], before["overall"])]
+        pairs += [(kind, stats, before["kinds"][kind]) for kind, stats in level["kinds"].items()
+                  if kind in before.get("kinds", {})]
+        for kind, now, then in pairs:
+            rps_change = now["rps"] / then["rps"] - 1 if then["rps"] else 0.0
+            p99_change = now["p99_ms"] / then["p99_ms"] - 1 if then["p99_ms"] else 0.0
+            flag = ""
+            if rps_change < -threshold or p99_change > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            lines.append(f"{level['concurrency']:>6} {kind:<10} rps {then['rps']:>9} -> {now['rps']:>9} "
+                         f"({rps_change:+.0%})  p99 {then['p99_ms']:>8} -> {now['p99_ms']:>8} ms "
+                         f"({p99_change:+.0%}){flag}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py with a mixed workload")
+    parser.add_argument("--url", help="Benchmark an already running app instead of booting one")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per level (default: 2000)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Request mix weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request schedule (default: 0)")
+    parser.add_argument("--seed-registrations", type=int, default=500,
+                        help="Registrations created before measuring (default: 500)")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured requests before each run (default: 200)")
+    parser.add_argument("--pool-size", type=int, default=10, help="DB_POOL_SIZE for the booted app (default: 10)")
+    parser.add_argument("--write-behind", action="store_true", help="Boot the app with REGISTRATION_WRITE_BEHIND=1")
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative RPS drop or p99 rise that counts as a regression (default: 0.10)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+
+    workdir = process = None
+    base_url = args.url
+    try:
+        if base_url is None:
+            workdir = tempfile.mkdtemp(prefix="nikolay-bench-")
+            prepare_workdir(workdir)
+            port = free_port()
+            env = {
+                "DB_BACKEND": "sqlite",
+                "SQLITE_PATH": os.path.join(workdir, "registrations.db"),
+                "DB_POOL_SIZE": str(args.pool_size),
+                "REGISTRATION_WRITE_BEHIND": "1" if args.write_behind else "0",
+                "NEWS_SCHEDULE": "",
+            }
+            # Migrations run as their own step, as in a deploy
+            SQLiteRegistrationStore(env["SQLITE_PATH"]).setup()
+            process = boot_app(workdir, port, env)
+            base_url = f"http://127.0.0.1:{port}"
+
+        seeded = seed_registrations(base_url, max(1, args.seed_registrations), run_id)
+        kinds, kind_weights = list(weights), list(weights.values())
+        if args.warmup:
+            run_level(base_url, min(levels), rng.choices(kinds, kind_weights, k=args.warmup), seeded,
+                      run_id + "-warmup")
+        results = [run_level(base_url, level, rng.choices(kinds, kind_weights, k=args.requests), seeded, run_id)
+                   for level in levels]
+
+        status, body = Worker(base_url).request("GET", "/api/db/pool")
+        pool = json.loads(body) if status == 200 else None
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "url": args.url, "backend": None if args.url else "sqlite", "mix": weights,
+            "requests_per_level": args.requests, "seed": args.seed, "pool_size": args.pool_size,
+            "write_behind": args.write_behind, "seed_registrations": args.seed_registrations,
+        },
+        "levels": results,
+        "pool": pool,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressed = False
+    comparison = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            comparison, regressed = compare(report, json.load(f), args.threshold)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'conc':>6} {'kind':<10} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for level in results:
+            rows = [("overall", level["overall"])] + list(level["kinds"].items())
+            for kind, stats in rows:
+                print(f"{level['concurrency']:>6} {kind:<10} {stats['rps']:>9} {stats['p50_ms']:>8} "
+                      f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['errors']:>7}")
+        if comparison:
+            print(f"\nCompared with {args.compare}:")
+            print("\n".join(comparison))
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
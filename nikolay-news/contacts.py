@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+In-memory contact store with indexes for segmentation queries
+Loads contacts.json once into columns, then answers filter / sort / top-k
+queries ("Boston ML leads by connections") from inverted indexes on company,
+location, title keywords and headline/summary text.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_CONTACTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "contacts.json")
+
+CONTACT_FIELDS = ("name", "firstName", "lastName", "email", "company", "title", "location",
+                  "linkedin", "headline", "summary", "connections")
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("a an and at by for from in of on or the to with".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased word tokens with a light plural fold ("leads" -> "lead")."""
+    if not text:
+        return []
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class Contact:
+    """One contact materialized from the store's columns."""
+
+    __slots__ = ("name", "first_name", "last_name", "email", "company", "title", "location",
+                 "linkedin", "headline", "summary", "connections")
+
+    def __init__(self, name, first_name, last_name, email, company, title, location,
+                 linkedin, headline, summary, connections):
+        self.name = name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.email = email
+        self.company = company
+        self.title = title
+        self.location = location
+        self.linkedin = linkedin
+        self.headline = headline
+        self.summary = summary
+        self.connections = connections
+
+    def to_dict(self) -> Dict:
+        """Record in the contacts.json field layout."""
+        return {
+            "name": self.name, "firstName": self.first_name, "lastName": self.last_name,
+            "email": self.email, "company": self.company, "title": self.title,
+            "location": self.location, "linkedin": self.linkedin, "headline": self.headline,
+            "summary": self.summary, "connections": self.connections,
+        }
+
+    def __repr__(self):
+        return f"Contact({self.name!r}, {self.title!r} at {self.company!r}, {self.connections})"
+
+
+class _Interned:
+    """Column of repeated strings stored as ids into a value table."""
+
+    def __init__(self):
+        self.ids = array("I")
+        self.values: List[str] = []
+        self.lookup: Dict[str, int] = {}
+
+    def append(self, value: str):
+        value_id = self.lookup.get(value)
+        if value_id is None:
+            value_id = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        self.ids.append(value_id)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.ids[row]]
+
+    def __setitem__(self, row: int, value: str):
+        value_id = self.lookup.get(value)
+        if value_id is None:
+            value_id = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        self.ids[row] = value_id
+
+
+class ContactStore:
+    """Columnar contact store.
+
+    Rows are kept in insertion order, one list or array per field; company and
+    location are interned. Indexes are built lazily after changes: rows are
+    ranked by connections (most first) and every posting list holds ranks in
+    ascending order, so a conjunctive query walks its shortest posting list in
+    rank order, checks the others with binary search and stops after ``limit``
+    hits.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.first_names: List[str] = []
+        self.last_names: List[str] = []
+        self.emails: List[str] = []
+        self.companies = _Interned()
+        self.titles: List[str] = []
+        self.locations = _Interned()
+        self.linkedins: List[str] = []
+        self.headlines: List[str] = []
+        self.summaries: List[str] = []
+        self.connections = array("i")
+
+        # Row lookup by lower-cased email and LinkedIn URL, maintained on write
+        self.by_email: Dict[str, int] = {}
+        self.by_linkedin: Dict[str, int] = {}
+
+        # Built by _ensure_index()
+        self._dirty = True
+        self._order = array("I")  # rank -> row
+        self._company_index: Dict[str, array] = {}
+        self._location_index: Dict[str, array] = {}
+        self._title_index: Dict[str, array] = {}
+        self._text_index: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.emails)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "ContactStore":
+        store = cls()
+        for record in records:
+            store.upsert(record)
+        return store
+
+    @classmethod
+    def from_json(cls, path: str = DEFAULT_CONTACTS) -> "ContactStore":
+        """Load a contacts.json export ({"contacts": [...]} or a bare list).
+
+        Records are parsed one at a time, so the whole document is never in memory.
+        """
+        from contacts_ingest import iter_json_contacts
+
+        return cls.from_records(iter_json_contacts(path))
+
+    def find_row(self, record: Dict) -> Optional[int]:
+        """Existing row for this contact, matched by email or LinkedIn URL."""
+        email = (record.get("email") or "").strip().lower()
+        if email and email in self.by_email:
+            return self.by_email[email]
+        linkedin = (record.get("linkedin") or "").strip().rstrip("/").lower()
+        if linkedin and linkedin in self.by_linkedin:
+            return self.by_linkedin[linkedin]
+        return None
+
+    def upsert(self, record: Dict) -> bool:
+        """Insert a contact or update the matching one; True if it was new.
+
+        Empty fields in ``record`` don't overwrite stored values.
+        """
+        row = self.find_row(record)
+        values = [record.get(field) or "" for field in CONTACT_FIELDS[:-1]]
+        connections = int(record.get("connections") or 0)
+        name, first_name, last_name, email, company, title, location, linkedin, headline, summary = values
+
+        if row is None:
+            row = len(self.emails)
+            self.names.append(name)
+            self.first_names.append(first_name)
+            self.last_names.append(last_name)
+            self.emails.append(email)
+            self.companies.append(company)
+            self.titles.append(title)
+            self.locations.append(location)
+            self.linkedins.append(linkedin)
+            self.headlines.append(headline)
+            self.summaries.append(summary)
+            self.connections.append(connections)
+            created = True
+        else:
+            for column, value in ((self.names, name), (self.first_names, first_name),
+                                  (self.last_names, last_name), (self.emails, email),
+                                  (self.companies, company), (self.titles, title),
+                                  (self.locations, location), (self.linkedins, linkedin),
+                                  (self.headlines, headline), (self.summaries, summary)):
+                if value:
+                    column[row] = value
+            if connections:
+                self.connections[row] = connections
+            created = False
+
+        if self.emails[row]:
+            self.by_email[self.emails[row].strip().lower()] = row
+        if self.linkedins[row]:
+            self.by_linkedin[self.linkedins[row].strip().rstrip("/").lower()] = row
+        self._dirty = True
+        return created
+
+    def contact(self, row: int) -> Contact:
+        return Contact(self.names[row], self.first_names[row], self.last_names[row], self.emails[row],
+                       self.companies[row], self.titles[row], self.locations[row], self.linkedins[row],
+                       self.headlines[row], self.summaries[row], self.connections[row])
+
+    def get(self, email: str) -> Optional[Contact]:
+        row = self.by_email.get(email.strip().lower())
+        return self.contact(row) if row is not None else None
+
+    def __iter__(self) -> Iterator[Contact]:
+        return (self.contact(row) for row in range(len(self)))
+
+    def _ensure_index(self):
+        if not self._dirty:
+            return
+        connections = self.connections
+        order = sorted(range(len(self)), key=connections.__getitem__, reverse=True)
+        company_index: Dict[str, array] = {}
+        location_index: Dict[str, array] = {}
+        title_index: Dict[str, array] = {}
+        text_index: Dict[str, array] = {}
+
+        # Rows that share a company or location share the interned id, so
+        # tokenize each distinct value once
+        company_keys = [value.strip().lower() for value in self.companies.values]
+        location_tokens = [set(tokenize(value)) for value in self.locations.values]
+        company_ids = self.companies.ids
+        location_ids = self.locations.ids
+
+        for rank, row in enumerate(order):
+            key = company_keys[company_ids[row]]
+            if key:
+                company_index.setdefault(key, array("I")).append(rank)
+            for token in location_tokens[location_ids[row]]:
+                location_index.setdefault(token, array("I")).append(rank)
+            for token in set(tokenize(self.titles[row])):
+                title_index.setdefault(token, array("I")).append(rank)
+            for token in set(tokenize(self.headlines[row]) + tokenize(self.summaries[row])):
+                text_index.setdefault(token, array("I")).append(rank)
+
+        self._order = array("I", order)
+        self._company_index = company_index
+        self._location_index = location_index
+        self._title_index = title_index
+        self._text_index = text_index
+        self._dirty = False
+
+    def _postings(self, company: Optional[str], location: Optional[str], title: Optional[str],
+                  text: Optional[str]) -> Optional[List[array]]:
+        """Posting lists every match must appear in; None means no filter."""
+        lists = []
+        empty = array("I")
+        if company:
+            lists.append(self._company_index.get(company.strip().lower(), empty))
+        for index, query in ((self._location_index, location), (self._title_index, title),
+                             (self._text_index, text)):
+            for token in set(tokenize(query)):
+                lists.append(index.get(token, empty))
+        return lists or None
+
+    def query(self, company: Optional[str] = None, location: Optional[str] = None,
+              title: Optional[str] = None, text: Optional[str] = None, min_connections: int = 0,
+              sort: str = "connections", limit: Optional[int] = 10) -> List[Contact]:
+        """Contacts matching every given filter.
+
+        ``company`` matches the whole company name (case-insensitive);
+        ``location``, ``title`` and ``text`` (headline and summary) match when
+        every keyword is present. Results are sorted by ``connections`` (most
+        first) or ``name``.
+        """
+        if sort not in ("connections", "name"):
+            raise ValueError(f"Unknown sort '{sort}'. Use 'connections' or 'name'.")
+        self._ensure_index()
+        order = self._order
+        connections = self.connections
+        postings = self._postings(company, location, title, text)
+
+        if postings is None:
+            candidates: Iterable[int] = range(len(order))
+            others: Sequence[array] = ()
+        else:
+            postings.sort(key=len)
+            candidates, others = postings[0], postings[1:]
+
+        if sort == "connections" and limit is not None:
+            # Top-k: candidates arrive best first, so stop after ``limit`` hits
+            rows = []
+            for rank in candidates:
+                row = order[rank]
+                if connections[row] < min_connections:
+                    break
+                for posting in others:
+                    i = bisect_left(posting, rank)
+                    if i == len(posting) or posting[i] != rank:
+                        break
+                else:
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+        else:
+            # Every match is needed, so intersect whole posting lists in C
+            ranks = set(candidates)
+            for posting in others:
+                ranks.intersection_update(posting)
+            rows = [order[rank] for rank in sorted(ranks)]
+            if min_connections:
+                rows = [row for row in rows if connections[row] >= min_connections]
+            if sort == "name":
+                names = self.names
+                key = lambda r: names[r].lower()
+                rows = heapq.nsmallest(limit, rows, key=key) if limit is not None else sorted(rows, key=key)
+            elif limit is not None:
+                rows = rows[:limit]
+        return [self.contact(row) for row in rows]
+
+    def count(self, **filters) -> int:
+        """Number of contacts matching ``filters`` (see ``query``)."""
+        return len(self.query(limit=None, **filters))
+
+    def stats(self) -> Dict[str, int]:
+        self._ensure_index()
+        return {
+            "contacts": len(self),
+            "companies": len(self._company_index),
+            "location_terms": len(self._location_index),
+            "title_terms": len(self._title_index),
+            "text_terms": len(self._text_index),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query contacts.json")
+    parser.add_argument("--contacts", default=DEFAULT_CONTACTS, help="contacts.json to load")
+    parser.add_argument("--company", help="Exact company name")
+    parser.add_argument("--location", help="Location keywords, e.g. 'Boston'")
+    parser.add_argument("--title", help="Title keywords, e.g. 'ML lead'")
+    parser.add_argument("--text", help="Headline/summary keywords")
+    parser.add_argument("--min-connections", type=int, default=0, help="Minimum connections")
+    parser.add_argument("--sort", choices=["connections", "name"], default="connections", help="Sort order")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum results (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    store = ContactStore.from_json(args.contacts)
+    results = store.query(company=args.company, location=args.location, title=args.title, text=args.text,
+                          min_connections=args.min_connections, sort=args.sort, limit=args.limit)
+    if args.json:
+        print(json.dumps([contact.to_dict() for contact in results], indent=2))
+        return
+    for contact in results:
+        print(f"{contact.connections:>6}  {contact.name:<28} {contact.title} @ {contact.company} ({contact.location})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Streaming contact ingestion
+Parses contacts.json (a top-level "contacts" array, or a bare array), NDJSON
+and CSV exports incrementally, normalizes each row, drops duplicates by email
+or LinkedIn URL and merges the rest into a ContactStore, or streams them to a
+normalized NDJSON file using a fixed-size Bloom filter for dedup. Memory use
+beyond the destination is one read buffer (plus the filter), whatever the
+size of the input.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from typing import Dict, Iterator, Optional, TextIO
+
+from contacts import CONTACT_FIELDS, ContactStore
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\r\n"
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+DIGITS_RE = re.compile(r"\d+")
+
+# Header spellings seen in CRM/Apollo-style CSV exports, compared lower-cased
+# with everything but letters and digits removed
+CSV_ALIASES = {
+    "name": "name", "fullname": "name",
+    "firstname": "firstName", "lastname": "lastName",
+    "email": "email", "emailaddress": "email", "workemail": "email",
+    "company": "company", "companyname": "company", "organization": "company", "organizationname": "company",
+    "title": "title", "jobtitle": "title",
+    "location": "location", "personlocation": "location",
+    "linkedin": "linkedin", "linkedinurl": "linkedin", "personlinkedinurl": "linkedin", "linkedinprofile": "linkedin",
+    "headline": "headline", "summary": "summary", "bio": "summary",
+    "connections": "connections", "numconnections": "connections",
+}
+CSV_LOCATION_PARTS = ("city", "state", "country")
+
+
+class _StreamReader:
+    """Sliding window over a text file for JSONDecoder.raw_decode."""
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping what has been consumed; False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def decode(self):
+        """Decode one complete JSON value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the end of the window may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON input, found '{self.buf[self.pos]}'")
+        self.pos += 1
+
+    def iter_array(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def iter_json_contacts(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """Records from a {"contacts": [...]} document or a bare array, one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _StreamReader(f, chunk_size)
+        if reader.peek() == "[":
+            yield from reader.iter_array()
+            return
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.decode()
+            reader.expect(":")
+            if key == "contacts":
+                yield from reader.iter_array()
+                return
+            reader.decode()  # Skip other top-level values, e.g. metadata
+            if reader.peek() == "}":
+                return
+            reader.expect(",")
+
+
+def iter_ndjson_contacts(path: str) -> Iterator[Dict]:
+    """Records from a file with one JSON object per line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_csv_contacts(path: str) -> Iterator[Dict]:
+    """Records from a CSV export, mapping common header spellings to contact fields."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        columns = {}
+        location_columns = []
+        for header in reader.fieldnames or []:
+            key = re.sub(r"[^a-z0-9]", "", header.lower())
+            if key in CSV_ALIASES:
+                columns.setdefault(CSV_ALIASES[key], header)
+            elif key in CSV_LOCATION_PARTS:
+                location_columns.append(header)
+        for row in reader:
+            record = {field: row[header] for field, header in columns.items()}
+            if not record.get("location") and location_columns:
+                record["location"] = ", ".join(row[h] for h in location_columns if row.get(h))
+            yield record
+
+
+def iter_contacts(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Records from ``path``; ``fmt`` defaults to the file extension."""
+    if fmt is None:
+        extension = os.path.splitext(path)[1].lower()
+        fmt = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}.get(extension, "json")
+    if fmt == "json":
+        return iter_json_contacts(path)
+    if fmt == "ndjson":
+        return iter_ndjson_contacts(path)
+    if fmt == "csv":
+        return iter_csv_contacts(path)
+    raise ValueError(f"Unknown contacts format '{fmt}'. Use json, ndjson or csv.")
+
+
+def canonical_linkedin(url: str) -> str:
+    """https://www.linkedin.com/in/<slug> form, so the same profile compares equal."""
+    url = url.strip().split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    _, found, path = url.lower().partition("linkedin.com/")
+    return f"https://www.linkedin.com/{path}" if found else url
+
+
+def normalize_contact(record: Dict) -> Optional[Dict]:
+    """Cleaned record in the contacts.json layout, or None if it has no usable key."""
+    contact = {field: str(record.get(field) or "").strip() for field in CONTACT_FIELDS[:-1]}
+    email = contact["email"].lower()
+    contact["email"] = email if EMAIL_RE.match(email) else ""
+    contact["linkedin"] = canonical_linkedin(contact["linkedin"])
+    if not contact["email"] and not contact["linkedin"]:
+        return None
+    if not contact["name"]:
+        contact["name"] = f"{contact['firstName']} {contact['lastName']}".strip()
+    # Exports write connections as 500, "500" or "500+"
+    digits = DIGITS_RE.search(str(record.get("connections") or ""))
+    contact["connections"] = int(digits.group()) if digits else 0
+    return contact
+
+
+class BloomFilter:
+    """Fixed-size set membership with false positives at about ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; True if it was (probably) already present."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits, size = self.bits, self.size
+        present = True
+        for _ in range(self.hashes):
+            position = h1 % size
+            h1 += h2
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                present = False
+        return present
+
+
+def peak_rss_mb() -> Optional[int]:
+    """Peak resident memory of this process in MB, or None where unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def ingest(records: Iterator[Dict], store: Optional[ContactStore] = None, output: Optional[TextIO] = None,
+           capacity: int = 10_000_000, error_rate: float = 1e-4, progress_every: int = 0) -> Dict:
+    """Normalize, de-duplicate and merge ``records``; returns counts and throughput.
+
+    With a ``store``, its exact email/LinkedIn index decides: a repeat is
+    merged into the existing contact (non-empty fields win). Without one,
+    repeats are detected by a Bloom filter whose size is fixed by
+    ``capacity`` and ``error_rate``, so a rare unique row may be dropped as a
+    false positive. New contacts are also written to ``output`` as NDJSON.
+    """
+    seen = BloomFilter(capacity, error_rate) if store is None else None
+    stats = {"rows": 0, "invalid": 0, "duplicates": 0, "inserted": 0}
+    started = time.perf_counter()
+
+    for record in records:
+        stats["rows"] += 1
+        if progress_every and stats["rows"] % progress_every == 0:
+            rate = stats["rows"] / (time.perf_counter() - started)
+            print(f"  {stats['rows']} rows ({rate:,.0f} rows/s)")
+
+        contact = normalize_contact(record) if isinstance(record, dict) else None
+        if contact is None:
+            stats["invalid"] += 1
+            continue
+        if store is not None:
+            duplicate = not store.upsert(contact)
+        else:
+            # Add both keys so the filter remembers each of them
+            duplicate = False
+            if contact["email"]:
+                duplicate = seen.add("e:" + contact["email"])
+            if contact["linkedin"]:
+                duplicate = seen.add("l:" + contact["linkedin"]) or duplicate
+        if duplicate:
+            stats["duplicates"] += 1
+            continue
+
+        stats["inserted"] += 1
+        if output is not None:
+            output.write(json.dumps(contact) + "\n")
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["rows"] / elapsed) if elapsed else 0
+    stats["max_rss_mb"] = peak_rss_mb()
+    if seen is not None:
+        stats["bloom_mb"] = round(len(seen.bits) / 1e6, 1)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream contacts into the contact store")
+    parser.add_argument("sources", nargs="+", help="contacts.json, .ndjson/.jsonl or .csv files, merged in order")
+    parser.add_argument("--format", choices=["json", "ndjson", "csv"], help="Input format (default: by extension)")
+    parser.add_argument("--output", help="Also write the normalized, de-duplicated contacts as NDJSON")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Don't build an in-memory ContactStore (use with --output)")
+    parser.add_argument("--capacity", type=int, default=10_000_000,
+                        help="Expected unique contacts, sizes the Bloom filter (default: 10000000)")
+    parser.add_argument("--error-rate", type=float, default=1e-4,
+                        help="Bloom filter false-positive rate (default: 0.0001)")
+    parser.add_argument("--progress", type=int, default=100_000, help="Print progress every N rows (0 = off)")
+    parser.add_argument("--json", action="store_true", help="Print stats as JSON")
+    args = parser.parse_args()
+
+    store = None if args.no_store else ContactStore()
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+
+    def records():
+        for source in args.sources:
+            yield from iter_contacts(source, args.format)
+
+    try:
+        stats = ingest(records(), store=store, output=output, capacity=args.capacity,
+                       error_rate=args.error_rate, progress_every=0 if args.json else args.progress)
+    finally:
+        if output is not None:
+            output.close()
+    if store is not None:
+        stats["store_contacts"] = len(store)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Read {stats['rows']} rows in {stats['seconds']}s ({stats['rows_per_second']:,} rows/s): "
+          f"{stats['inserted']} new, {stats['duplicates']} duplicates, "
+          f"{stats['invalid']} invalid")
+    if "bloom_mb" in stats:
+        print(f"Bloom filter {stats['bloom_mb']} MB")
+    print(f"Max RSS {stats['max_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
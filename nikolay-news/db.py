@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Pooled database access layer for the registration API
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection became available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Bounded pool of database connections with a dedicated executor.
+
+    Connections are opened lazily up to ``size`` and reused afterwards; after a
+    failed operation they are rolled back and checked with ``validate``. Blocking
+    driver calls run on a thread pool of the same size, so handlers can ``await``
+    database work without stalling the event loop.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 10, timeout: float = 5.0,
+                 validate: Optional[Callable[[Any], bool]] = None, name: str = "db"):
+        self._connect = connect
+        self._validate = validate
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}-pool")
+
+        # Metrics
+        self.checkouts = 0
+        self.in_use = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.connect_failures = 0
+
+        # Called as observer(operation, seconds, ok) after each run/iterate, from
+        # the executor thread; e.g. to feed a latency histogram
+        self.observer: Optional[Callable[[str, float, bool], None]] = None
+
+    def _acquire(self):
+        """Check out an idle connection, opening a new one if the pool has room."""
+        start = time.perf_counter()
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+
+            if can_create:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                        self.connect_failures += 1
+                    raise
+            else:
+                try:
+                    connection = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise PoolExhaustedError(
+                        f"No database connection available after {self.timeout:.1f}s "
+                        f"(pool size {self.size})"
+                    )
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        return connection
+
+    def _release(self, connection, discard: bool = False):
+        """Return a connection to the pool, or drop it if it is no longer usable."""
+        with self._lock:
+            self.in_use -= 1
+
+        if discard or self._closed:
+            with self._lock:
+                self._created -= 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+            return
+
+        self._idle.put(connection)
+
+    def _recover(self, connection) -> bool:
+        """Roll back after a failed operation; return False if the connection must be dropped."""
+        try:
+            connection.rollback()
+            return not self._validate or self._validate(connection)
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block (blocking)."""
+        connection = self._acquire()
+        discard = False
+        try:
+            yield connection
+        except Exception:
+            # Leave the connection clean for the next borrower, or drop it if
+            # it cannot roll back or no longer passes validation.
+            discard = not self._recover(connection)
+            raise
+        finally:
+            self._release(connection, discard=discard)
+
+    def iterate(self, fn: Callable, *args, **kwargs) -> Iterator:
+        """Yield from generator ``fn(connection, ...)`` while holding one connection.
+
+        A stream abandoned part-way (e.g. client disconnect) may leave unread
+        results on the connection, so it is closed instead of being pooled.
+        """
+        connection = self._acquire()
+        discard = True
+        started = time.perf_counter()
+        try:
+            yield from fn(connection, *args, **kwargs)
+            discard = False
+        except Exception:
+            discard = not self._recover(connection)
+            raise
+        finally:
+            self._release(connection, discard=discard)
+            self._observe(fn, started, not discard)
+
+    def _observe(self, fn: Callable, started: float, ok: bool):
+        if self.observer is not None:
+            self.observer(getattr(fn, "__name__", "query"), time.perf_counter() - started, ok)
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict):
+        with self.connection() as connection:
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = fn(connection, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                self._observe(fn, started, ok)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run ``fn(connection, *args, **kwargs)`` on the pool's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, fn, args, kwargs)
+
+    async def stream(self, fn: Callable, *args, **kwargs) -> AsyncIterator:
+        """Async version of ``iterate``; each step runs on the pool's executor."""
+        loop = asyncio.get_running_loop()
+        iterator = self.iterate(fn, *args, **kwargs)
+        done = object()
+        while True:
+            item = await loop.run_in_executor(self._executor, next, iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size, checkout and wait-time metrics."""
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": self._idle.qsize(),
+                "in_use": self.in_use,
+                "checkouts": checkouts,
+                "wait_time_avg_ms": round(self.wait_time_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "connect_failures": self.connect_failures,
+            }
+
+    def close(self):
+        """Close all idle connections and stop the executor."""
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            try:
+                connection.close()
+            except Exception:
+                pass
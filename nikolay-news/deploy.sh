@@ -30,7 +30,8 @@ mkdir -p "$DEPLOY_DIR"
 
 # Copy files to deployment directory
 echo "Preparing deployment files..."
-cp app.py requirements.txt "$DEPLOY_DIR/"
+# app.py imports the storage, pool, cache and metrics modules alongside it
+cp *.py requirements.txt "$DEPLOY_DIR/"
 cp hack_event_invitation.html "$DEPLOY_DIR/"
 cp -r assets "$DEPLOY_DIR/"
 cp .env "$DEPLOY_DIR/"
@@ -58,8 +59,11 @@ COPY . .
 # Expose port
 EXPOSE 8000
 
-# Run the application
-CMD ["uvicorn", "app:app", "--host", "0.0.0.0", "--port", "8000"]
+# Run the application: one worker per CPU the container can see. Set
+# WEB_CONCURRENCY to the vCPUs actually allotted where the container sees
+# the whole host (the ECS task sets it to match its 2 vCPUs); startup work
+# runs once in the master before workers fork
+CMD ["python", "serve.py", "--host", "0.0.0.0", "--port", "8000"]
 EOF
 
 # Create docker-compose.yml for local testing
@@ -68,6 +72,19 @@ cat > "$DEPLOY_DIR/docker-compose.yml" << 'EOF'
 version: '3.8'
 
 services:
+  # One-shot schema migration; the app starts once it has succeeded
+  migrate:
+    build: .
+    command: ["python", "migrations.py"]
+    environment:
+      - DB_HOST=db
+      - DB_USER=root
+      - DB_PASSWORD=password
+      - DB_NAME=nikolay_hack_event
+    depends_on:
+      - db
+    restart: on-failure
+
   app:
     build: .
     ports:
@@ -78,7 +95,8 @@ services:
       - DB_PASSWORD=password
       - DB_NAME=nikolay_hack_event
     depends_on:
-      - db
+      migrate:
+        condition: service_completed_successfully
 
   db:
     image: mysql:8.0
@@ -107,6 +125,20 @@ docker push your-aws-account-id.dkr.ecr.your-region.amazonaws.com/nikolay-hack-e
 # Create ECS task definition (replace with your actual values)
 aws ecs register-task-definition --cli-input-json file://task-definition.json
 
+# Apply schema migrations as a one-off task before rolling out the new version
+TASK_ARN=$(aws ecs run-task --cluster your-cluster --task-definition your-task-definition \
+    --launch-type FARGATE \
+    --network-configuration "awsvpcConfiguration={subnets=[your-subnet-id],securityGroups=[your-security-group-id]}" \
+    --overrides '{"containerOverrides":[{"name":"nikolay-hack-event","command":["python","migrations.py"]}]}' \
+    --query 'tasks[0].taskArn' --output text)
+aws ecs wait tasks-stopped --cluster your-cluster --tasks "$TASK_ARN"
+EXIT_CODE=$(aws ecs describe-tasks --cluster your-cluster --tasks "$TASK_ARN" \
+    --query 'tasks[0].containers[0].exitCode' --output text)
+if [ "$EXIT_CODE" != "0" ]; then
+    echo "Migration task failed (exit code $EXIT_CODE); not updating the service"
+    exit 1
+fi
+
 # Update ECS service
 aws ecs update-service --cluster your-cluster --service your-service --task-definition your-task-definition
 
@@ -124,8 +156,8 @@ cat > "$DEPLOY_DIR/task-definition.json" << 'EOF'
   "requiresCompatibilities": [
     "FARGATE"
   ],
-  "cpu": "256",
-  "memory": "512",
+  "cpu": "2048",
+  "memory": "4096",
   "executionRoleArn": "arn:aws:iam::your-aws-account-id:role/ecsTaskExecutionRole",
   "taskRoleArn": "arn:aws:iam::your-aws-account-id:role/ecsTaskRole",
   "containerDefinitions": [
@@ -154,6 +186,10 @@ cat > "$DEPLOY_DIR/task-definition.json" << 'EOF'
         {
           "name": "DB_NAME",
           "value": "nikolay_hack_event"
+        },
+        {
+          "name": "WEB_CONCURRENCY",
+          "value": "2"
         }
       ],
       "logConfiguration": {
@@ -23,6 +23,13 @@ def main():
         generator.model = "openai/gpt-3.5-turbo"  # Override the model from .env
         generator.generate_news(days_back=7, output_file="ai_news_gpt3.md")
         
+        # Example 4: Compare models side by side in one concurrent run
+        print("\nExample 4: Comparing models concurrently...")
+        summary = generator.generate_news_multi(
+            ["anthropic/claude-3-haiku", "openai/gpt-3.5-turbo"], strategy="ensemble", days_back=7
+        )
+        print(f"Metrics saved to {summary['metrics_file']}")
+        
         print("\nAll examples completed successfully!")
         
     except Exception as e:
@@ -5,60 +5,47 @@ Generate HTML invitation for hack event using the latest AI news
 
 import os
 import re
-import glob
+import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from markdown_render import render_report
+from news_archive import DEFAULT_ARCHIVE_PATH, NewsArchive, read_report, report_exists
+from news_index import DEFAULT_DIRECTORY, DEFAULT_INDEX_PATH, NewsIndex, is_report_path
+
 def get_latest_news_file():
-    """Get the most recent news file from news_database directory."""
-    news_files = glob.glob("news_database/ai_news_*.md")
-    if not news_files:
-        raise FileNotFoundError("No news files found in news_database directory")
+    """Get the most recent news file from the news_database catalog."""
+    archive_path = os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH)
+    index = NewsIndex(os.getenv("NEWS_INDEX_PATH", DEFAULT_INDEX_PATH))
+    try:
+        latest = index.latest()
+        # Files written before the catalog existed, deleted since, or cataloged
+        # from outside news_database by older versions need a rescan
+        if (latest is None or not is_report_path(latest["path"])
+                or not report_exists(latest["path"], archive_path)):
+            archive = NewsArchive(archive_path) if os.path.exists(archive_path) else None
+            try:
+                index.rebuild(DEFAULT_DIRECTORY, archive)
+            finally:
+                if archive is not None:
+                    archive.close()
+            latest = index.latest()
+    finally:
+        index.close()
     
-    # Sort by modification time, get the latest
-    latest_file = max(news_files, key=os.path.getmtime)
-    return latest_file
+    if latest is None:
+        raise FileNotFoundError("No news files found in news_database directory")
+    return latest["path"]
 
 def extract_news_content(file_path):
     """Extract and format news content from markdown file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Remove the header part
-    content = re.sub(r'# AI News Weekly Report.*?---\n\n', '', content, flags=re.DOTALL)
-    
-    # Convert markdown headers to HTML
-    content = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
-    content = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-    content = re.sub(r'^### (.*?)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-    
-    # Convert markdown lists to HTML
-    content = re.sub(r'^- (.*?)$', r'<li>\1</li>', content, flags=re.MULTILINE)
-    content = re.sub(r'(<li>.*?</li>)', r'<ul>\1</ul>', content, flags=re.DOTALL)
-    
-    # Convert markdown bold to HTML
-    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-    
-    # Convert markdown links to HTML
-    content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', content)
-    
-    # Convert line breaks to HTML
-    content = re.sub(r'\n\n', '</p><p>', content)
-    content = f'<p>{content}</p>'
-    
-    # Fix nested lists
-    content = re.sub(r'<p><ul>', '<ul>', content)
-    content = re.sub(r'</ul></p>', '</ul>', content)
+    content = read_report(file_path, os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH))
     
-    return content
+    # Render in a single pass, skipping the header part
+    return render_report(content)
 
-def generate_html_invitation(news_content):
-    """Generate the HTML invitation with news content and assets."""
-    # Calculate date for next week (7 days from now)
-    next_week = datetime.now() + timedelta(days=7)
-    event_date = next_week.strftime("%B %d, %Y")
-    
-    html_template = f"""
+# Static page shell; {event_date} and {news_content} are the only dynamic slots
+INVITATION_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -66,81 +53,81 @@ def generate_html_invitation(news_content):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Nikolay.ai Hack Event Invitation</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             margin: 0;
             padding: 0;
             color: #333;
             background-color: #f8f9fa;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1000px;
             margin: 0 auto;
             padding: 20px;
-        }}
-        header {{
+        }
+        header {
             text-align: center;
             margin-bottom: 30px;
             background-color: #fff;
             padding: 20px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .logo {{
+        }
+        .logo {
             max-width: 200px;
             margin-bottom: 20px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #2c3e50;
             margin-bottom: 10px;
-        }}
-        .event-details {{
+        }
+        .event-details {
             background-color: #e9f7fe;
             padding: 15px;
             border-radius: 8px;
             margin: 20px 0;
             border-left: 4px solid #3498db;
-        }}
-        .news-section {{
+        }
+        .news-section {
             background-color: #fff;
             padding: 25px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             margin-bottom: 30px;
-        }}
-        .news-section h2 {{
+        }
+        .news-section h2 {
             color: #2c3e50;
             border-bottom: 2px solid #3498db;
             padding-bottom: 10px;
-        }}
-        .news-section h3 {{
+        }
+        .news-section h3 {
             color: #34495e;
             margin-top: 25px;
-        }}
-        .news-section ul {{
+        }
+        .news-section ul {
             margin-left: 20px;
-        }}
-        .news-section li {{
+        }
+        .news-section li {
             margin-bottom: 10px;
-        }}
-        footer {{
+        }
+        footer {
             text-align: center;
             margin-top: 30px;
             padding: 20px;
             background-color: #2c3e50;
             color: #ecf0f1;
             border-radius: 10px;
-        }}
-        .video-container {{
+        }
+        .video-container {
             margin-top: 20px;
-        }}
-        video {{
+        }
+        video {
             max-width: 100%;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.2);
-        }}
-        .cta-button {{
+        }
+        .cta-button {
             display: inline-block;
             background-color: #3498db;
             color: white;
@@ -150,64 +137,64 @@ def generate_html_invitation(news_content):
             font-weight: bold;
             margin: 20px 0;
             transition: background-color 0.3s;
-        }}
-        .cta-button:hover {{
+        }
+        .cta-button:hover {
             background-color: #2980b9;
-        }}
-        .registration-section {{
+        }
+        .registration-section {
             background-color: #fff;
             padding: 25px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             margin-bottom: 30px;
-        }}
-        .registration-form {{
+        }
+        .registration-form {
             max-width: 500px;
             margin: 0 auto;
-        }}
-        .form-group {{
+        }
+        .form-group {
             margin-bottom: 20px;
-        }}
-        .form-group label {{
+        }
+        .form-group label {
             display: block;
             margin-bottom: 8px;
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .form-group input {{
+        }
+        .form-group input {
             width: 100%;
             padding: 12px;
             border: 1px solid #ddd;
             border-radius: 5px;
             font-size: 16px;
             box-sizing: border-box;
-        }}
-        .form-group input:focus {{
+        }
+        .form-group input:focus {
             border-color: #3498db;
             outline: none;
             box-shadow: 0 0 5px rgba(52, 152, 219, 0.5);
-        }}
-        .message {{
+        }
+        .message {
             margin-top: 20px;
             padding: 15px;
             border-radius: 5px;
             display: none;
-        }}
-        .success {{
+        }
+        .success {
             background-color: #d4edda;
             color: #155724;
             border: 1px solid #c3e6cb;
-        }}
-        .error {{
+        }
+        .error {
             background-color: #f8d7da;
             color: #721c24;
             border: 1px solid #f5c6cb;
-        }}
-        .info {{
+        }
+        .info {
             background-color: #d1ecf1;
             color: #0c5460;
             border: 1px solid #bee5eb;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -273,107 +260,185 @@ def generate_html_invitation(news_content):
 
     <script>
         // Form submission handler
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', function() {
             // Get form and message elements
             const form = document.getElementById('registrationForm');
             const messageDiv = document.getElementById('registrationMessage');
             
             // Handle form submission
-            form.addEventListener('submit', async function(e) {{
+            form.addEventListener('submit', async function(e) {
                 e.preventDefault();
                 
                 // Get form data
                 const formData = new FormData(form);
-                const data = {{
+                const data = {
                     email: formData.get('email'),
                     name: formData.get('name'),
                     organization: formData.get('organization')
-                }};
+                };
                 
                 // Show loading message
                 showMessage('Registering...', 'info');
                 
-                try {{
+                try {
                     // Send registration request
-                    const response = await fetch('/api/register', {{
+                    const response = await fetch('/api/register', {
                         method: 'POST',
-                        headers: {{
+                        headers: {
                             'Content-Type': 'application/json',
-                        }},
+                        },
                         body: JSON.stringify(data)
-                    }});
+                    });
                     
                     const result = await response.json();
                     
-                    if (response.ok) {{
+                    if (response.ok) {
                         // Success
                         showMessage(result.message, 'success');
                         form.reset();
-                    }} else {{
+                    } else {
                         // Error
                         showMessage(result.detail || 'Registration failed', 'error');
-                    }}
-                }} catch (error) {{
+                    }
+                } catch (error) {
                     // Network error
                     showMessage('Network error. Please try again.', 'error');
                     console.error('Registration error:', error);
-                }}
-            }});
+                }
+            });
             
             // Function to show messages
-            function showMessage(message, type) {{
+            function showMessage(message, type) {
                 messageDiv.textContent = message;
                 messageDiv.className = 'message ' + type;
                 messageDiv.style.display = 'block';
                 
                 // Auto-hide success messages after 5 seconds
-                if (type === 'success') {{
-                    setTimeout(() => {{
+                if (type === 'success') {
+                    setTimeout(() => {
                         messageDiv.style.display = 'none';
-                    }}, 5000);
-                }}
-            }}
+                    }, 5000);
+                }
+            }
             
             // Add smooth scrolling
-            document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-                anchor.addEventListener('click', function (e) {{
+            document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+                anchor.addEventListener('click', function (e) {
                     e.preventDefault();
-                    document.querySelector(this.getAttribute('href')).scrollIntoView({{
+                    document.querySelector(this.getAttribute('href')).scrollIntoView({
                         behavior: 'smooth'
-                    }});
-                }});
-            }});
+                    });
+                });
+            });
             
             // Add animation to elements when they come into view
-            const observerOptions = {{
+            const observerOptions = {
                 root: null,
                 rootMargin: '0px',
                 threshold: 0.1
-            }};
+            };
             
-            const observer = new IntersectionObserver((entries) => {{
-                entries.forEach(entry => {{
-                    if (entry.isIntersecting) {{
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
                         entry.target.style.opacity = 1;
                         entry.target.style.transform = 'translateY(0)';
-                    }}
-                }});
-            }}, observerOptions);
+                    }
+                });
+            }, observerOptions);
             
             // Observe all sections
-            document.querySelectorAll('section').forEach(section => {{
+            document.querySelectorAll('section').forEach(section => {
                 section.style.opacity = 0;
                 section.style.transform = 'translateY(20px)';
                 section.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
                 observer.observe(section);
-            }});
-        }});
+            });
+        });
     </script>
 </body>
 </html>
 """
-    
-    return html_template
+
+
+class PageTemplate:
+    """Page split once at its {slot} markers; rendering is a join of the cached chunks."""
+
+    def __init__(self, source, slots):
+        pattern = re.compile(r"\{(" + "|".join(re.escape(slot) for slot in slots) + r")\}")
+        # Even indexes hold static chunks, odd indexes hold slot names
+        self.chunks = pattern.split(source)
+        self.digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def render(self, **values):
+        parts = self.chunks[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = values[parts[i]]
+        return "".join(parts)
+
+
+INVITATION_TEMPLATE = PageTemplate(INVITATION_HTML, ("event_date", "news_content"))
+
+# Rendered news HTML keyed by the SHA-256 of the markdown; only the latest
+# report is kept, since that is the only one a long-running process re-renders
+_news_html_cache = {}
+
+
+def default_event_date():
+    """Event date shown on the page: one week from today."""
+    next_week = datetime.now() + timedelta(days=7)
+    return next_week.strftime("%B %d, %Y")
+
+
+def render_news(markdown):
+    """Render news markdown to HTML, memoized by content hash (latest report only)."""
+    digest = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+    news_html = _news_html_cache.get(digest)
+    if news_html is None:
+        news_html = render_report(markdown)
+        _news_html_cache.clear()
+        _news_html_cache[digest] = news_html
+    return digest, news_html
+
+
+def generate_html_invitation(news_content, event_date=None):
+    """Generate the HTML invitation with news content and assets."""
+    return INVITATION_TEMPLATE.render(
+        event_date=event_date or default_event_date(),
+        news_content=news_content,
+    )
+
+
+def invitation_key(news_digest, event_date):
+    """Identify one rendered page: template, news content and event date."""
+    return f"{INVITATION_TEMPLATE.digest[:16]}:{news_digest}:{event_date}"
+
+
+def write_invitation(news_file, output_file="hack_event_invitation.html", event_date=None):
+    """Render the invitation for ``news_file`` unless the output is already current.
+
+    The key of the last render is kept next to the output in ``<output>.key``.
+    Returns True when the file was (re)written, False when nothing changed.
+    """
+    event_date = event_date or default_event_date()
+    markdown = read_report(news_file, os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH))
+
+    digest, news_html = render_news(markdown)
+    key = invitation_key(digest, event_date)
+    key_file = f"{output_file}.key"
+    try:
+        with open(key_file, 'r', encoding='utf-8') as f:
+            if f.read() == key and os.path.exists(output_file):
+                return False
+    except FileNotFoundError:
+        pass
+
+    html_content = generate_html_invitation(news_html, event_date)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    with open(key_file, 'w', encoding='utf-8') as f:
+        f.write(key)
+    return True
 
 def main():
     """Main function to generate the HTML invitation."""
@@ -382,18 +447,12 @@ def main():
         latest_file = get_latest_news_file()
         print(f"Using latest news file: {latest_file}")
         
-        # Extract news content
-        news_content = extract_news_content(latest_file)
-        
-        # Generate HTML invitation
-        html_content = generate_html_invitation(news_content)
-        
-        # Save the HTML file
+        # Render the invitation, skipping the write if nothing changed
         output_file = "hack_event_invitation.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"HTML invitation generated: {output_file}")
+        if write_invitation(latest_file, output_file):
+            print(f"HTML invitation generated: {output_file}")
+        else:
+            print(f"HTML invitation is up to date: {output_file}")
         print("Open this file in your browser to view the invitation.")
         
     except Exception as e:
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Load test for the registration API
+Sweeps concurrency levels against a running app.py and reports how
+requests per second and latency scale.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from stats import percentile
+
+
+class Worker:
+    """Keep-alive HTTP client bound to one thread."""
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.connection = None
+
+    def request(self, method: str, path: str, body=None, headers=None):
+        """Send one request and return (status, body bytes)."""
+        headers = dict(headers or {})
+        if body is not None:
+            body = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # Server closed the keep-alive connection; reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+def run_level(base_url: str, concurrency: int, requests_per_level: int, run_id: str) -> Dict:
+    """Fire ``requests_per_level`` registrations using ``concurrency`` workers."""
+    local = threading.local()
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+
+    def one(i: int):
+        if not hasattr(local, "worker"):
+            local.worker = Worker(base_url)
+        payload = {
+            "email": f"load-{run_id}-c{concurrency}-{i}@example.com",
+            "name": f"Load Test {i}",
+            "organization": "load-test",
+        }
+        start = time.perf_counter()
+        try:
+            status, _ = local.worker.request("POST", "/api/register", payload)
+        except Exception:
+            status = 0
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests_per_level)))
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests_per_level,
+        "rps": round(requests_per_level / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/register at increasing concurrency")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the running app")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+    results = [run_level(args.url, level, args.requests, run_id) for level in levels]
+
+    status, body = Worker(args.url).request("GET", "/api/db/pool")
+    pool = json.loads(body) if status == 200 else None
+
+    if args.json:
+        print(json.dumps({"levels": results, "pool": pool}, indent=2))
+        return
+
+    print(f"{'conc':>6} {'rps':>10} {'p50 ms':>10} {'p99 ms':>10}  statuses")
+    for r in results:
+        print(f"{r['concurrency']:>6} {r['rps']:>10} {r['p50_ms']:>10} {r['p99_ms']:>10}  {r['statuses']}")
+    if pool:
+        print(f"\nPool: {pool}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Single-pass markdown to HTML renderer for generated news reports
+Covers the subset the LLM emits: headers, nested lists, bold/italic, links,
+inline and fenced code, horizontal rules and paragraphs. All text is escaped.
+"""
+
+import html
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# Block-level patterns, each matched at most once per line
+HEADER = re.compile(r"(#{1,6})\s+(.*?)\s*#*\s*$")
+LIST_ITEM = re.compile(r"([ \t]*)([-*+]|\d{1,9}[.)])\s+(.*)$")
+HR = re.compile(r"[ ]{0,3}([-*_])(?:\s*\1){2,}\s*$")
+FENCE = re.compile(r"[ ]{0,3}(```+|~~~+)\s*([\w+-]*)")
+
+# Inline tokens, matched against already-escaped text in a single pass per line.
+# The leading lookahead lets the scan skip straight to the next marker character
+INLINE = re.compile(
+    r"(?=[`*_\[])(?:"
+    r"`([^`]+)`"                            # 1: code
+    r"|\*\*(?=\S)(.+?)(?<=\S)\*\*"          # 2: bold
+    r"|__(?=\S)(.+?)(?<=\S)__"              # 3: bold
+    r"|\*(?=[^\s*])(.+?)(?<=[^\s*])\*"      # 4: italic
+    r"|(?<!\w)_(?=[^\s_])(.+?)(?<=[^\s_])_(?!\w)"  # 5: italic
+    r"|\[([^\]]+)\]\(([^)\s]+)(?:\s+&quot;.*?&quot;)?\)"  # 6, 7: link, optional title
+    r")"
+)
+
+SAFE_URL = re.compile(r"(?:https?:|mailto:|/|#|\.{0,2}/)|[^:]*$", re.IGNORECASE)
+
+
+def escape(text: str) -> str:
+    return html.escape(text, quote=True)
+
+
+# Shared tag literals, so output parts for markup cost a list slot and no new string
+OPEN_HEADER = tuple(f"<h{level}>" for level in range(7))
+CLOSE_HEADER = tuple(f"</h{level}>" for level in range(7))
+OPEN_LIST = {"ul": "<ul>\n<li>", "ol": "<ol>\n<li>"}
+CLOSE_LIST = {"ul": "</li></ul>", "ol": "</li></ol>"}
+
+# Parts are folded into a chunk at the next block once there are this many
+CHUNK_PARTS = 4096
+
+
+def _emit_inline(out: List[str], text: str):
+    """Append already-escaped ``text`` to ``out`` with inline markup rendered."""
+    pos = 0
+    for match in INLINE.finditer(text):
+        start = match.start()
+        if start > pos:
+            out.append(text[pos:start])
+        pos = match.end()
+        # The last group that matched tells which token this is
+        group = match.lastindex
+        if group == 1:
+            out += ("<code>", match[1], "</code>")
+        elif group <= 3:
+            out.append("<strong>")
+            _emit_inline(out, match[group])
+            out.append("</strong>")
+        elif group <= 5:
+            out.append("<em>")
+            _emit_inline(out, match[group])
+            out.append("</em>")
+        elif SAFE_URL.match(match[7]):
+            out += ('<a href="', match[7], '">')
+            _emit_inline(out, match[6])
+            out.append("</a>")
+        else:
+            # Drop links with unsafe schemes such as javascript:
+            _emit_inline(out, match[6])
+    if pos == 0:
+        out.append(text)
+    elif pos < len(text):
+        out.append(text[pos:])
+
+
+def render_inline(text: str) -> str:
+    """Render inline markup in one scan.
+
+    The text is escaped up front; none of the escaped characters are markdown
+    syntax, so token contents can be emitted as-is.
+    """
+    out: List[str] = []
+    _emit_inline(out, escape(text))
+    return "".join(out)
+
+
+def iter_lines(text: str, start: int = 0) -> Iterator[str]:
+    """Yield lines from ``start`` one at a time instead of materializing a list of them."""
+    pos = start
+    end = len(text)
+    while pos < end:
+        newline = text.find("\n", pos)
+        if newline == -1:
+            newline = end
+        yield text[pos:newline].rstrip("\r")
+        pos = newline + 1
+
+
+def report_body_start(content: str) -> int:
+    """Offset just past the '# AI News Weekly Report ... ---' preamble written by news.py (0 if absent)."""
+    if not content.startswith("# AI News Weekly Report"):
+        return 0
+    end = content.find("\n---\n")
+    if end == -1:
+        return 0
+    start = end + len("\n---\n")
+    while start < len(content) and content[start] == "\n":
+        start += 1
+    return start
+
+
+def strip_report_header(content: str) -> str:
+    """Drop the '# AI News Weekly Report ... ---' preamble written by news.py."""
+    return content[report_body_start(content):]
+
+
+class MarkdownRenderer:
+    """Line-oriented renderer.
+
+    Tags, tokens and text slices are appended to one list of parts instead of
+    building a string per line and per inline. Every CHUNK_PARTS parts are
+    folded into a chunk, so the peak is about two copies of the output (the
+    chunks and the final join) rather than one small string object per token.
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.chunks: List[str] = []
+        self.in_paragraph = False
+        # Open lists as (indent, tag); each open list has an open <li>
+        self.lists: List[Tuple[int, str]] = []
+        self.fence: Optional[str] = None
+        self.code_lines = 0
+
+    def render(self, text: str, start: int = 0) -> str:
+        for line in iter_lines(text, start):
+            self.feed(line)
+        self.close_paragraph()
+        self.close_lists(-1)
+        if self.fence is not None:
+            self.close_code()
+        self.chunks.append("".join(self.out))
+        self.out.clear()
+        return "".join(self.chunks)
+
+    def start_block(self):
+        if len(self.out) >= CHUNK_PARTS:
+            self.chunks.append("".join(self.out))
+            self.out.clear()
+        if self.out or self.chunks:
+            self.out.append("\n")
+
+    def feed(self, line: str):
+        out = self.out
+        if self.fence is not None:
+            if line.strip().startswith(self.fence):
+                self.close_code()
+            else:
+                if self.code_lines:
+                    out.append("\n")
+                out.append(escape(line))
+                self.code_lines += 1
+            return
+
+        stripped = line.strip()
+        if not stripped:
+            self.close_paragraph()
+            return
+
+        # Dispatch on the first character so plain text lines skip the block patterns
+        first = stripped[0]
+        if first in "`~":
+            fence = FENCE.match(line)
+            if fence:
+                self.close_paragraph()
+                self.close_lists(-1)
+                self.start_block()
+                self.fence = fence.group(1)
+                language = fence.group(2)
+                out.append(f'<pre><code class="language-{escape(language)}">' if language else "<pre><code>")
+                return
+
+        elif first == "#":
+            header = HEADER.match(line)
+            if header:
+                self.close_paragraph()
+                self.close_lists(-1)
+                self.start_block()
+                level = len(header.group(1))
+                out.append(OPEN_HEADER[level])
+                _emit_inline(out, escape(header.group(2)))
+                out.append(CLOSE_HEADER[level])
+                return
+
+        if first in "-*_" and HR.match(line):
+            self.close_paragraph()
+            self.close_lists(-1)
+            self.start_block()
+            out.append("<hr>")
+            return
+
+        if first in "-*+" or first.isdigit():
+            item = LIST_ITEM.match(line)
+            if item:
+                self.close_paragraph()
+                indent = len(item.group(1).expandtabs(4))
+                tag = "ul" if item.group(2) in "-*+" else "ol"
+                self.open_item(indent, tag, item.group(3))
+                return
+
+        if self.lists and line[0] in " \t" and not self.in_paragraph:
+            # Indented continuation of the current list item
+            out.append("\n ")
+            _emit_inline(out, escape(stripped))
+            return
+
+        if self.in_paragraph:
+            out.append(" ")
+        else:
+            self.close_lists(-1)
+            self.start_block()
+            out.append("<p>")
+            self.in_paragraph = True
+        _emit_inline(out, escape(stripped))
+
+    def open_item(self, indent: int, tag: str, text: str):
+        # Close lists nested deeper than this item
+        self.close_lists(indent)
+        if self.lists and self.lists[-1][0] == indent and self.lists[-1][1] != tag:
+            self.close_lists(indent - 1)
+
+        self.start_block()
+        if self.lists and self.lists[-1][0] == indent:
+            self.out.append("</li>\n<li>")
+        else:
+            # New list, nested inside the open <li> if there is one
+            self.lists.append((indent, tag))
+            self.out.append(OPEN_LIST[tag])
+        _emit_inline(self.out, escape(text))
+
+    def close_lists(self, indent: int):
+        """Close every open list indented deeper than ``indent``."""
+        while self.lists and self.lists[-1][0] > indent:
+            _, tag = self.lists.pop()
+            self.start_block()
+            self.out.append(CLOSE_LIST[tag])
+
+    def close_paragraph(self):
+        if self.in_paragraph:
+            self.out.append("</p>")
+            self.in_paragraph = False
+
+    def close_code(self):
+        self.out.append("</code></pre>")
+        self.code_lines = 0
+        self.fence = None
+
+
+def render_markdown(text: str) -> str:
+    """Render a markdown document to an HTML fragment."""
+    return MarkdownRenderer().render(text)
+
+
+def render_report(content: str) -> str:
+    """Render a generated report without its preamble, and without copying the document to drop it."""
+    return MarkdownRenderer().render(content, report_body_start(content))
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Request and database metrics in Prometheus text format
+A small thread-safe registry of counters, gauges and histograms, an ASGI
+middleware that records per-route latency and in-flight requests, a
+per-request accumulator that splits database time from handler time, and
+snapshot sharing so any serve.py worker can answer a scrape for all of them.
+"""
+
+import asyncio
+import contextvars
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers cached page hits through slow exports
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, label string, value) for every series."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return _render_family(self.name, self.kind, self.help, self.samples())
+
+
+def _render_family(name: str, kind: str, help: str, samples: Iterable[Tuple[str, str, float]]) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{suffix}{labels} {_format_value(value)}" for suffix, labels, value in samples]
+    return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        buckets = self.buckets
+        index = len(buckets)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        samples = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                samples.append(("_bucket", _format_labels(self.labelnames, key, le), cumulative))
+            samples.append(("_sum", _format_labels(self.labelnames, key), series[-1]))
+            samples.append(("_count", _format_labels(self.labelnames, key), cumulative))
+        return samples
+
+
+class CallbackMetric(_Metric):
+    """Metric whose values are read from ``fn`` at scrape time.
+
+    ``fn`` returns a number, or a dict mapping label value tuples to numbers.
+    Used for counters kept elsewhere, such as ConnectionPool.stats().
+    """
+
+    def __init__(self, name: str, help: str, fn: Callable[[], object], kind: str = "gauge",
+                 labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.fn = fn
+
+    def samples(self):
+        value = self.fn()
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return [("", _format_labels(self.labelnames, key), v) for key, v in sorted(value.items())]
+        return [("", "", value)]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, fn: Callable[[], object], kind: str = "gauge",
+                 labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, fn, kind, labelnames))
+
+    def collect(self) -> List[Dict]:
+        """Every metric as {name, kind, help, samples}, or {name, error} if it failed."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = []
+        for metric in metrics:
+            try:
+                samples = [list(sample) for sample in metric.samples()]
+            except Exception as e:  # A failing callback shouldn't break the scrape
+                families.append({"name": metric.name, "error": str(e)})
+                continue
+            families.append({"name": metric.name, "kind": metric.kind, "help": metric.help, "samples": samples})
+        return families
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        return render_families([(None, self.collect())])
+
+
+def _with_label(labels: str, pair: str) -> str:
+    return "{" + pair + ("," + labels[1:] if labels else "}")
+
+
+def render_families(sources: Sequence[Tuple[Optional[str], List[Dict]]]) -> str:
+    """Render ``(worker, families)`` pairs, labelling series with ``worker`` unless it is None.
+
+    Metrics are emitted once each, in the order first seen, with every
+    source's series for that metric together.
+    """
+    merged: Dict[str, Dict] = {}
+    for worker, families in sources:
+        for family in families:
+            entry = merged.setdefault(family["name"], {"name": family["name"], "samples": [], "errors": []})
+            if "error" in family:
+                entry["errors"].append(family["error"] if worker is None else f"worker {worker}: {family['error']}")
+                continue
+            entry.setdefault("kind", family["kind"])
+            entry.setdefault("help", family["help"])
+            pair = f'worker="{_escape(worker)}"' if worker is not None else None
+            entry["samples"] += [(suffix, _with_label(labels, pair) if pair else labels, value)
+                                 for suffix, labels, value in family["samples"]]
+    lines = []
+    for entry in merged.values():
+        if "kind" in entry:
+            lines += _render_family(entry["name"], entry["kind"], entry["help"], entry["samples"])
+        lines += [f"# {entry['name']} unavailable: {error}" for error in entry["errors"]]
+    return "\n".join(lines) + "\n"
+
+
+class SharedMetrics:
+    """Lets any serve.py worker answer a scrape with every worker's metrics.
+
+    Each worker writes a snapshot of its registry to ``directory`` every
+    ``interval`` seconds and again just before answering a scrape, which
+    returns the latest snapshot of every worker with a ``worker`` label.
+    Served values always come from snapshots, so a series never goes
+    backwards between scrapes answered by different workers; aggregate with
+    ``sum without (worker)``. A restarted worker starts its counters from
+    zero, which Prometheus treats like any other counter reset.
+    """
+
+    def __init__(self, registry: Registry, directory: str, worker: int, interval: float = 1.0):
+        self.registry = registry
+        self.directory = directory
+        self.worker = str(worker)
+        self.interval = interval
+        self.path = os.path.join(directory, f"worker-{worker}.json")
+
+    def write(self):
+        """Replace this worker's snapshot atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"worker": self.worker, "families": self.registry.collect()}, f)
+        os.replace(tmp_path, self.path)
+
+    def render(self) -> str:
+        self.write()
+        sources = []
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith("worker-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            sources.append((snapshot["worker"], snapshot["families"]))
+        return render_families(sources)
+
+    async def run(self):
+        """Write snapshots every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Warning: Could not write metrics snapshot: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Database seconds spent by the current request, for splitting DB from handler time
+_request_db_time: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "request_db_time", default=None)
+
+
+def add_request_db_time(seconds: float):
+    """Charge ``seconds`` of database time to the request being handled, if any."""
+    total = _request_db_time.get()
+    if total is not None:
+        total[0] += seconds
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and DB share per route.
+
+    Requests are labelled with the matched route's path template (``/api/x``
+    rather than the raw URL) so label cardinality stays bounded; unmatched
+    paths share one label. Latency runs until the response body has been
+    sent, which includes streamed exports.
+    """
+
+    def __init__(self, app, registry: Registry, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = set(exclude)
+        self.requests = registry.counter(
+            "http_requests_total", "HTTP requests by route, method and status",
+            ("method", "route", "status"))
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+        self.db_time = registry.histogram(
+            "http_request_db_seconds", "Database time per HTTP request by route", ("method", "route"))
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight", "HTTP requests currently being handled")
+
+    @staticmethod
+    def route_label(scope, root_path: str) -> str:
+        # The router stores the matched route in the scope; a mount (static
+        # files) instead extends root_path by its mount point
+        path = getattr(scope.get("route"), "path", None)
+        if path is not None:
+            return path or "/"
+        mounted = scope.get("root_path", "")
+        if mounted != root_path and mounted.startswith(root_path):
+            return mounted[len(root_path):]
+        return "<unmatched>"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        db_time = [0.0]
+        token = _request_db_time.set(db_time)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        root_path = scope.get("root_path", "")
+        self.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight.dec()
+            _request_db_time.reset(token)
+            method = scope["method"]
+            route = self.route_label(scope, root_path)
+            self.requests.inc(method=method, route=route, status=str(status))
+            self.latency.observe(elapsed, method=method, route=route)
+            self.db_time.observe(db_time[0], method=method, route=route)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the registration database
+Each migration runs once, in order, and is recorded in the schema_version
+table. Apply them as a one-shot step before starting the app (a deploy step
+or a one-off container task); app startup only reads the current version.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Per-backend DDL for the table that records applied migrations
+SCHEMA_VERSION_DDL = {
+    "mysql": """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+}
+
+
+class Migration:
+    """One schema change: per-backend statements, then indexes as (name, table, columns).
+
+    Statements must be safe to re-run (IF NOT EXISTS, or drop a leftover
+    first), and indexes are only created when missing, because MySQL commits
+    DDL as it goes and a failed run is simply run again. Databases created
+    before migrations existed already have some of these objects.
+    """
+
+    def __init__(self, version: int, description: str, statements: Optional[Dict[str, Sequence[str]]] = None,
+                 indexes: Sequence[Tuple[str, str, str]] = ()):
+        self.version = version
+        self.description = description
+        self.statements = statements or {}
+        self.indexes = tuple(indexes)
+
+    def apply(self, store, connection):
+        cursor = connection.cursor()
+        try:
+            for sql in self.statements.get(store.name, ()):
+                cursor.execute(sql)
+            for name, table, columns in self.indexes:
+                if not store.index_exists(connection, table, name):
+                    cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+        finally:
+            cursor.close()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create the registrations table", {
+        "mysql": ["""
+            CREATE TABLE IF NOT EXISTS registrations (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                email VARCHAR(255) NOT NULL UNIQUE,
+                name VARCHAR(255),
+                organization VARCHAR(255),
+                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """],
+        "sqlite": ["""
+            CREATE TABLE IF NOT EXISTS registrations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT NOT NULL UNIQUE,
+                name TEXT,
+                organization TEXT,
+                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """],
+    }),
+    # The UNIQUE email index from migration 1 serves duplicate checks and the
+    # write-behind email load; listings and exports scan this one
+    Migration(2, "Index registrations on (registration_date, id) for keyset pagination",
+              indexes=[("idx_registrations_date_id", "registrations", "registration_date, id")]),
+    # SQLite compares text case-sensitively, so A@x.com and a@x.com were both
+    # accepted where MySQL's default collation rejects the second. SQLite can't
+    # change a column's collation in place: copy into a rebuilt table (this
+    # fails, and rolls back, if the data already holds such duplicates). A
+    # copy left by an interrupted run is dropped so the step can be retried
+    Migration(3, "Compare registration emails case-insensitively on SQLite", {
+        "sqlite": [
+            "DROP TABLE IF EXISTS registrations_nocase",
+            """
+            CREATE TABLE registrations_nocase (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+                name TEXT,
+                organization TEXT,
+                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            INSERT INTO registrations_nocase (id, email, name, organization, registration_date)
+            SELECT id, email, name, organization, registration_date FROM registrations
+            """,
+            "DROP TABLE registrations",
+            "ALTER TABLE registrations_nocase RENAME TO registrations",
+        ],
+    }, indexes=[("idx_registrations_date_id", "registrations", "registration_date, id")]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def pending(current: int, target: Optional[int] = None) -> List[Migration]:
+    """Migrations newer than ``current``, up to ``target`` (default: all)."""
+    target = LATEST_VERSION if target is None else target
+    return [m for m in MIGRATIONS if current < m.version <= target]
+
+
+def migrate(store, target: Optional[int] = None, verbose: bool = False) -> List[Migration]:
+    """Bring the database up to ``target`` (default: latest); returns what was applied.
+
+    Runs are serialized by ``store.schema_lock``, so several instances
+    starting a migration at once apply each step exactly once.
+    """
+    store.create_database()
+    connection = store.connect()
+    try:
+        with store.schema_lock(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(SCHEMA_VERSION_DDL[store.name])
+            finally:
+                cursor.close()
+            current = store.schema_version(connection)
+            applied = []
+            for migration in pending(current, target):
+                started = time.perf_counter()
+                migration.apply(store, connection)
+                p = store.placeholder
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(f"INSERT INTO schema_version (version, description) VALUES ({p}, {p})",
+                                   (migration.version, migration.description))
+                finally:
+                    cursor.close()
+                applied.append(migration)
+                if verbose:
+                    print(f"  {migration.version:>3}  {migration.description} "
+                          f"({(time.perf_counter() - started) * 1000:.1f} ms)")
+            return applied
+    finally:
+        connection.close()
+
+
+def status(store) -> Dict:
+    """Applied migrations with timestamps, the current version and what is pending."""
+    connection = store.connect()
+    try:
+        current = store.schema_version(connection)
+        applied = []
+        if store.table_exists(connection, "schema_version"):
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT version, description, applied_at FROM schema_version ORDER BY version")
+                applied = [{"version": version, "description": description, "applied_at": str(applied_at)}
+                           for version, description, applied_at in cursor.fetchall()]
+            finally:
+                cursor.close()
+    finally:
+        connection.close()
+    return {
+        "current": current,
+        "latest": LATEST_VERSION,
+        "applied": applied,
+        "pending": [{"version": m.version, "description": m.description} for m in pending(current)],
+    }
+
+
+def main():
+    from dotenv import load_dotenv
+
+    from storage import create_store, db_config_from_env
+
+    parser = argparse.ArgumentParser(description="Apply or inspect registration database migrations")
+    parser.add_argument("command", nargs="?", choices=["migrate", "status"], default="migrate",
+                        help="Apply pending migrations (default) or show the schema version")
+    parser.add_argument("--target", type=int, help="Stop at this version (default: latest)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    store = create_store(db_config_from_env())
+    if args.command == "status":
+        print(json.dumps(status(store), indent=2))
+        return
+
+    started = time.perf_counter()
+    try:
+        applied = migrate(store, args.target, verbose=True)
+    except store.Error as e:
+        raise SystemExit(f"Migration failed: {e}")
+    version = applied[-1].version if applied else None
+    if version is None:
+        print(f"Schema is up to date ({time.perf_counter() - started:.2f}s)")
+    else:
+        print(f"Applied {len(applied)} migration(s), now at version {version} "
+              f"({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter API
+Serves /chat/completions (plain and SSE streaming) and /models so the news
+pipeline can run offline. Point the generator at it with
+OPENROUTER_BASE_URL=http://127.0.0.1:8081
+
+Time to first token and throughput are drawn from configurable
+distributions, a share of requests can be answered with 429 or 5xx errors,
+and each model can return its own canned markdown. Draws use a seeded RNG so
+a benchmark run can be repeated.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Union
+
+# Canned report returned for every completion
+SAMPLE_REPORT = """## Major AI Model Releases and Updates
+
+- **Example Labs ships Model X**: A new multimodal model with a longer context window. [Announcement](https://example.com/model-x)
+  - Key players: Example Labs research team
+  - Impact: Raises the bar for open-weight multimodal models
+
+## Industry News and Partnerships
+
+- **Cloud partnership**: Two major providers announce shared inference capacity.
+  - Impact: Lower serving costs for startups
+
+## Research Breakthroughs
+
+- **Efficient attention**: A paper shows linear-time attention with minimal quality loss.
+
+## Regulatory and Policy Updates
+
+- **AI safety framework**: Regulators publish draft guidance on model evaluations.
+
+## Notable AI Applications and Use Cases
+
+- **Clinical notes**: Hospitals report faster documentation with AI scribes.
+"""
+
+# Models listed by /models
+SAMPLE_MODELS = [
+    {"id": "mock/fast", "name": "Mock Fast"},
+    {"id": "mock/slow", "name": "Mock Slow"},
+]
+
+# USD per token, reported as usage.cost and in the /models pricing
+DEFAULT_PROMPT_PRICE = 0.000001
+DEFAULT_COMPLETION_PRICE = 0.000002
+
+# Matches the prompt news.py sends for a single report section
+SECTION_PROMPT_RE = re.compile(r'write the "([^"]+)" section')
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized pseudo tokens, keeping whitespace attached."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def section_content(report: str, section: str) -> Optional[str]:
+    """Body of the ``## section`` heading in ``report``, if it has one."""
+    match = re.search(rf"^## {re.escape(section)}\s*$\n(.*?)(?=^## |\Z)", report, re.M | re.S)
+    return match.group(1).strip() + "\n" if match else None
+
+
+class Delay:
+    """A latency distribution parsed from a spec string.
+
+    ``0.2`` or ``fixed:0.2``, ``uniform:LOW,HIGH``, ``normal:MEAN,SD``
+    (clipped at zero), ``lognormal:MEDIAN,SIGMA`` or ``exp:MEAN``; all in
+    seconds. Lognormal gives the long tail real model latency has.
+    """
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+
+    def __init__(self, spec: Union[str, float]):
+        self.spec = str(spec)
+        kind, _, params = self.spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        try:
+            values = [float(value) for value in params.split(",")]
+        except ValueError:
+            values = []
+        if kind not in self.KINDS or len(values) != self.KINDS[kind] or min(values) < 0:
+            raise ValueError(f"Invalid delay '{self.spec}'. Use SECONDS, uniform:LOW,HIGH, normal:MEAN,SD, "
+                             "lognormal:MEDIAN,SIGMA or exp:MEAN")
+        self.kind = kind
+        self.params = values
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        return rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+
+    def __repr__(self):
+        return f"Delay({self.spec!r})"
+
+
+def load_contents(directory: str) -> Dict[str, str]:
+    """Canned payloads from ``directory``: ``provider__model.md`` answers for ``provider/model``."""
+    contents = {}
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension in (".md", ".txt"):
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                contents[stem.replace("__", "/")] = f.read()
+    return contents
+
+
+class MockOpenRouterHandler(BaseHTTPRequestHandler):
+    """Request handler; behaviour comes from ``self.server.config``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.config.get("verbose"):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            config = self.server.config
+            pricing = {"prompt": str(config["prompt_price"]), "completion": str(config["completion_price"])}
+            models = [{**model, "pricing": pricing} for model in config["models"]]
+            self._send_json(200, {"data": models})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def _inject_error(self) -> bool:
+        """Answer with an injected 429 or 5xx instead of a completion, per the configured rates."""
+        config = self.server.config
+        roll = self.server.random()
+        if roll < config["rate_limit_rate"]:
+            status = 429
+            headers = {"Retry-After": f"{config['retry_after']:g}"}
+        elif roll < config["rate_limit_rate"] + config["error_rate"]:
+            status = config["error_statuses"][int(self.server.random() * len(config["error_statuses"]))]
+            headers = None
+        else:
+            return False
+        self.server.record(status)
+        self._send_json(status, {"error": {"code": status, "message": "Injected by mock_openrouter"}}, headers)
+        return True
+
+    def _completion_text(self, model: str, messages: List[Dict]) -> str:
+        """Canned payload for ``model``, narrowed to one section for a section prompt."""
+        config = self.server.config
+        content = config["contents"].get(model, config["content"])
+        prompt = " ".join(str(message.get("content", "")) for message in messages)
+        match = SECTION_PROMPT_RE.search(prompt)
+        if match:
+            content = section_content(content, match.group(1)) or content
+        return content
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self._inject_error():
+            return
+
+        config = self.server.config
+        model = request.get("model", "mock/fast")
+        messages = request.get("messages") or []
+        tokens = split_tokens(self._completion_text(model, messages))
+        prompt_tokens = sum(len(split_tokens(str(message.get("content", "")))) for message in messages)
+        first_token_delay = config["model_delays"].get(model, config["first_token_delay"]).sample(self.server.rng)
+        token_delay = self.server.token_delay()
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+            "cost": round(prompt_tokens * config["prompt_price"] + len(tokens) * config["completion_price"], 8),
+        }
+
+        if request.get("stream"):
+            if not self._stream(model, tokens, usage, first_token_delay, token_delay):
+                self.server.record(499)
+                return
+        else:
+            time.sleep(first_token_delay + token_delay * len(tokens))
+            self._send_json(200, {
+                "id": f"gen-{uuid.uuid4().hex}",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+        self.server.record(200, len(tokens), usage["cost"])
+
+    def _stream(self, model: str, tokens: List[str], usage: Dict, first_token_delay: float,
+                token_delay: float) -> bool:
+        """Emit chat-completion chunks using the SSE protocol; False if the client disconnected."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        generation_id = f"gen-{uuid.uuid4().hex}"
+        # OpenRouter sends keep-alive comments while the model warms up
+        self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+        self.wfile.flush()
+        time.sleep(first_token_delay)
+
+        try:
+            for token in tokens:
+                event({"id": generation_id, "model": model,
+                       "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]})
+                time.sleep(token_delay)
+
+            event({"id": generation_id, "model": model,
+                   "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                   "usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client dropped the stream, e.g. a model that lost a race
+            return False
+        return True
+
+
+class MockOpenRouterServer(ThreadingHTTPServer):
+    """Threaded server holding the mock's config, seeded RNG and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: Dict, seed: Optional[int] = None):
+        super().__init__(address, MockOpenRouterHandler)
+        self.config = config
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def random(self) -> float:
+        with self._lock:
+            return self.rng.random()
+
+    def token_delay(self) -> float:
+        """Seconds between tokens for one completion, from the rate if one is set."""
+        rate = self.config["tokens_per_second"]
+        with self._lock:
+            if rate is None:
+                return self.config["token_delay"].sample(self.rng)
+            tokens_per_second = rate.sample(self.rng)
+        return 1 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+    def record(self, status: int, tokens: int = 0, cost: float = 0.0):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["status"][status] = self._stats["status"].get(status, 0) + 1
+            self._stats["completion_tokens"] += tokens
+            self._stats["cost"] += cost
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"requests": 0, "status": {}, "completion_tokens": 0, "cost": 0.0}
+
+    def stats(self) -> Dict:
+        """Completion requests answered, by status, with tokens and cost served.
+
+        Streams the client abandoned are counted under status 499.
+        """
+        with self._lock:
+            stats = dict(self._stats, status=dict(self._stats["status"]))
+        stats["injected_errors"] = sum(count for status, count in stats["status"].items()
+                                       if status == 429 or status >= 500)
+        stats["cost"] = round(stats["cost"], 6)
+        return stats
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, content: str = SAMPLE_REPORT,
+                 first_token_delay: Union[str, float] = 0.2, token_delay: Union[str, float] = 0.005,
+                 verbose: bool = False, tokens_per_second: Union[str, float, None] = None,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 error_statuses: Sequence[int] = (500, 502, 503), contents: Optional[Dict[str, str]] = None,
+                 model_delays: Optional[Dict[str, Union[str, float]]] = None,
+                 models: Optional[List[Dict]] = None, prompt_price: float = DEFAULT_PROMPT_PRICE,
+                 completion_price: float = DEFAULT_COMPLETION_PRICE,
+                 seed: Optional[int] = None) -> MockOpenRouterServer:
+    """Start the mock server on a background thread and return it.
+
+    Delays take a number of seconds or a ``Delay`` spec such as
+    ``lognormal:0.4,0.5``; ``tokens_per_second``, when given, replaces
+    ``token_delay``. ``error_rate`` and ``rate_limit_rate`` are the shares of
+    completions answered with one of ``error_statuses`` or with 429 plus
+    ``Retry-After: retry_after``. ``contents`` maps model ids to their own
+    canned markdown and ``model_delays`` to their own first-token delay.
+
+    Use ``port=0`` to pick a free port; the bound URL is ``server.base_url``.
+    Counters are in ``server.stats()``. Call ``server.shutdown()`` when done.
+    """
+    if not 0 <= error_rate + rate_limit_rate <= 1:
+        raise ValueError("error_rate + rate_limit_rate must be between 0 and 1")
+    config = {
+        "content": content,
+        "contents": dict(contents or {}),
+        "first_token_delay": Delay(first_token_delay),
+        "token_delay": Delay(token_delay),
+        "tokens_per_second": Delay(tokens_per_second) if tokens_per_second is not None else None,
+        "model_delays": {model: Delay(spec) for model, spec in (model_delays or {}).items()},
+        "error_rate": error_rate,
+        "rate_limit_rate": rate_limit_rate,
+        "retry_after": retry_after,
+        "error_statuses": list(error_statuses),
+        "models": models if models is not None else SAMPLE_MODELS + [
+            {"id": model, "name": model} for model in contents or {}
+            if model not in {m["id"] for m in SAMPLE_MODELS}],
+        "prompt_price": prompt_price,
+        "completion_price": completion_price,
+        "verbose": verbose,
+    }
+    server = MockOpenRouterServer((host, port), config, seed)
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Options shaping the mock's latency, failures and payloads; shared with bench_pipeline.py."""
+    parser.add_argument("--first-token-delay", default="0.2",
+                        help="Seconds before the first token, or a distribution such as lognormal:0.4,0.5 "
+                             "(default: 0.2)")
+    parser.add_argument("--token-delay", default="0.005",
+                        help="Seconds between tokens, or a distribution (default: 0.005)")
+    parser.add_argument("--tokens-per-second",
+                        help="Throughput per completion instead of --token-delay, e.g. normal:80,20")
+    parser.add_argument("--model-delay", action="append", default=[], metavar="MODEL=DELAY",
+                        help="First-token delay for one model (repeatable)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of completions answered with 5xx")
+    parser.add_argument("--error-statuses", default="500,502,503",
+                        help="Statuses used for --error-rate (default: 500,502,503)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Share of completions answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After seconds sent with 429s (default: 1)")
+    parser.add_argument("--content-file", help="Markdown file to return instead of the built-in sample")
+    parser.add_argument("--content-dir",
+                        help="Per-model payloads: provider__model.md answers for provider/model")
+    parser.add_argument("--seed", type=int, help="Seed for latency and error draws")
+
+
+def server_options(args: argparse.Namespace) -> Dict:
+    """Keyword arguments for start_server() from add_server_arguments() options."""
+    content = SAMPLE_REPORT
+    if args.content_file:
+        with open(args.content_file, "r", encoding="utf-8") as f:
+            content = f.read()
+    model_delays = {}
+    for item in args.model_delay:
+        model, separator, spec = item.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid --model-delay '{item}'. Use MODEL=DELAY")
+        model_delays[model] = spec
+    return {
+        "content": content,
+        "contents": load_contents(args.content_dir) if args.content_dir else None,
+        "first_token_delay": args.first_token_delay,
+        "token_delay": args.token_delay,
+        "tokens_per_second": args.tokens_per_second,
+        "model_delays": model_delays,
+        "error_rate": args.error_rate,
+        "error_statuses": [int(status) for status in args.error_statuses.split(",") if status],
+        "rate_limit_rate": args.rate_limit_rate,
+        "retry_after": args.retry_after,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local OpenRouter stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8081, help="Port (default: 8081)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        server = start_server(args.host, args.port, verbose=True, **server_options(args))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Mock OpenRouter listening on {server.base_url}")
+    print(f"Use: OPENROUTER_BASE_URL={server.base_url} python news.py --stream")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,62 @@ This script generates weekly AI news summaries using OpenRouter's API.
 import os
 import sys
 import json
-import requests
+import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import argparse
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, as_completed, wait
 from dotenv import load_dotenv
 
+from news_archive import DEFAULT_ARCHIVE_PATH, NewsArchive
+from news_index import DEFAULT_INDEX_PATH, NewsIndex, is_report_path
+from openrouter_client import OpenRouterClient, OpenRouterError, OpenRouterResponseError
+from response_cache import ResponseCache
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Sections of the weekly report, in output order
+NEWS_SECTIONS = [
+    "Major AI Model Releases and Updates",
+    "Industry News and Partnerships",
+    "Research Breakthroughs",
+    "Regulatory and Policy Updates",
+    "Notable AI Applications and Use Cases",
+]
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a worker whose streamed completion was cancelled (e.g. lost a race)."""
+
+
+def submit_daemon(fn: Callable, *args, name: str = "news-worker") -> Future:
+    """Run ``fn(*args)`` on a daemon thread and return its Future.
+    
+    Unlike ThreadPoolExecutor workers, which are joined at interpreter exit, an
+    abandoned call (a timed-out section, a losing race stream) never keeps the
+    process alive.
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
 
 class AINewsGenerator:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
         """Initialize the AI News Generator with OpenRouter API key."""
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         if not self.api_key:
@@ -27,7 +71,36 @@ class AINewsGenerator:
                 "You can copy .env.example to .env and add your API key."
             )
         
-        self.base_url = "https://openrouter.ai/api/v1"
+        # Pooled HTTP client with retries and rate limiting. The base URL can
+        # point at a local stand-in such as mock_openrouter.py
+        rate_limit = os.getenv("OPENROUTER_RATE_LIMIT")
+        self.client = OpenRouterClient(
+            self.api_key,
+            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+            timeout=(10, float(os.getenv("OPENROUTER_TIMEOUT", "120"))),
+            max_retries=int(os.getenv("OPENROUTER_MAX_RETRIES", "4")),
+            rate_limit=float(rate_limit) if rate_limit else None
+        )
+        # Timing of the most recent streamed completion
+        self.last_stream_stats: Dict = {}
+        # Where generate_news saved its most recent report
+        self.last_output_file: Optional[str] = None
+        
+        # Disk cache for completions and model listings
+        self.cache = ResponseCache(
+            os.getenv("OPENROUTER_CACHE_DIR", ".cache/openrouter"),
+            ttl=float(os.getenv("OPENROUTER_CACHE_TTL", "86400"))
+        ) if use_cache else None
+        # When True, skip cache reads but still store fresh responses
+        self.refresh_cache = False
+        
+        # Catalog of saved reports, opened on first write
+        self.index_path = os.getenv("NEWS_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self._news_index: Optional[NewsIndex] = None
+        # With NEWS_ARCHIVE=1 reports are moved into the compressed archive once saved
+        self.archive_reports = os.getenv("NEWS_ARCHIVE", "").lower() in ("1", "true", "yes")
+        self.archive_path = os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH)
+        
         # Load model from environment variable or use default
         self.model = os.getenv("OPENROUTER_MODEL", "z-ai/glm-4.6")
         
@@ -38,20 +111,25 @@ class AINewsGenerator:
                 "You can see available models with: python news.py --list-models"
             )
     
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+    
+    @base_url.setter
+    def base_url(self, value: str):
+        self.client.base_url = value
+    
     def generate_news_prompt(self, days_back: int = 7) -> str:
         """Generate a prompt for AI news based on the specified number of days back."""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
+        sections = "\n        ".join(f"{i}. {title}" for i, title in enumerate(NEWS_SECTIONS, 1))
         
         prompt = f"""
         Please generate a comprehensive weekly AI news summary covering the period from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}.
         
         Include the following sections:
-        1. Major AI Model Releases and Updates
-        2. Industry News and Partnerships
-        3. Research Breakthroughs
-        4. Regulatory and Policy Updates
-        5. Notable AI Applications and Use Cases
+        {sections}
         
         For each section, provide:
         - Brief description of the news item
@@ -64,13 +142,49 @@ class AINewsGenerator:
         
         return prompt
     
-    def call_openrouter(self, prompt: str) -> str:
-        """Make a request to OpenRouter API."""
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
+    def generate_section_prompt(self, section: str, days_back: int = 7) -> str:
+        """Generate a prompt covering a single section of the weekly AI news summary."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        
+        prompt = f"""
+        Please write the "{section}" section of a weekly AI news summary covering the period from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}.
+        
+        For each news item, provide:
+        - Brief description of the news item
+        - Key companies or researchers involved
+        - Potential impact on the AI industry
+        
+        Format the output as markdown with bullet points and links where relevant.
+        Do not include a title or the section heading; start directly with the news items.
+        Make it informative yet concise, suitable for a weekly newsletter.
+        """
         
+        return prompt
+    
+    def _completion_cache_key(self, data: Dict) -> str:
+        """Cache key for a completion: endpoint, model, prompt hash and remaining parameters."""
+        prompt_hash = hashlib.sha256(
+            json.dumps(data["messages"], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        params = {k: v for k, v in data.items() if k not in ("messages", "stream")}
+        return ResponseCache.key("chat/completions", self.base_url, data["model"], prompt_hash, params)
+    
+    def _cache_get(self, key: str):
+        if self.cache is None or self.refresh_cache:
+            return None
+        return self.cache.get(key)
+    
+    def _cache_set(self, key: str, value, ttl: Optional[float] = None):
+        if self.cache is not None:
+            self.cache.set(key, value, ttl=ttl)
+    
+    def _post_completion(self, prompt: str, timeout: Optional[float] = None,
+                         deadline: Optional[float] = None) -> str:
+        """Send a chat completion request and return the message content.
+        
+        Raises OpenRouterError on failure.
+        """
         data = {
             "model": self.model,
             "messages": [
@@ -78,83 +192,376 @@ class AINewsGenerator:
             ]
         }
         
+        cache_key = self._completion_cache_key(data)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        result = self.client.chat_completion(data, timeout=timeout, deadline=deadline)
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data
-            )
-            response.raise_for_status()
+            content = result["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise OpenRouterResponseError(
+                f"Error parsing response from OpenRouter: {e}", body=json.dumps(result)
+            ) from e
+        self._cache_set(cache_key, content)
+        return content
+    
+    def _stream_model(self, prompt: str, model: str, on_token: Optional[Callable[[str], None]] = None,
+                      timeout: Optional[float] = None,
+                      cancel_event: Optional[threading.Event] = None) -> Tuple[str, Dict]:
+        """Stream one completion from ``model`` and return its content and metrics.
+        
+        Metrics cover latency, time to first token, throughput, token usage and
+        cost when OpenRouter reports it. If ``cancel_event`` is set mid-stream the
+        connection is dropped and GenerationCancelled is raised.
+        """
+        data = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+        
+        cache_key = self._completion_cache_key(data)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached, {"model": model, "cached": True}
+        
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        usage = None
+        parts = []
+        
+        # Ask OpenRouter to include token usage and cost in the final chunk
+        for chunk in self.client.stream_chat_completion({**data, "usage": {"include": True}}, timeout=timeout):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled(model)
+            usage = chunk.get("usage") or usage
+            if not chunk.get("choices"):
+                continue
+            text = chunk["choices"][0].get("delta", {}).get("content")
+            if not text:
+                continue
             
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        
-        except requests.exceptions.RequestException as e:
-            print(f"Error making request to OpenRouter: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response content: {e.response.text}")
-            sys.exit(1)
-        except (KeyError, IndexError) as e:
-            print(f"Error parsing response from OpenRouter: {e}")
-            sys.exit(1)
-    
-    def generate_news(self, days_back: int = 7, output_file: Optional[str] = None) -> str:
-        """Generate AI news for the specified period."""
-        print(f"Generating AI news for the past {days_back} days...")
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunks += 1
+            parts.append(text)
+            if on_token:
+                on_token(text)
         
-        prompt = self.generate_news_prompt(days_back)
-        news_content = self.call_openrouter(prompt)
+        finished = time.perf_counter()
+        usage = usage or {}
+        tokens = usage.get("completion_tokens") or chunks
+        generation_time = finished - (first_token_at or finished)
+        stats = {
+            "model": model,
+            "time_to_first_token": (first_token_at - started) if first_token_at else None,
+            "total_time": finished - started,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generation_time if generation_time > 0 else None,
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "cost": usage.get("cost"),
+        }
+        content = "".join(parts)
+        self._cache_set(cache_key, content)
+        return content, stats
+    
+    def _stream_completion(self, prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                           timeout: Optional[float] = None) -> str:
+        """Stream a chat completion over SSE, passing each content delta to ``on_token``.
         
-        # Add header with generation date
-        header = f"""# AI News Weekly Report
+        Time to first token and tokens per second are stored in ``last_stream_stats``.
+        Raises OpenRouterError on failure.
+        """
+        content, self.last_stream_stats = self._stream_model(prompt, self.model, on_token, timeout)
+        return content
+    
+    def call_openrouter(self, prompt: str, stream: bool = False,
+                        on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Make a request to OpenRouter API.
+        
+        With ``stream=True`` the completion is received incrementally and each
+        piece of text is passed to ``on_token`` as it arrives. Transient errors
+        are retried by the client; anything else raises OpenRouterError.
+        """
+        if stream:
+            return self._stream_completion(prompt, on_token=on_token)
+        return self._post_completion(prompt)
+    
+    def generate_news_sections(self, days_back: int = 7, section_timeout: float = 120) -> str:
+        """Generate every report section as a concurrent request and assemble them in order.
+        
+        Total latency approaches that of the slowest section. A section that fails or
+        exceeds ``section_timeout`` is replaced by a short note instead of failing the
+        whole report; RuntimeError is raised only if every section fails. The
+        timeout is a deadline for each request, retries included.
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + section_timeout
+        
+        def timed(section):
+            prompt = self.generate_section_prompt(section, days_back)
+            content = self._post_completion(prompt, timeout=section_timeout, deadline=deadline)
+            return content, time.perf_counter() - started
+        
+        futures = [submit_daemon(timed, section, name="news-section") for section in NEWS_SECTIONS]
+        # Requests give up at the deadline by themselves; don't wait for stragglers
+        wait(futures, timeout=section_timeout)
+        
+        parts = []
+        failures = 0
+        for section, future in zip(NEWS_SECTIONS, futures):
+            if not future.done():
+                error = f"timed out after {section_timeout:.0f}s"
+            elif future.exception() is not None:
+                error = str(future.exception())
+            else:
+                content, elapsed = future.result()
+                print(f"✓ {section} ({elapsed:.1f}s)")
+                parts.append(f"## {section}\n\n{content.strip()}\n")
+                continue
+            
+            failures += 1
+            print(f"✗ {section}: {error}")
+            parts.append(f"## {section}\n\n*This section could not be generated this week.*\n")
+        
+        if failures == len(NEWS_SECTIONS):
+            raise RuntimeError("Every news section failed to generate")
+        
+        print(f"Generated {len(NEWS_SECTIONS) - failures}/{len(NEWS_SECTIONS)} sections "
+              f"in {time.perf_counter() - started:.1f}s")
+        return "\n".join(parts)
+    
+    def _coverage_window(self, days_back: int) -> Tuple[str, str]:
+        """First and last day (YYYY-MM-DD) covered by a report."""
+        now = datetime.now()
+        return (now - timedelta(days=days_back)).strftime('%Y-%m-%d'), now.strftime('%Y-%m-%d')
+    
+    def _report_header(self, days_back: int, model: Optional[str] = None) -> str:
+        """Markdown header with the generation date, coverage window and optional model."""
+        model_line = f"*Model: {model}*\n" if model else ""
+        window_start, window_end = self._coverage_window(days_back)
+        return f"""# AI News Weekly Report
         
 *Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
-*Covering the period from {(datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}*
-
+*Covering the period from {window_start} to {window_end}*
+{model_line}
 ---
 
 """
+    
+    def _catalog_report(self, output_file: str, days_back: int, model: Optional[str] = None,
+                        archive: bool = True):
+        """Record a saved report in the news catalog and, if enabled, move it into
+        the compressed archive. Failures only warn; the report file stays put.
+        Reports saved outside news_database/ are left alone, and a path the
+        caller chose (``archive=False``) is cataloged but never archived."""
+        if not is_report_path(output_file):
+            return
+        try:
+            if self._news_index is None:
+                self._news_index = NewsIndex(self.index_path)
+            window_start, window_end = self._coverage_window(days_back)
+            self._news_index.add(output_file, window_start, window_end, model or self.model)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: could not index {output_file}: {e}")
         
-        full_content = header + news_content
+        if not (archive and self.archive_reports):
+            return
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                text = f.read()
+            archive = NewsArchive(self.archive_path)
+            try:
+                archive.put(output_file, text)
+                verified = archive.get(output_file) == text
+            finally:
+                archive.close()
+            if verified:
+                os.remove(output_file)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: could not archive {output_file}: {e}")
+    
+    def _default_output_file(self, suffix: str = "") -> str:
+        """Timestamped path in news_database/, created if needed."""
+        os.makedirs("news_database", exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"news_database/ai_news_{timestamp}{suffix}.md"
+    
+    def generate_news(self, days_back: int = 7, output_file: Optional[str] = None,
+                      parallel: bool = False, section_timeout: float = 120,
+                      stream: bool = False) -> str:
+        """Generate AI news for the specified period.
+        
+        With ``parallel=True`` each section is requested concurrently instead of
+        sending one prompt for the whole report. With ``stream=True`` the report
+        is written to the output file and stdout as tokens arrive.
+        """
+        print(f"Generating AI news for the past {days_back} days...")
+        
+        header = self._report_header(days_back)
         
         # Default to saving in news_database with timestamp if no output file specified
-        if not output_file:
-            # Create news_database directory if it doesn't exist
-            os.makedirs("news_database", exist_ok=True)
-            
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"news_database/ai_news_{timestamp}.md"
+        default_output = not output_file
+        if default_output:
+            output_file = self._default_output_file()
+        self.last_output_file = output_file
         
-        if output_file:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        
+        if stream and not parallel:
+            prompt = self.generate_news_prompt(days_back)
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(full_content)
+                f.write(header)
+                f.flush()
+                
+                def write_token(text):
+                    f.write(text)
+                    f.flush()
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                
+                news_content = self.call_openrouter(prompt, stream=True, on_token=write_token)
+            
+            stats = self.last_stream_stats
+            print()
+            if stats.get("cached"):
+                print("Served from response cache")
+            if stats.get("time_to_first_token") is not None:
+                print(f"Time to first token: {stats['time_to_first_token']:.2f}s")
+            if stats.get("tokens_per_second") is not None:
+                print(f"Throughput: {stats['tokens']} tokens at {stats['tokens_per_second']:.1f} tokens/s "
+                      f"({stats['total_time']:.1f}s total)")
+            self._catalog_report(output_file, days_back, archive=default_output)
             print(f"AI news saved to {output_file}")
+            return header + news_content
+        
+        if parallel:
+            news_content = self.generate_news_sections(days_back, section_timeout=section_timeout)
+        else:
+            prompt = self.generate_news_prompt(days_back)
+            news_content = self.call_openrouter(prompt)
+        
+        full_content = header + news_content
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(full_content)
+        self._catalog_report(output_file, days_back, archive=default_output)
+        print(f"AI news saved to {output_file}")
         
         return full_content
     
-    def list_available_models(self) -> List[Dict]:
-        """List available models from OpenRouter."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}"
+    def generate_news_multi(self, models: Sequence[str], strategy: str = "ensemble",
+                            days_back: int = 7, timeout: Optional[float] = None,
+                            output_file: Optional[str] = None) -> Dict:
+        """Generate the report with several models concurrently.
+        
+        ``race`` keeps the first successful completion, cancels the other streams
+        and saves the winner like ``generate_news`` (to ``output_file`` if given).
+        Losing streams run on daemon threads and stop at their next chunk, so they
+        never hold up the caller or interpreter exit. ``ensemble`` waits for every
+        model and saves each report side by side in news_database/, together with
+        a JSON file of per-model latency, token and cost metrics.
+        
+        Returns a dict with the strategy, per-model ``results`` and, for ``race``,
+        the ``winner``. Raises OpenRouterError if every model fails.
+        """
+        if strategy not in ("race", "ensemble"):
+            raise ValueError(f"Unknown strategy '{strategy}'. Use 'race' or 'ensemble'.")
+        if output_file and strategy != "race":
+            raise ValueError("An output file can only be given with the 'race' strategy.")
+        models = list(dict.fromkeys(models))
+        print(f"Generating AI news with {len(models)} models ({strategy})...")
+        
+        prompt = self.generate_news_prompt(days_back)
+        cancel = threading.Event() if strategy == "race" else None
+        futures = {
+            submit_daemon(self._stream_model, prompt, model, None, timeout, cancel, name="news-model"): model
+            for model in models
         }
         
-        try:
-            response = requests.get(
-                f"{self.base_url}/models",
-                headers=headers
-            )
-            response.raise_for_status()
+        results = {}
+        contents = {}
+        winner = None
+        for future in as_completed(futures):
+            model = futures[future]
+            try:
+                content, stats = future.result()
+            except OpenRouterError as e:
+                print(f"✗ {model}: {e}")
+                results[model] = {"model": model, "error": str(e)}
+                continue
             
-            models_data = response.json()
-            return models_data.get("data", [])
+            results[model] = stats
+            contents[model] = content
+            if stats.get("cached"):
+                print(f"✓ {model} (cached)")
+            else:
+                print(f"✓ {model} ({stats['total_time']:.1f}s, {stats['tokens']} tokens)")
+            if strategy == "race":
+                winner = model
+                cancel.set()
+                break
+        
+        for model in models:
+            results.setdefault(model, {"model": model, "cancelled": True})
+        
+        if not contents:
+            raise OpenRouterError("Every model failed to generate the report")
         
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching models from OpenRouter: {e}")
-            return []
+        summary = {"strategy": strategy, "days_back": days_back, "results": [results[m] for m in models]}
+        if strategy == "race":
+            default_output = not output_file
+            if default_output:
+                output_file = self._default_output_file()
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(self._report_header(days_back, winner) + contents[winner])
+            self._catalog_report(output_file, days_back, winner, archive=default_output)
+            print(f"Winner: {winner}. AI news saved to {output_file}")
+            summary.update(winner=winner, output_file=output_file)
+            return summary
+        
+        for model, content in contents.items():
+            slug = re.sub(r"[^A-Za-z0-9._-]+", "-", model)
+            output_file = self._default_output_file(f"_{slug}")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(self._report_header(days_back, model) + content)
+            self._catalog_report(output_file, days_back, model)
+            results[model]["output_file"] = output_file
+            print(f"AI news from {model} saved to {output_file}")
+        
+        metrics_file = self._default_output_file("_ensemble").replace(".md", ".json")
+        with open(metrics_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Ensemble metrics saved to {metrics_file}")
+        summary["metrics_file"] = metrics_file
+        return summary
+    
+    def list_available_models(self) -> List[Dict]:
+        """List available models from OpenRouter. Raises OpenRouterError on failure."""
+        cache_key = ResponseCache.key("models", self.base_url)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        models = self.client.list_models()
+        # The catalogue changes more often than a given week's report
+        self._cache_set(cache_key, models, ttl=3600)
+        return models
+
+
+def print_cache_stats(generator: AINewsGenerator):
+    """Print response cache hit/miss counts for this run."""
+    if generator.cache is not None:
+        stats = generator.cache.stats()
+        print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses, {stats['writes']} writes")
 
 
 def main():
@@ -163,11 +570,23 @@ def main():
     parser.add_argument("--output", "-o", type=str, help="Output file path (default: print to console)")
     parser.add_argument("--model", "-m", type=str, help="OpenRouter model to use")
     parser.add_argument("--list-models", action="store_true", help="List available models and exit")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the response cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached responses and store fresh ones")
+    parser.add_argument("--models", type=str, help="Comma-separated models to run concurrently")
+    parser.add_argument("--strategy", choices=["race", "ensemble"], default="ensemble",
+                        help="With --models: keep the first success (race) or all reports (ensemble)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--parallel", action="store_true", help="Request each report section concurrently")
+    mode.add_argument("--stream", action="store_true", help="Stream the report to the output file and console as it is generated")
+    parser.add_argument("--section-timeout", type=float, default=120, help="Per-section timeout in seconds with --parallel (default: 120)")
     
     args = parser.parse_args()
+    if args.models and args.output and args.strategy != "race":
+        parser.error("--output with --models needs --strategy race; ensemble reports are saved in news_database/")
     
     try:
-        generator = AINewsGenerator()
+        generator = AINewsGenerator(use_cache=not args.no_cache)
+        generator.refresh_cache = args.refresh
         
         if args.model:
             generator.model = args.model
@@ -177,18 +596,39 @@ def main():
             print("Available models:")
             for model in models:
                 print(f"- {model['id']}: {model['name']}")
+            print_cache_stats(generator)
+            return
+        
+        if args.models:
+            models = [m.strip() for m in args.models.split(",") if m.strip()]
+            generator.generate_news_multi(models, strategy=args.strategy, days_back=args.days,
+                                          output_file=args.output)
+            print_cache_stats(generator)
             return
         
-        news_content = generator.generate_news(days_back=args.days, output_file=args.output)
+        news_content = generator.generate_news(
+            days_back=args.days,
+            output_file=args.output,
+            parallel=args.parallel,
+            section_timeout=args.section_timeout,
+            stream=args.stream
+        )
         
-        # Always display the content unless explicitly saved to a file
-        if not args.output:
+        # Always display the content unless explicitly saved to a file or already streamed
+        if not args.output and not args.stream:
             print("\n--- Generated AI News ---")
             print(news_content)
+        
+        print_cache_stats(generator)
     
     except ValueError as e:
         print(f"Configuration Error: {e}")
         sys.exit(1)
+    except OpenRouterError as e:
+        print(f"Error: {e}")
+        if e.body:
+            print(f"Response content: {e.body}")
+        sys.exit(1)
     except Exception as e:
         print(f"Unexpected error: {e}")
         sys.exit(1)
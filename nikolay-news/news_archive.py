@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Compressed, deduplicated archive for generated news reports
+Reports are stored in a SQLite file as zlib streams primed with a shared
+dictionary trained on earlier reports, so the boilerplate they have in common
+(headers, section titles, recurring phrases) costs almost nothing. Identical
+reports are stored once. Any single report can be read back by path.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import random
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from news_index import DEFAULT_DIRECTORY
+from stats import percentile
+
+DEFAULT_ARCHIVE_PATH = os.path.join(DEFAULT_DIRECTORY, "archive.db")
+
+# zlib only looks back 32 KB, so a larger dictionary would be wasted
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+
+def train_dictionary(texts: Iterable[str], size: int = MAX_DICTIONARY_SIZE) -> bytes:
+    """Build a zlib preset dictionary from lines that recur across reports.
+
+    zlib favours matches close to the end of the dictionary, so the most
+    common lines are placed last.
+    """
+    counts = Counter()
+    for text in texts:
+        counts.update(set(line for line in text.splitlines() if line.strip()))
+
+    chosen = []
+    total = 0
+    for line, count in counts.most_common():
+        if count < 2:
+            break
+        encoded = (line + "\n").encode("utf-8")
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+class NewsArchive:
+    """SQLite-backed store of compressed reports.
+
+    ``blobs`` holds each distinct report once, keyed by SHA-256 and compressed
+    against one of the ``dictionaries``; ``reports`` maps report paths to blobs.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH, level: int = 9):
+        self.path = path
+        self.level = level
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                dictionary_id INTEGER REFERENCES dictionaries (id),
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reports (
+                path TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL REFERENCES blobs (sha256)
+            );
+        """)
+        self.conn.commit()
+        self._dictionaries: Dict[int, bytes] = {}
+
+    def _dictionary(self, dictionary_id: Optional[int]) -> bytes:
+        if dictionary_id is None:
+            return b""
+        data = self._dictionaries.get(dictionary_id)
+        if data is None:
+            row = self.conn.execute("SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)).fetchone()
+            data = self._dictionaries[dictionary_id] = row[0]
+        return data
+
+    def current_dictionary_id(self) -> Optional[int]:
+        """Dictionary used for new reports: the most recently trained one."""
+        row = self.conn.execute("SELECT MAX(id) FROM dictionaries").fetchone()
+        return row[0]
+
+    def add_dictionary(self, data: bytes) -> Optional[int]:
+        """Store a trained dictionary and make it current; returns its id."""
+        if not data:
+            return self.current_dictionary_id()
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO dictionaries (data) VALUES (?)", (data,))
+        return cursor.lastrowid
+
+    def put(self, path: str, text: str) -> Dict:
+        """Archive ``text`` under ``path``; identical content is stored once."""
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = os.path.normpath(path)
+        existing = self.conn.execute("SELECT length(data) FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+
+        with self.conn:
+            if existing is None:
+                dictionary_id = self.current_dictionary_id()
+                compressor = zlib.compressobj(self.level, zdict=self._dictionary(dictionary_id)) \
+                    if dictionary_id is not None else zlib.compressobj(self.level)
+                data = compressor.compress(raw) + compressor.flush()
+                self.conn.execute(
+                    "INSERT INTO blobs (sha256, dictionary_id, size, data) VALUES (?, ?, ?, ?)",
+                    (digest, dictionary_id, len(raw), data),
+                )
+                stored = len(data)
+            else:
+                stored = 0
+            self.conn.execute("INSERT OR REPLACE INTO reports (path, sha256) VALUES (?, ?)", (path, digest))
+
+        return {"path": path, "sha256": digest, "size": len(raw), "stored": stored,
+                "deduplicated": existing is not None}
+
+    def get(self, path: str) -> str:
+        """Return the report archived under ``path``; raises KeyError if absent."""
+        row = self.conn.execute(
+            "SELECT b.dictionary_id, b.data FROM reports r JOIN blobs b ON b.sha256 = r.sha256 "
+            "WHERE r.path = ?", (os.path.normpath(path),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(path)
+        dictionary_id, data = row
+        decompressor = zlib.decompressobj(zdict=self._dictionary(dictionary_id)) \
+            if dictionary_id is not None else zlib.decompressobj()
+        return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+    def __contains__(self, path: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM reports WHERE path = ?",
+                                 (os.path.normpath(path),)).fetchone() is not None
+
+    def paths(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT path FROM reports ORDER BY path")]
+
+    def stats(self) -> Dict:
+        reports = self.conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        logical = self.conn.execute(
+            "SELECT COALESCE(SUM(b.size), 0) FROM reports r JOIN blobs b ON b.sha256 = r.sha256"
+        ).fetchone()[0]
+        blobs, unique, compressed = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length(data)), 0) FROM blobs"
+        ).fetchone()
+        dictionaries = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM dictionaries"
+        ).fetchone()
+        return {
+            "reports": reports,
+            "unique_reports": blobs,
+            "raw_bytes": logical,
+            "unique_bytes": unique,
+            "compressed_bytes": compressed + dictionaries[1],
+            "ratio": round(logical / (compressed + dictionaries[1]), 2) if compressed else None,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def read_report(path: str, archive_path: str = DEFAULT_ARCHIVE_PATH) -> str:
+    """Read a report from disk, falling back to the archive for migrated files."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        if not os.path.exists(archive_path):
+            raise
+    archive = NewsArchive(archive_path)
+    try:
+        return archive.get(path)
+    except KeyError:
+        raise FileNotFoundError(f"News report not found on disk or in archive: {path}") from None
+    finally:
+        archive.close()
+
+
+def report_exists(path: str, archive_path: str = DEFAULT_ARCHIVE_PATH) -> bool:
+    """True if the report is on disk or in the archive."""
+    if os.path.exists(path):
+        return True
+    if not os.path.exists(archive_path):
+        return False
+    archive = NewsArchive(archive_path)
+    try:
+        return path in archive
+    finally:
+        archive.close()
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def measure_read_latency(read, paths: List[str], samples: int = 200) -> Dict[str, float]:
+    """p50/p99 latency in milliseconds of reading random reports with ``read``."""
+    timings = []
+    for path in random.choices(paths, k=samples):
+        start = time.perf_counter()
+        read(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(percentile(timings, 50), 3), "p99_ms": round(percentile(timings, 99), 3)}
+
+
+def migrate(directory: str = DEFAULT_DIRECTORY, archive_path: str = DEFAULT_ARCHIVE_PATH,
+            remove: bool = False, train: bool = True) -> Dict:
+    """Move ``ai_news_*.md`` files into the archive and report savings and read latency.
+
+    Each report is verified by reading it back before its file is removed.
+    """
+    paths = sorted(os.path.normpath(p) for p in glob.glob(os.path.join(directory, "ai_news_*.md")))
+    texts = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            texts[path] = f.read()
+
+    archive = NewsArchive(archive_path)
+    try:
+        if train and texts:
+            archive.add_dictionary(train_dictionary(texts.values()))
+
+        file_latency = measure_read_latency(read_file, paths) if paths else None
+        deduplicated = 0
+        for path, text in texts.items():
+            result = archive.put(path, text)
+            deduplicated += result["deduplicated"]
+            if archive.get(path) != text:
+                raise RuntimeError(f"Archive round-trip failed for {path}")
+        archive_latency = measure_read_latency(archive.get, paths) if paths else None
+
+        if remove:
+            for path in paths:
+                os.remove(path)
+
+        stats = archive.stats()
+        stats.update(
+            migrated=len(paths),
+            deduplicated=deduplicated,
+            removed=len(paths) if remove else 0,
+            archive_file_bytes=os.path.getsize(archive_path),
+            file_read=file_latency,
+            archive_read=archive_latency,
+        )
+        if stats["raw_bytes"]:
+            stats["savings_pct"] = round(100 * (1 - stats["compressed_bytes"] / stats["raw_bytes"]), 1)
+        return stats
+    finally:
+        archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed archive for news reports")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Archive the .md files in news_database/")
+    migrate_parser.add_argument("--directory", default=DEFAULT_DIRECTORY, help="Directory to migrate")
+    migrate_parser.add_argument("--remove", action="store_true",
+                                help="Delete each .md file once it is archived and verified")
+    migrate_parser.add_argument("--no-train", action="store_true",
+                                help="Keep the current dictionary instead of training a new one")
+
+    get_parser = subparsers.add_parser("get", help="Print one archived report")
+    get_parser.add_argument("path", help="Report path, e.g. news_database/ai_news_20250101_090000.md")
+
+    subparsers.add_parser("list", help="List archived report paths")
+    subparsers.add_parser("stats", help="Show archive size and compression ratio")
+
+    parser.add_argument("--archive", default=os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH),
+                        help=f"Archive file (default: {DEFAULT_ARCHIVE_PATH})")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        stats = migrate(args.directory, args.archive, remove=args.remove, train=not args.no_train)
+        print(f"Migrated {stats['migrated']} reports ({stats['deduplicated']} duplicates) into {args.archive}")
+        if stats["raw_bytes"]:
+            print(f"Raw: {stats['raw_bytes']:,} bytes, compressed: {stats['compressed_bytes']:,} bytes "
+                  f"({stats['ratio']}x, {stats['savings_pct']}% saved)")
+        if stats["file_read"]:
+            print(f"Read latency - files: p50 {stats['file_read']['p50_ms']} ms, "
+                  f"p99 {stats['file_read']['p99_ms']} ms; "
+                  f"archive: p50 {stats['archive_read']['p50_ms']} ms, "
+                  f"p99 {stats['archive_read']['p99_ms']} ms")
+        return
+
+    archive = NewsArchive(args.archive)
+    try:
+        if args.command == "get":
+            print(archive.get(args.path), end="")
+        elif args.command == "list":
+            for path in archive.paths():
+                print(path)
+        else:
+            for key, value in archive.stats().items():
+                print(f"{key}: {value}")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+SQLite catalog of generated news reports
+Records path, coverage window, model, size and content hash for every report
+so "latest", "by window" and "by model" are index lookups instead of a
+glob + getmtime scan of news_database/. The catalog can be rebuilt from the
+directory at any time.
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_DIRECTORY = "news_database"
+DEFAULT_INDEX_PATH = os.path.join(DEFAULT_DIRECTORY, "index.db")
+# Reports AINewsGenerator saves by default; only these are cataloged
+REPORT_PATTERN = "ai_news_*.md"
+
+REPORT_FIELDS = ("path", "created_at", "window_start", "window_end", "model", "size", "sha256")
+
+# Header lines written by AINewsGenerator._report_header
+GENERATED_RE = re.compile(r"^\*Generated on (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\*", re.MULTILINE)
+WINDOW_RE = re.compile(r"^\*Covering the period from (\d{4}-\d{2}-\d{2}) to (\d{4}-\d{2}-\d{2})\*", re.MULTILINE)
+MODEL_RE = re.compile(r"^\*Model: (.+?)\*", re.MULTILINE)
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_report_path(path: str, directory: str = DEFAULT_DIRECTORY) -> bool:
+    """True for a report saved under ``directory`` by default, not a one-off --output path."""
+    path = os.path.normpath(path)
+    return (os.path.dirname(path) == os.path.normpath(directory)
+            and fnmatch.fnmatch(os.path.basename(path), REPORT_PATTERN))
+
+
+def parse_report_header(text: str) -> Dict[str, Optional[str]]:
+    """Pull the generation time, coverage window and model out of a report header."""
+    header = text[:text.find("\n---\n")] if "\n---\n" in text else text[:1024]
+    generated = GENERATED_RE.search(header)
+    window = WINDOW_RE.search(header)
+    model = MODEL_RE.search(header)
+    return {
+        "created_at": generated.group(1).replace(" ", "T") if generated else None,
+        "window_start": window.group(1) if window else None,
+        "window_end": window.group(2) if window else None,
+        "model": model.group(1) if model else None,
+    }
+
+
+class NewsIndex:
+    """Catalog of news reports in a small SQLite database.
+
+    Every lookup is served by a B-tree index: ``latest`` by creation time,
+    ``by_model`` by (model, creation time) and ``by_window`` by window end.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS news_reports (
+                path TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                window_start TEXT,
+                window_end TEXT,
+                model TEXT,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_news_created ON news_reports (created_at);
+            CREATE INDEX IF NOT EXISTS idx_news_model_created ON news_reports (model, created_at);
+            CREATE INDEX IF NOT EXISTS idx_news_window ON news_reports (window_end, window_start);
+            CREATE INDEX IF NOT EXISTS idx_news_sha256 ON news_reports (sha256);
+        """)
+        self.conn.commit()
+
+    def add(self, path: str, window_start: Optional[str] = None, window_end: Optional[str] = None,
+            model: Optional[str] = None, created_at: Optional[str] = None,
+            text: Optional[str] = None) -> Dict:
+        """Record (or refresh) a report.
+
+        Size and hash come from ``text`` when given, otherwise from the file.
+        """
+        if text is not None:
+            raw = text.encode("utf-8")
+            size, sha256 = len(raw), hashlib.sha256(raw).hexdigest()
+        else:
+            size, sha256 = os.path.getsize(path), file_digest(path)
+        entry = {
+            "path": os.path.normpath(path),
+            "created_at": created_at or datetime.now().isoformat(timespec="seconds"),
+            "window_start": window_start,
+            "window_end": window_end,
+            "model": model,
+            "size": size,
+            "sha256": sha256,
+        }
+        with self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO news_reports ({', '.join(REPORT_FIELDS)}) "
+                f"VALUES ({', '.join('?' for _ in REPORT_FIELDS)})",
+                [entry[field] for field in REPORT_FIELDS],
+            )
+        return entry
+
+    def add_file(self, path: str) -> Dict:
+        """Record a report, taking its metadata from the markdown header."""
+        with open(path, "r", encoding="utf-8") as f:
+            meta = parse_report_header(f.read(2048))
+        if meta["created_at"] is None:
+            meta["created_at"] = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+        return self.add(path, **meta)
+
+    def remove(self, path: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM news_reports WHERE path = ?", (os.path.normpath(path),))
+
+    def _rows(self, sql: str, params=()) -> List[Dict]:
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def latest(self, model: Optional[str] = None) -> Optional[Dict]:
+        """Most recently generated report, optionally for one model."""
+        if model is None:
+            rows = self._rows("SELECT * FROM news_reports ORDER BY created_at DESC LIMIT 1")
+        else:
+            rows = self._rows("SELECT * FROM news_reports WHERE model = ? "
+                              "ORDER BY created_at DESC LIMIT 1", (model,))
+        return rows[0] if rows else None
+
+    def by_model(self, model: str, limit: int = 100) -> List[Dict]:
+        """Reports generated by ``model``, newest first."""
+        return self._rows("SELECT * FROM news_reports WHERE model = ? "
+                          "ORDER BY created_at DESC LIMIT ?", (model, limit))
+
+    def by_window(self, start: str, end: str, limit: int = 100) -> List[Dict]:
+        """Reports whose coverage window overlaps [start, end] (YYYY-MM-DD), newest first."""
+        return self._rows("SELECT * FROM news_reports WHERE window_end >= ? AND window_start <= ? "
+                          "ORDER BY window_end DESC LIMIT ?", (start, end, limit))
+
+    def recent(self, limit: int = 100) -> List[Dict]:
+        """Most recent reports, newest first."""
+        return self._rows("SELECT * FROM news_reports ORDER BY created_at DESC LIMIT ?", (limit,))
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM news_reports").fetchone()[0]
+
+    def rebuild(self, directory: str = DEFAULT_DIRECTORY, archive=None) -> int:
+        """Re-scan ``directory`` for reports, dropping every entry not found there
+        (deleted files, and one-off paths outside it cataloged by older versions).
+
+        Files already indexed with the same size are not re-hashed. Reports in
+        ``archive`` (a NewsArchive) count as present even without a file.
+        Returns the number of indexed reports.
+        """
+        directory = os.path.normpath(directory)
+        known = {row["path"]: row for row in self._rows("SELECT path, size FROM news_reports")}
+        found = set()
+        for path in glob.glob(os.path.join(directory, REPORT_PATTERN)):
+            path = os.path.normpath(path)
+            found.add(path)
+            entry = known.get(path)
+            if entry is not None and entry["size"] == os.path.getsize(path):
+                continue
+            self.add_file(path)
+        if archive is not None:
+            for path in archive.paths():
+                if path in found or os.path.dirname(path) != directory:
+                    continue
+                found.add(path)
+                if path not in known:
+                    text = archive.get(path)
+                    self.add(path, text=text, **parse_report_header(text))
+        with self.conn:
+            self.conn.executemany("DELETE FROM news_reports WHERE path = ?",
+                                  [(path,) for path in known.keys() - found])
+        return self.count()
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild the news report catalog")
+    parser.add_argument("command", choices=["rebuild", "latest", "list"], help="Action to run")
+    parser.add_argument("--index", default=os.getenv("NEWS_INDEX_PATH", DEFAULT_INDEX_PATH),
+                        help=f"Catalog database (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY, help="Directory to scan on rebuild")
+    parser.add_argument("--archive", help="Report archive to include on rebuild "
+                                          "(default: $NEWS_ARCHIVE_PATH or news_database/archive.db, if present)")
+    parser.add_argument("--model", help="Only reports generated by this model")
+    parser.add_argument("--since", help="Only reports covering dates on or after YYYY-MM-DD")
+    parser.add_argument("--until", help="Only reports covering dates on or before YYYY-MM-DD")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum reports to list (default: 20)")
+    args = parser.parse_args()
+
+    index = NewsIndex(args.index)
+    if args.command == "rebuild":
+        # Imported here: news_archive imports this module
+        from news_archive import DEFAULT_ARCHIVE_PATH, NewsArchive
+
+        archive_path = args.archive or os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH)
+        archive = NewsArchive(archive_path) if os.path.exists(archive_path) else None
+        try:
+            print(f"Indexed {index.rebuild(args.directory, archive)} reports in {args.index}")
+        finally:
+            if archive is not None:
+                archive.close()
+    elif args.command == "latest":
+        print(json.dumps(index.latest(args.model), indent=2))
+    elif args.since or args.until:
+        rows = index.by_window(args.since or "0000-00-00", args.until or "9999-99-99", args.limit)
+        if args.model:
+            rows = [row for row in rows if row["model"] == args.model]
+        print(json.dumps(rows, indent=2))
+    elif args.model:
+        print(json.dumps(index.by_model(args.model, args.limit), indent=2))
+    else:
+        print(json.dumps(index.recent(args.limit), indent=2))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client for the OpenRouter API with retries and rate limiting
+"""
+
+import json
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ratelimit import TokenBucket
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class OpenRouterError(Exception):
+    """Base class for OpenRouter client errors."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class OpenRouterHTTPError(OpenRouterError):
+    """The API answered with an error status (after any retries)."""
+
+
+class OpenRouterConnectionError(OpenRouterError):
+    """The API could not be reached or timed out (after any retries)."""
+
+
+class OpenRouterResponseError(OpenRouterError):
+    """The API answered with a body the client could not interpret."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenRouterClient:
+    """Reusable OpenRouter client.
+
+    One ``requests.Session`` keeps connections alive across calls and threads.
+    Transient failures are retried with exponential backoff and full jitter,
+    honouring Retry-After, and a token bucket shared by every caller of this
+    client spaces out requests.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://openrouter.ai/api/v1",
+                 timeout: Timeout = (10, 120), max_retries: int = 4,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 rate_limit: Optional[float] = None, burst: Optional[float] = None,
+                 pool_size: int = 16):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_limit, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+
+        # Metrics
+        self.requests_sent = 0
+        self.retries = 0
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _remaining(deadline: Optional[float], error: str) -> Optional[float]:
+        """Seconds left before ``deadline`` (a time.monotonic() value); raises once it has passed."""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OpenRouterConnectionError(f"Deadline exceeded: {error}")
+        return remaining
+
+    def request(self, method: str, path: str, json_body: Optional[Dict] = None,
+                stream: bool = False, timeout: Optional[Timeout] = None,
+                deadline: Optional[float] = None) -> requests.Response:
+        """Send a request, retrying transient failures; return a successful response.
+
+        With a ``deadline`` (a time.monotonic() value) every attempt's timeout
+        is capped by the time left, and no retry starts after it.
+        Raises OpenRouterHTTPError or OpenRouterConnectionError once retries are exhausted.
+        """
+        url = f"{self.base_url}{path}"
+        timeout = timeout if timeout is not None else self.timeout
+        error = "no attempt made"
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            remaining = self._remaining(deadline, error)
+            attempt_timeout = timeout
+            if remaining is not None:
+                attempt_timeout = (tuple(min(t, remaining) for t in timeout) if isinstance(timeout, tuple)
+                                   else min(timeout, remaining))
+            self.requests_sent += 1
+            retry_after = None
+            try:
+                response = self.session.request(
+                    method, url, json=json_body, stream=stream, timeout=attempt_timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise OpenRouterConnectionError(f"Error making request to OpenRouter: {e}") from e
+                error = str(e)
+            else:
+                if response.status_code < 400:
+                    return response
+                body = response.text
+                response.close()
+                if response.status_code not in RETRYABLE_STATUS or attempt == self.max_retries:
+                    raise OpenRouterHTTPError(
+                        f"OpenRouter returned {response.status_code} for {method} {path}",
+                        status_code=response.status_code, body=body
+                    )
+                error = f"OpenRouter returned {response.status_code} for {method} {path}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    # Hold back every thread sharing this client, not just this one
+                    self.limiter.pause(retry_after if retry_after is not None else self._backoff(attempt))
+
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            remaining = self._remaining(deadline, error)
+            if remaining is not None and delay >= remaining:
+                raise OpenRouterConnectionError(f"Deadline exceeded: {error}")
+            self.retries += 1
+            time.sleep(delay)
+
+        raise OpenRouterError("Retries exhausted")  # Unreachable: the last attempt raises
+
+    def chat_completion(self, data: Dict[str, Any], timeout: Optional[Timeout] = None,
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+        """POST /chat/completions and return the decoded response."""
+        response = self.request("POST", "/chat/completions", json_body=data, timeout=timeout, deadline=deadline)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise OpenRouterResponseError(f"Invalid JSON from OpenRouter: {e}", body=response.text) from e
+
+    def stream_chat_completion(self, data: Dict[str, Any],
+                               timeout: Optional[Timeout] = None) -> Iterator[Dict[str, Any]]:
+        """POST /chat/completions with ``stream: true`` and yield each SSE chunk.
+
+        Only the initial request is retried; a stream that fails part-way raises.
+        """
+        response = self.request("POST", "/chat/completions", json_body={**data, "stream": True},
+                                stream=True, timeout=timeout)
+        with response:
+            # SSE is UTF-8; requests would otherwise assume ISO-8859-1 for text/*
+            response.encoding = "utf-8"
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    # Blank lines separate events; lines starting with ':' are keep-alive comments
+                    if not line or not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        return
+                    chunk = json.loads(payload)
+                    if "error" in chunk:
+                        error = chunk["error"]
+                        message = error.get("message", error) if isinstance(error, dict) else error
+                        raise OpenRouterResponseError(f"Stream error: {message}", body=payload)
+                    yield chunk
+            except requests.exceptions.RequestException as e:
+                raise OpenRouterConnectionError(f"Stream interrupted: {e}") from e
+            except ValueError as e:
+                raise OpenRouterResponseError(f"Invalid stream chunk from OpenRouter: {e}") from e
+
+    def list_models(self) -> List[Dict[str, Any]]:
+        """GET /models and return the model list."""
+        response = self.request("GET", "/models")
+        try:
+            return response.json().get("data", [])
+        except ValueError as e:
+            raise OpenRouterResponseError(f"Invalid JSON from OpenRouter: {e}", body=response.text) from e
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Bulk personalized outreach for the hack event invitation
+Loads contacts.json, personalizes the generated invitation per contact and
+delivers it over a small pool of persistent SMTP connections, with per-domain
+rate limits and a JSONL progress log so an interrupted run can resume.
+Use --dry-run to send everything to a local SMTP sink and measure throughput.
+"""
+
+import argparse
+import html
+import json
+import os
+import queue
+import re
+import smtplib
+import threading
+import time
+from collections import defaultdict
+from email.message import EmailMessage
+from email.utils import make_msgid, parseaddr
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from dotenv import load_dotenv
+
+from contacts_ingest import iter_json_contacts
+from ratelimit import TokenBucket
+
+load_dotenv()
+
+DEFAULT_CONTACTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "contacts.json")
+DEFAULT_SUBJECT = "{first_name}, you're invited to the Nikolay.ai Hack Event"
+
+SCRIPT_RE = re.compile(r"<script\b.*?</script>\s*", re.IGNORECASE | re.DOTALL)
+FORM_RE = re.compile(r"<form\b.*?</form>", re.IGNORECASE | re.DOTALL)
+# src/href values without a scheme: assets/logo.png, /assets/..., #register
+RELATIVE_URL_RE = re.compile(r'\b(src|href)="(?![a-zA-Z][a-zA-Z0-9+.-]*:|//)([^"]*)"', re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def load_contacts(path: str = DEFAULT_CONTACTS) -> List[Dict]:
+    """Contacts with an email address, de-duplicated by lower-cased email."""
+    contacts = []
+    seen = set()
+    for record in iter_json_contacts(path):
+        email = (record.get("email") or "").strip()
+        if not email or email.lower() in seen:
+            continue
+        seen.add(email.lower())
+        contacts.append({**record, "email": email})
+    return contacts
+
+
+def email_domain(email: str) -> str:
+    return email.rsplit("@", 1)[-1].lower()
+
+
+def interleave_by_domain(contacts: Iterable[Dict]) -> List[Dict]:
+    """Order contacts round-robin across domains, so a rate-limited domain
+    doesn't hold up every worker at once."""
+    by_domain = defaultdict(list)
+    for contact in contacts:
+        by_domain[email_domain(contact["email"])].append(contact)
+    return [contact for group in zip_longest(*by_domain.values()) for contact in group if contact is not None]
+
+
+class InvitationMailer:
+    """Per-contact invitation built from the generated page.
+
+    The page is prepared once: scripts are stripped (mail clients drop them),
+    relative asset and anchor URLs are made absolute against ``public_url``
+    (where app.py serves the page), the registration form becomes a link to
+    the hosted one, and the page is split where the greeting goes, so each
+    message is a join of the cached chunks around the escaped greeting.
+    """
+
+    def __init__(self, page_html: str, public_url: str, subject: str = DEFAULT_SUBJECT):
+        public_url = public_url if public_url.endswith("/") else public_url + "/"
+        register_url = urljoin(public_url, "#register")
+        page_html = SCRIPT_RE.sub("", page_html)
+        page_html = FORM_RE.sub(
+            f'<p><a href="{html.escape(register_url)}" class="cta-button">Register on the event page</a></p>',
+            page_html)
+        page_html = RELATIVE_URL_RE.sub(
+            lambda m: f'{m.group(1)}="{html.escape(urljoin(public_url, html.unescape(m.group(2))))}"',
+            page_html)
+        marker = "<main>" if "<main>" in page_html else "<body>"
+        before, found, after = page_html.partition(marker)
+        if not found:
+            before, after = "", page_html
+        self.before = before + found
+        self.after = after
+        self.subject = subject
+        # Plain-text fallback shared by every message
+        self.text = re.sub(r"\n\s*\n+", "\n\n", html.unescape(TAG_RE.sub("", after))).strip()
+        self.text += f"\n\nRegister at {register_url}"
+
+    def render(self, contact: Dict) -> Tuple[str, str, str]:
+        """Subject, HTML body and plain-text body for one contact."""
+        first_name = contact.get("firstName") or (contact.get("name") or "").split(" ")[0] or "there"
+        greeting = f"Hi {first_name},"
+        if contact.get("company"):
+            greeting += f" we'd love to see the {contact['company']} team there."
+        body = f'{self.before}\n<p class="greeting">{html.escape(greeting)}</p>\n{self.after}'
+        return self.subject.replace("{first_name}", first_name), body, f"{greeting}\n\n{self.text}"
+
+    def message(self, sender: str, contact: Dict) -> EmailMessage:
+        subject, body, text = self.render(contact)
+        message = EmailMessage()
+        message["From"] = sender
+        message["To"] = contact["email"]
+        message["Subject"] = subject
+        message["Message-ID"] = make_msgid(domain=email_domain(parseaddr(sender)[1] or "localhost"))
+        message.set_content(text)
+        message.add_alternative(body, subtype="html")
+        return message
+
+
+class ProgressLog:
+    """Append-only JSONL record of delivery attempts; sent addresses are skipped on resume."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def sent(self) -> Set[str]:
+        done = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from an interrupted run
+                    if entry.get("status") == "sent":
+                        done.add(entry["email"].lower())
+        except FileNotFoundError:
+            pass
+        return done
+
+    def record(self, email: str, status: str, error: Optional[str] = None):
+        entry = {"email": email, "status": status, "at": time.time()}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SMTPConnection:
+    """One persistent SMTP session, reopened when the server drops it or after
+    ``max_messages`` messages."""
+
+    def __init__(self, config: Dict, max_messages: int = 100):
+        self.config = config
+        self.max_messages = max_messages
+        self.smtp: Optional[smtplib.SMTP] = None
+        self.sent_on_connection = 0
+        self.handshakes = 0
+
+    def _open(self):
+        config = self.config
+        if config.get("ssl"):
+            smtp = smtplib.SMTP_SSL(config["host"], config["port"], timeout=config.get("timeout", 30))
+        else:
+            smtp = smtplib.SMTP(config["host"], config["port"], timeout=config.get("timeout", 30))
+            if config.get("starttls"):
+                smtp.starttls()
+        if config.get("user"):
+            smtp.login(config["user"], config["password"])
+        self.smtp = smtp
+        self.sent_on_connection = 0
+        self.handshakes += 1
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.smtp = None
+
+    def send(self, message: EmailMessage):
+        """Send, reconnecting and retrying once if the connection went away."""
+        if self.smtp is not None and self.sent_on_connection >= self.max_messages:
+            self.close()
+        for attempt in range(2):
+            if self.smtp is None:
+                self._open()
+            try:
+                self.smtp.send_message(message)
+                self.sent_on_connection += 1
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.smtp = None
+                if attempt:
+                    raise
+
+
+def smtp_config_from_env() -> Dict:
+    """SMTP settings; defaults match src/send-email.ts (Gmail with an app password)."""
+    user = os.getenv("SMTP_USER") or os.getenv("GMAIL_USER", "")
+    password = os.getenv("SMTP_PASSWORD") or os.getenv("GMAIL_APP_PASSWORD", "")
+    return {
+        "host": os.getenv("SMTP_HOST", "smtp.gmail.com"),
+        "port": int(os.getenv("SMTP_PORT", "587")),
+        "user": user,
+        "password": re.sub(r"\s", "", password),
+        "starttls": os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes"),
+        "ssl": os.getenv("SMTP_SSL", "").lower() in ("1", "true", "yes"),
+        "sender": os.getenv("SMTP_FROM") or f"Sundai Hacks <{user}>",
+    }
+
+
+def send_all(contacts: List[Dict], mailer: InvitationMailer, smtp_config: Dict, progress: ProgressLog,
+             workers: int = 4, rate_per_domain: Optional[float] = None,
+             burst: Optional[float] = None, max_per_connection: int = 100) -> Dict:
+    """Deliver to every contact not already marked sent; return delivery stats.
+
+    Each worker thread owns one persistent connection. Failures are recorded
+    as ``failed`` and retried on the next run.
+    """
+    done = progress.sent()
+    pending = [c for c in interleave_by_domain(contacts) if c["email"].lower() not in done]
+    jobs: "queue.Queue[Dict]" = queue.Queue()
+    for contact in pending:
+        jobs.put(contact)
+
+    limiters: Dict[str, TokenBucket] = {}
+    limiters_lock = threading.Lock()
+    counts = {"sent": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    connections: List[SMTPConnection] = []
+
+    def limiter(domain: str) -> TokenBucket:
+        with limiters_lock:
+            if domain not in limiters:
+                limiters[domain] = TokenBucket(rate_per_domain, burst)
+            return limiters[domain]
+
+    def work():
+        connection = SMTPConnection(smtp_config, max_messages=max_per_connection)
+        connections.append(connection)
+        try:
+            while True:
+                try:
+                    contact = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                email = contact["email"]
+                limiter(email_domain(email)).acquire()
+                try:
+                    connection.send(mailer.message(smtp_config["sender"], contact))
+                except (smtplib.SMTPException, OSError) as e:
+                    progress.record(email, "failed", str(e))
+                    with counts_lock:
+                        counts["failed"] += 1
+                    print(f"✗ {email}: {e}")
+                else:
+                    progress.record(email, "sent")
+                    with counts_lock:
+                        counts["sent"] += 1
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=work, name=f"outreach-{i}") for i in range(max(1, min(workers, len(pending))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        **counts,
+        "skipped": len(contacts) - len(pending),
+        "connections": sum(c.handshakes for c in connections),
+        "seconds": round(elapsed, 3),
+        "messages_per_sec": round(counts["sent"] / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send the hack event invitation to every contact")
+    parser.add_argument("--contacts", default=DEFAULT_CONTACTS, help="contacts.json to read")
+    parser.add_argument("--invitation", default="hack_event_invitation.html", help="Generated invitation HTML")
+    parser.add_argument("--subject", default=DEFAULT_SUBJECT, help="Subject; {first_name} is filled in, other braces are kept as-is")
+    parser.add_argument("--public-url", default=os.getenv("EVENT_PUBLIC_URL"),
+                        help="Where app.py serves the invitation; images and the registration link "
+                             "point there (default: EVENT_PUBLIC_URL, or http://localhost:8000/ with --dry-run)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent SMTP connections (default: 4)")
+    parser.add_argument("--rate-per-domain", type=float, help="Max messages per second to each recipient domain")
+    parser.add_argument("--burst", type=float, help="Messages a domain may receive at once (default: 1)")
+    parser.add_argument("--max-per-connection", type=int, default=100,
+                        help="Reconnect after this many messages (default: 100)")
+    parser.add_argument("--progress", help="JSONL progress file (default: outreach_progress.jsonl, "
+                                           "or outreach_progress.dry-run.jsonl with --dry-run)")
+    parser.add_argument("--limit", type=int, help="Only the first N contacts")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="With --dry-run: send to each contact N times, to measure throughput")
+    parser.add_argument("--dry-run", action="store_true", help="Deliver to a local SMTP sink instead")
+    parser.add_argument("--sink-delay", type=float, default=0.0,
+                        help="With --dry-run: simulated per-message server latency in seconds")
+    args = parser.parse_args()
+
+    public_url = args.public_url or ("http://localhost:8000/" if args.dry_run else None)
+    if not public_url:
+        parser.error("Missing the invitation's public URL. Set EVENT_PUBLIC_URL or pass --public-url.")
+    contacts = load_contacts(args.contacts)
+    if args.limit:
+        contacts = contacts[:args.limit]
+    with open(args.invitation, "r", encoding="utf-8") as f:
+        mailer = InvitationMailer(f.read(), public_url, args.subject)
+
+    sink = None
+    if args.dry_run:
+        from smtp_sink import start_sink
+        sink = start_sink(delay=args.sink_delay)
+        smtp_config = {"host": "127.0.0.1", "port": sink.server_address[1],
+                       "sender": "Sundai Hacks <outreach@example.com>"}
+        if args.repeat > 1:
+            contacts = [{**c, "email": f"{c['email'].split('@')[0]}+{i}@{email_domain(c['email'])}"}
+                        for i in range(args.repeat) for c in contacts]
+        # Dry runs start over unless a progress file is given explicitly
+        progress_path = args.progress or "outreach_progress.dry-run.jsonl"
+        if not args.progress and os.path.exists(progress_path):
+            os.remove(progress_path)
+    else:
+        smtp_config = smtp_config_from_env()
+        if not smtp_config["user"]:
+            parser.error("Missing SMTP credentials. Set SMTP_USER/SMTP_PASSWORD or GMAIL_USER/GMAIL_APP_PASSWORD.")
+        progress_path = args.progress or "outreach_progress.jsonl"
+
+    progress = ProgressLog(progress_path)
+    print(f"Sending to {len(contacts)} contacts with {args.workers} connections"
+          f"{' (dry run)' if sink else ''}...")
+    try:
+        stats = send_all(contacts, mailer, smtp_config, progress, workers=args.workers,
+                         rate_per_domain=args.rate_per_domain, burst=args.burst,
+                         max_per_connection=args.max_per_connection)
+    finally:
+        progress.close()
+        if sink is not None:
+            sink.shutdown()
+
+    print(f"Sent {stats['sent']}, failed {stats['failed']}, already sent {stats['skipped']} "
+          f"in {stats['seconds']}s ({stats['messages_per_sec']} msg/s over {stats['connections']} connections)")
+    print(f"Progress saved to {progress_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+In-memory, precompressed page cache and cache-aware static files
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # Optional: pages are still served gzip or identity
+    brotli = None
+
+
+# (gzip level, brotli quality): the smallest output for loads off the request
+# path, and levels that take a few milliseconds for reloads done while a
+# request waits on the event loop
+BEST_COMPRESSION = (9, 11)
+FAST_COMPRESSION = (6, 5)
+
+
+class PageVersion:
+    """One rendered version of a page with its precompressed encodings."""
+
+    __slots__ = ("body", "encoded", "etag", "last_modified", "mtime")
+
+    def __init__(self, html: str, mtime: Optional[float] = None, levels: tuple = BEST_COMPRESSION):
+        self.body = html.encode("utf-8")
+        self.mtime = mtime if mtime is not None else time.time()
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        digest = hashlib.sha256(self.body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+
+        # Each encoding is a different representation, so it gets its own strong ETag
+        gzip_level, brotli_quality = levels
+        self.encoded: Dict[str, tuple] = {
+            "gzip": (gzip.compress(self.body, compresslevel=gzip_level, mtime=0), f'"{digest}-gz"'),
+        }
+        if brotli is not None:
+            self.encoded["br"] = (brotli.compress(self.body, quality=brotli_quality), f'"{digest}-br"')
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    encodings = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[coding.strip().lower()] = q
+    return encodings
+
+
+class CachedPage:
+    """HTML file held in memory and reloaded when its mtime changes.
+
+    The file is stat'ed at most once every ``check_interval`` seconds, and each
+    version is compressed once, so serving the page costs no disk reads or
+    compression work. ``swap`` installs new HTML directly without touching disk.
+    The first load and swaps compress as tightly as possible; a reload
+    triggered by a request uses FAST_COMPRESSION, since it runs on the event
+    loop and every other request waits for it.
+
+    Worker processes can share a ``generation`` counter (shared_state.SharedCounter):
+    a swap in one worker bumps it and the others re-read the file on their
+    next request instead of waiting out ``check_interval``, so swapped HTML
+    should already be written to ``path``.
+    """
+
+    def __init__(self, path: str, max_age: int = 60, check_interval: float = 1.0, generation=None):
+        self.path = path
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._version: Optional[PageVersion] = None
+        self._file_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.generation = generation
+        self._generation_seen = 0
+
+    def get(self) -> PageVersion:
+        """Return the current version, reloading if the file changed on disk."""
+        now = time.monotonic()
+        version = self._version
+        generation = self.generation.value if self.generation is not None else 0
+        if (version is not None and generation == self._generation_seen
+                and now - self._checked_at < self.check_interval):
+            return version
+
+        with self._lock:
+            self._checked_at = now
+            self._generation_seen = generation
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                if self._version is None:
+                    raise
+                return self._version
+            if self._version is None or mtime != self._file_mtime:
+                levels = BEST_COMPRESSION if self._version is None else FAST_COMPRESSION
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._version = PageVersion(f.read(), mtime, levels)
+                self._file_mtime = mtime
+            return self._version
+
+    def swap(self, html: str) -> PageVersion:
+        """Serve ``html`` immediately, e.g. after an in-process regeneration.
+
+        The swapped version stays current until the file on disk changes again.
+        """
+        version = PageVersion(html)
+        with self._lock:
+            try:
+                self._file_mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                self._file_mtime = None
+            self._version = version
+            self._checked_at = time.monotonic()
+            if self.generation is not None:
+                self._generation_seen = self.generation.increment()
+        return version
+
+    def response(self, request: Request) -> Response:
+        """Build a 200 or 304 response negotiated against the request headers."""
+        version = self.get()
+        headers = {
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Last-Modified": version.last_modified,
+            "Vary": "Accept-Encoding",
+        }
+
+        body, etag = version.body, version.etag
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for coding in ("br", "gzip"):
+            if coding in version.encoded and accepted.get(coding, 0) > 0:
+                body, etag = version.encoded[coding]
+                headers["Content-Encoding"] = coding
+                break
+        headers["ETag"] = etag
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                headers.pop("Content-Encoding", None)
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control to every asset response.
+
+    ETag/304 handling and HTTP Range requests come from Starlette's FileResponse.
+    """
+
+    def __init__(self, *args, max_age: int = 86400, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
+        return response
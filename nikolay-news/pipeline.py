@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Small in-process DAG runner
+Stages are plain functions that receive their dependencies' results as keyword
+arguments. Independent stages run concurrently on a thread pool, stages whose
+input fingerprint is unchanged since the last successful run are skipped, and
+every stage is timed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class PipelineError(Exception):
+    """One or more stages failed; ``failures`` maps stage names to exceptions."""
+
+    def __init__(self, failures: Dict[str, BaseException]):
+        super().__init__("Failed stages: " + ", ".join(f"{name} ({error})" for name, error in failures.items()))
+        self.failures = failures
+
+
+class Stage:
+    """A named step with its dependencies.
+
+    ``fingerprint`` receives the same keyword arguments as ``func`` and returns
+    a JSON-serializable description of its inputs. When it matches the previous
+    run and every path in ``outputs`` exists, the stage is skipped and its saved
+    result (which must then be JSON-serializable) is reused.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], deps: Sequence[str] = (),
+                 fingerprint: Optional[Callable[..., Any]] = None, outputs: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.fingerprint = fingerprint
+        self.outputs = tuple(outputs)
+
+
+class Pipeline:
+    def __init__(self, state_file: str = ".cache/pipeline.json", max_workers: int = 4):
+        self.state_file = state_file
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        # Per-stage status and timing of the last run
+        self.report: List[Dict[str, Any]] = []
+        self.elapsed = 0.0
+
+    def add(self, name: str, func: Callable[..., Any], deps: Sequence[str] = (),
+            fingerprint: Optional[Callable[..., Any]] = None, outputs: Sequence[str] = ()) -> Stage:
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        stage = Stage(name, func, deps, fingerprint, outputs)
+        self.stages[name] = stage
+        return stage
+
+    def _load_state(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict]):
+        directory = os.path.dirname(self.state_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _execute(self, stage: Stage, inputs: Dict[str, Any], previous: Optional[Dict], force: bool):
+        """Run or skip one stage; returns (status, result, fingerprint digest)."""
+        digest = None
+        if stage.fingerprint is not None:
+            digest = self._digest(stage.fingerprint(**inputs))
+            if (not force and previous is not None and previous.get("fingerprint") == digest
+                    and all(os.path.exists(path) for path in stage.outputs)):
+                return "skipped", previous.get("result"), digest
+        return "ran", stage.func(**inputs), digest
+
+    def run(self, force: bool = False) -> Dict[str, Any]:
+        """Run every stage once its dependencies are done; return results by name.
+
+        Stages downstream of a failure are not run. Raises PipelineError after
+        the remaining stages finish if anything failed.
+        """
+        state = self._load_state()
+        results: Dict[str, Any] = {}
+        failures: Dict[str, BaseException] = {}
+        pending = dict(self.stages)
+        running = {}
+        self.report = []
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if any(dep in failures for dep in stage.deps):
+                        del pending[name]
+                        self.report.append({"stage": name, "status": "blocked", "seconds": 0.0})
+                        failures.setdefault(name, PipelineError({dep: failures[dep] for dep in stage.deps
+                                                                 if dep in failures}))
+                    elif all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        inputs = {dep: results[dep] for dep in stage.deps}
+                        future = executor.submit(self._execute, stage, inputs, state.get(name), force)
+                        running[future] = (name, time.perf_counter())
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, stage_started = running.pop(future)
+                    seconds = time.perf_counter() - stage_started
+                    try:
+                        status, result, digest = future.result()
+                    except Exception as e:
+                        failures[name] = e
+                        self.report.append({"stage": name, "status": "failed", "seconds": seconds,
+                                            "error": str(e)})
+                        continue
+                    results[name] = result
+                    self.report.append({"stage": name, "status": status, "seconds": seconds})
+                    if digest is not None and status == "ran":
+                        state[name] = {"fingerprint": digest, "result": result}
+
+        self.elapsed = time.perf_counter() - started
+        self._save_state(state)
+        if failures:
+            raise PipelineError({name: error for name, error in failures.items()
+                                 if not isinstance(error, PipelineError)})
+        return results
+
+    def print_report(self):
+        """Per-stage status and timing of the last run."""
+        width = max((len(entry["stage"]) for entry in self.report), default=5)
+        for entry in self.report:
+            line = f"  {entry['stage']:<{width}}  {entry['status']:<8} {entry['seconds']:7.2f}s"
+            if entry.get("error"):
+                line += f"  {entry['error']}"
+            print(line)
+        busy = sum(entry["seconds"] for entry in self.report)
+        print(f"  {'total':<{width}}  {'':<8} {self.elapsed:7.2f}s (stage time {busy:.2f}s)")
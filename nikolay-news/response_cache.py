@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Persistent, content-addressed cache for OpenRouter responses
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """Disk-backed cache with per-entry TTL and size-bounded LRU eviction.
+
+    Entries are JSON files named by the SHA-256 of their key, sharded into
+    subdirectories by the first two hex digits. A file's mtime is bumped on
+    every hit, so eviction removes the least recently used entries first.
+    """
+
+    def __init__(self, directory: str = ".cache/openrouter", ttl: float = 86400,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+        # Statistics for this process
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Build a cache key from JSON-serializable parts."""
+        raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if time.time() - entry["created"] > entry.get("ttl", self.ttl):
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Record the access for LRU ordering
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value, evicting old entries if over the size bound."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"created": time.time(), "ttl": self.ttl if ttl is None else ttl, "value": value}
+
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.writes += 1
+            if self._size is not None:
+                self._size += os.path.getsize(path) - previous
+        self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _evict(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            if self._size <= self.max_bytes:
+                return
+
+            # Least recently used first
+            for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._size -= size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every entry."""
+        for path, _, _ in list(self._entries()):
+            self._remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process."""
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "evictions": self.evictions}
@@ -33,9 +33,12 @@ fi
 # Activate virtual environment
 source venv/bin/activate
 
-# Install dependencies
-echo "Installing dependencies..."
-pip install -r requirements.txt
+# Install dependencies only when requirements.txt has changed since the last install
+REQUIREMENTS_HASH=$(python -c "import hashlib; print(hashlib.sha256(open('requirements.txt', 'rb').read()).hexdigest())")
+if [ ! -f venv/.requirements.sha256 ] || [ "$(cat venv/.requirements.sha256)" != "$REQUIREMENTS_HASH" ]; then
+    echo "Installing dependencies..."
+    pip install -r requirements.txt && echo "$REQUIREMENTS_HASH" > venv/.requirements.sha256
+fi
 
 echo ""
 echo "========================================"
@@ -1,47 +1,77 @@
 #!/usr/bin/env python3
 """
 Runner script for Nikolay.ai Hack Event
-This script generates AI news and creates an HTML invitation for the hack event.
+This script generates AI news and creates an HTML invitation for the hack event,
+running every step in-process as a small pipeline.
 """
 
+import argparse
+import hashlib
 import os
 import sys
-import subprocess
+import tempfile
 from datetime import datetime
 
-def run_news_generation():
-    """Run the news.py script to generate the latest AI news."""
-    print("Generating latest AI news...")
-    try:
-        # Run the news.py script
-        result = subprocess.run([sys.executable, "news.py"], 
-                              capture_output=True, text=True, check=True)
-        print("✓ AI news generated successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Error generating AI news: {e}")
-        print(f"Error output: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print("✗ news.py script not found. Make sure it's in the same directory.")
-        return False
+from generate_invitation import INVITATION_TEMPLATE, default_event_date, generate_html_invitation, render_news
+from news import AINewsGenerator, print_cache_stats
+from openrouter_client import OpenRouterError
+from pipeline import Pipeline, PipelineError
 
-def run_html_generation():
-    """Run the generate_invitation.py script to create the HTML invitation."""
-    print("Generating HTML invitation...")
-    try:
-        # Run the generate_invitation.py script
-        result = subprocess.run([sys.executable, "generate_invitation.py"], 
-                              capture_output=True, text=True, check=True)
-        print("✓ HTML invitation generated successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Error generating HTML invitation: {e}")
-        print(f"Error output: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print("✗ generate_invitation.py script not found. Make sure it's in the same directory.")
-        return False
+REQUIRED_ASSETS = ["assets/logo.png", "assets/nikolayTalk.mp4"]
+OUTPUT_FILE = "hack_event_invitation.html"
+
+def check_assets():
+    """Fail early if an asset the invitation links to is missing."""
+    missing = [f for f in REQUIRED_ASSETS if not os.path.exists(f)]
+    if missing:
+        raise FileNotFoundError("Missing required files: " + ", ".join(missing))
+    return REQUIRED_ASSETS
+
+def build_pipeline(generator, days_back=7, output_file=OUTPUT_FILE):
+    """Stages of the hack event preparation, wired in memory.
+
+    Asset checks, the model listing and news generation run concurrently; the
+    invitation is rendered from the generated markdown without re-reading it.
+    """
+    pipeline = Pipeline()
+    event_date = default_event_date()
+    
+    def list_models():
+        # Only a sanity check: the report can still be generated if this fails
+        try:
+            models = generator.list_available_models()
+        except OpenRouterError as e:
+            return {"checked": False, "error": str(e)}
+        available = generator.model in {model.get("id") for model in models}
+        if not available:
+            print(f"⚠ Model {generator.model} is not in the OpenRouter model list")
+        return {"checked": True, "available": available}
+    
+    def generate_news():
+        content = generator.generate_news(days_back=days_back)
+        return {"path": generator.last_output_file, "content": content}
+    
+    def render_invitation(check_assets, generate_news):
+        _, news_html = render_news(generate_news["content"])
+        # Write then rename, so a server watching the file never reads half a page
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_file)), suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(generate_html_invitation(news_html, event_date))
+        os.replace(tmp_path, output_file)
+        return {"path": output_file}
+    
+    def invitation_inputs(check_assets, generate_news):
+        digest = hashlib.sha256(generate_news["content"].encode("utf-8")).hexdigest()
+        return [INVITATION_TEMPLATE.digest, digest, event_date]
+    
+    pipeline.add("check_assets", check_assets)
+    pipeline.add("list_models", list_models)
+    # One report per model, window and day; re-runs reuse it
+    pipeline.add("generate_news", generate_news,
+                 fingerprint=lambda: [generator.model, days_back, datetime.now().strftime("%Y-%m-%d")])
+    pipeline.add("render_invitation", render_invitation, deps=["check_assets", "generate_news"],
+                 fingerprint=invitation_inputs, outputs=[output_file])
+    return pipeline
 
 def open_html_in_browser():
     """Open the generated HTML file in the default browser."""
@@ -61,37 +91,47 @@ def open_html_in_browser():
 
 def main():
     """Main function to run the complete hack event preparation."""
+    parser = argparse.ArgumentParser(description="Generate AI news and the hack event invitation")
+    parser.add_argument("--days", type=int, default=7, help="Number of days back to cover (default: 7)")
+    parser.add_argument("--force", action="store_true", help="Re-run every stage even if its inputs are unchanged")
+    parser.add_argument("--no-browser", action="store_true", help="Don't open the invitation when done")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Nikolay.ai Hack Event Preparation")
     print("=" * 60)
     
-    # Check if required files exist
-    required_files = ["news.py", "generate_invitation.py", "assets/logo.png", "assets/nikolayTalk.mp4"]
-    missing_files = [f for f in required_files if not os.path.exists(f)]
-    
-    if missing_files:
-        print("✗ Missing required files:")
-        for file in missing_files:
-            print(f"  - {file}")
-        print("\nPlease make sure all required files are present before running this script.")
+    try:
+        generator = AINewsGenerator()
+    except ValueError as e:
+        print(f"✗ {e}")
         sys.exit(1)
     
-    # Step 1: Generate AI news
-    if not run_news_generation():
-        print("\n✗ Failed to generate AI news. Please check the error messages above.")
+    pipeline = build_pipeline(generator, days_back=args.days)
+    try:
+        results = pipeline.run(force=args.force)
+    except PipelineError as e:
+        print("\n✗ Hack event preparation failed:")
+        for name, error in e.failures.items():
+            print(f"  - {name}: {error}")
+        print("\nStage timings:")
+        pipeline.print_report()
         sys.exit(1)
+    finally:
+        generator.client.close()
     
-    print("\n" + "-" * 40)
-    
-    # Step 2: Generate HTML invitation
-    if not run_html_generation():
-        print("\n✗ Failed to generate HTML invitation. Please check the error messages above.")
-        sys.exit(1)
+    print("\nStage timings:")
+    pipeline.print_report()
+    print_cache_stats(generator)
+    print(f"✓ AI news: {results['generate_news']['path']}")
+    print(f"✓ HTML invitation: {results['render_invitation']['path']}")
     
     print("\n" + "-" * 40)
     
-    # Step 3: Open HTML in browser
-    if open_html_in_browser():
+    # Open HTML in browser
+    if args.no_browser:
+        print("ℹ You can open hack_event_invitation.html in your browser")
+    elif open_html_in_browser():
         print("✓ HTML invitation opened in browser")
     else:
         print("ℹ You can manually open hack_event_invitation.html in your browser")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler for news and invitation regeneration
+Imports the generator once and keeps its HTTP connections warm, runs the hack
+event pipeline on a cron-like schedule with jitter, never runs two
+regenerations at once (across processes too), and can catch up on a run
+missed while it was down. Runs standalone or inside app.py (NEWS_SCHEDULE),
+where each new page is hot-swapped into the served copy.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+CATCH_UP_POLICIES = ("skip", "once")
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Each field accepts ``*``, numbers, ranges (``1-5``), lists (``1,15``) and
+    steps (``*/15``, ``0-30/10``). Day of week runs 0-6 from Sunday (7 is also
+    Sunday). As in cron, when both day fields are restricted either may match.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: '{expression}'")
+        self.expression = expression
+        parsed = [self._parse(field, low, high) for field, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        # As in cron, a field starting with '*' (including '*/2') leaves the day unrestricted
+        self.any_day = fields[2].startswith("*")
+        self.any_weekday = fields[4].startswith("*")
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            spec, _, step = part.partition("/")
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start, end = (int(v) for v in spec.split("-", 1))
+            else:
+                start = end = int(spec)
+            if step and spec != "*" and "-" not in spec:
+                end = high
+            if not (low <= start <= end <= high):
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day = dt.day in self.days
+        weekday = (dt.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, dt: datetime) -> datetime:
+        """First matching minute strictly after ``dt``."""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+class Scheduler:
+    """Run ``job`` on a schedule in a background thread.
+
+    Each run fires at its scheduled minute plus up to ``jitter`` seconds. A run
+    is skipped if the previous one (in this or another process sharing
+    ``lock_file``) is still going. The last scheduled time is kept in
+    ``state_file``; on start, ``catch_up="once"`` runs immediately if a
+    scheduled time passed while the scheduler was down, ``"skip"`` waits for
+    the next one.
+    """
+
+    def __init__(self, job: Callable[[], object], schedule: CronSchedule, jitter: float = 0.0,
+                 catch_up: str = "once", state_file: str = ".cache/scheduler.json",
+                 lock_file: str = ".cache/scheduler.lock"):
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy '{catch_up}'. Use 'skip' or 'once'.")
+        self.job = job
+        self.schedule = schedule
+        self.jitter = jitter
+        self.catch_up = catch_up
+        self.state_file = state_file
+        self.lock_file = lock_file
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters for this process
+        self.runs = 0
+        self.failures = 0
+        self.skipped_overlaps = 0
+        self.last_duration: Optional[float] = None
+        self.next_run: Optional[datetime] = None
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict):
+        directory = os.path.dirname(self.state_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def run_once(self, scheduled_for: Optional[datetime] = None) -> bool:
+        """Run the job now unless a run is already in progress; True if it ran."""
+        if not self._run_lock.acquire(blocking=False):
+            self.skipped_overlaps += 1
+            print("Scheduler: previous run still in progress, skipping")
+            return False
+        lock_handle = None
+        try:
+            if fcntl is not None:
+                os.makedirs(os.path.dirname(self.lock_file) or ".", exist_ok=True)
+                lock_handle = open(self.lock_file, "w")
+                try:
+                    fcntl.flock(lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    self.skipped_overlaps += 1
+                    print("Scheduler: another process is regenerating, skipping")
+                    return False
+
+            started = time.perf_counter()
+            scheduled_for = scheduled_for or datetime.now().replace(second=0, microsecond=0)
+            print(f"Scheduler: run for {scheduled_for:%Y-%m-%d %H:%M} started")
+            try:
+                self.job()
+            except Exception as e:
+                self.failures += 1
+                print(f"Scheduler: run failed: {e}")
+            else:
+                self.runs += 1
+            self.last_duration = time.perf_counter() - started
+            print(f"Scheduler: run finished in {self.last_duration:.1f}s")
+
+            # Failed runs count as done; the next scheduled run retries
+            state = self._load_state()
+            state.update(last_scheduled=scheduled_for.isoformat(), last_finished=datetime.now().isoformat())
+            self._save_state(state)
+            return True
+        finally:
+            if lock_handle is not None:
+                lock_handle.close()
+            self._run_lock.release()
+
+    def missed_run(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Latest scheduled time that passed without a run, if any."""
+        last = self._load_state().get("last_scheduled")
+        if last is None:
+            return None
+        now = now or datetime.now()
+        missed = None
+        candidate = self.schedule.next_after(datetime.fromisoformat(last))
+        while candidate <= now:
+            missed = candidate
+            candidate = self.schedule.next_after(candidate)
+        return missed
+
+    def _loop(self):
+        missed = self.missed_run()
+        if missed is not None and self.catch_up == "once":
+            print(f"Scheduler: catching up on missed run for {missed:%Y-%m-%d %H:%M}")
+            self.run_once(missed)
+
+        while not self._stop.is_set():
+            scheduled = self.schedule.next_after(datetime.now())
+            self.next_run = scheduled
+            fire_at = scheduled.timestamp() + random.uniform(0, self.jitter)
+            # Wake up periodically so clock changes and stop() are noticed
+            while not self._stop.is_set():
+                remaining = fire_at - time.time()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 60))
+            if self._stop.is_set():
+                break
+            # Runs are synchronous, so a slow run makes the loop skip the slots it overlapped
+            self.run_once(scheduled)
+
+    def start(self) -> threading.Thread:
+        """Start the scheduling loop on a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="news-scheduler", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop scheduling; an in-progress run is allowed to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {
+            "schedule": self.schedule.expression,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlaps": self.skipped_overlaps,
+            "last_duration_s": round(self.last_duration, 2) if self.last_duration is not None else None,
+        }
+
+
+def make_regeneration_job(days_back: int = 7,
+                          on_page: Optional[Callable[[str], object]] = None) -> Callable[[], Dict]:
+    """Build a job that runs the hack event pipeline with one long-lived generator.
+
+    ``on_page`` receives the new invitation HTML after each run, e.g.
+    ``CachedPage.swap`` to serve it without waiting for a reload. Every run
+    regenerates: the pipeline's once-a-day report fingerprint and the
+    response cache would otherwise make a second run on the same day reuse
+    the first report.
+    """
+    from news import AINewsGenerator
+    from run_hack_event import build_pipeline
+
+    generator = AINewsGenerator()
+    # Still store fresh completions, so manual runs can reuse them
+    generator.refresh_cache = True
+
+    def job():
+        pipeline = build_pipeline(generator, days_back=days_back)
+        try:
+            results = pipeline.run(force=True)
+        finally:
+            pipeline.print_report()
+        if on_page is not None:
+            with open(results["render_invitation"]["path"], "r", encoding="utf-8") as f:
+                on_page(f.read())
+        return results
+
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate news and the invitation on a schedule")
+    parser.add_argument("--cron", default=os.getenv("NEWS_SCHEDULE", "0 9 * * 1"),
+                        help="Cron expression (default: NEWS_SCHEDULE or '0 9 * * 1', Mondays 09:00)")
+    parser.add_argument("--jitter", type=float, default=float(os.getenv("NEWS_SCHEDULE_JITTER", "0")),
+                        help="Random delay of up to this many seconds per run")
+    parser.add_argument("--catch-up", choices=CATCH_UP_POLICIES,
+                        default=os.getenv("NEWS_SCHEDULE_CATCH_UP", "once"),
+                        help="Run a missed slot on start (once) or wait for the next (skip)")
+    parser.add_argument("--days", type=int, default=7, help="Number of days back to cover (default: 7)")
+    parser.add_argument("--run-now", action="store_true", help="Run once immediately, then follow the schedule")
+    args = parser.parse_args()
+
+    scheduler = Scheduler(make_regeneration_job(args.days), CronSchedule(args.cron),
+                          jitter=args.jitter, catch_up=args.catch_up)
+    if args.run_now:
+        scheduler.run_once()
+    scheduler.start()
+    print(f"Scheduler running '{args.cron}' (jitter {args.jitter:.0f}s, catch-up {args.catch_up})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
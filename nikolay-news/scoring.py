@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Contact-to-event relevance scoring
+Vectorizes each contact's title, headline and summary into a TF-IDF matrix
+once (cached on disk, keyed by the contacts file's hash) and scores every
+contact against the latest news report with batched NumPy operations,
+producing ranked attendee and sponsor lists.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from contacts import DEFAULT_CONTACTS, tokenize
+from contacts_ingest import iter_json_contacts
+from markdown_render import strip_report_header
+
+DEFAULT_CACHE_PATH = ".cache/contact_vectors.npz"
+CACHE_VERSION = 1
+
+# Title keywords that make someone a better fit for one audience than the other
+BUILDER_TERMS = frozenset(tokenize("engineer developer scientist researcher student phd "
+                                   "architect programmer hacker analyst"))
+DECISION_TERMS = frozenset(tokenize("founder co-founder ceo cto cso coo chief vp president director "
+                                    "head partner principal owner investor advisor"))
+URL_RE = re.compile(r"https?://\S+")
+
+
+def _term_counts(text: str) -> Counter:
+    return Counter(tokenize(URL_RE.sub(" ", text)))
+
+
+class PackedStrings:
+    """Strings stored as one UTF-8 byte array plus offsets; cheap to save and load."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def pack(cls, values: List[str]) -> "PackedStrings":
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class ContactVectors:
+    """L2-normalized TF-IDF vectors for every contact, stored column-major.
+
+    For term ``t``, ``rows[col_ptr[t]:col_ptr[t + 1]]`` are the contacts that
+    use it and ``values`` the matching weights, so scoring a report only
+    touches the columns of terms it contains.
+    """
+
+    FIELDS = ("email", "name", "title", "company")
+
+    def __init__(self, vocabulary: np.ndarray, idf: np.ndarray, col_ptr: np.ndarray, rows: np.ndarray,
+                 values: np.ndarray, fields: Dict[str, PackedStrings], attendee_weight: np.ndarray,
+                 sponsor_weight: np.ndarray, source_digest: str = ""):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary.tolist())}
+        self.idf = idf
+        self.col_ptr = col_ptr
+        self.rows = rows
+        self.values = values
+        self.fields = fields
+        self.attendee_weight = attendee_weight
+        self.sponsor_weight = sponsor_weight
+        self.source_digest = source_digest
+
+    def __len__(self) -> int:
+        return len(self.attendee_weight)
+
+    @classmethod
+    def build(cls, records: Iterable[Dict], source_digest: str = "") -> "ContactVectors":
+        """Vectorize contacts (dicts in the contacts.json layout)."""
+        term_ids: Dict[str, int] = {}
+        doc_freq: List[int] = []
+        row_lengths: List[int] = []
+        indices: List[int] = []
+        counts: List[int] = []
+        fields: Dict[str, List[str]] = {field: [] for field in cls.FIELDS}
+        attendee_weight, sponsor_weight = [], []
+
+        for record in records:
+            title = record.get("title") or ""
+            # The title is repeated so it outweighs long free-text summaries
+            text = " ".join((title, title, record.get("headline") or "", record.get("summary") or ""))
+            terms = _term_counts(text)
+            for term, count in terms.items():
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(doc_freq)
+                    doc_freq.append(0)
+                doc_freq[term_id] += 1
+                indices.append(term_id)
+                counts.append(count)
+            row_lengths.append(len(terms))
+
+            title_terms = set(tokenize(title))
+            reach = 1.0 + math.log1p(int(record.get("connections") or 0)) / 10
+            attendee_weight.append(1.5 if title_terms & BUILDER_TERMS else 1.0)
+            sponsor_weight.append((1.5 if title_terms & DECISION_TERMS else 1.0) * reach)
+            for field in cls.FIELDS:
+                fields[field].append(record.get(field) or "")
+
+        doc_count = len(row_lengths)
+        term_count = len(doc_freq)
+        indices_array = np.asarray(indices, dtype=np.int32)
+        rows = np.repeat(np.arange(doc_count, dtype=np.int32), row_lengths)
+        idf = (np.log((1 + doc_count) / (1 + np.asarray(doc_freq, dtype=np.float32))) + 1).astype(np.float32)
+
+        # Sublinear TF times IDF, then L2-normalize each row
+        data = ((1 + np.log(np.asarray(counts, dtype=np.float32))) * idf[indices_array]).astype(np.float32)
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=doc_count)).astype(np.float32)
+        data /= np.maximum(norms, 1e-12)[rows]
+
+        # Regroup the row-major entries by term
+        order = np.argsort(indices_array, kind="stable")
+        col_ptr = np.zeros(term_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices_array, minlength=term_count), out=col_ptr[1:])
+
+        vocabulary = np.array(sorted(term_ids, key=term_ids.get), dtype=str)
+        return cls(vocabulary, idf, col_ptr, rows[order], data[order],
+                   {field: PackedStrings.pack(values) for field, values in fields.items()},
+                   np.asarray(attendee_weight, dtype=np.float32), np.asarray(sponsor_weight, dtype=np.float32),
+                   source_digest)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        packed = {}
+        for field, strings in self.fields.items():
+            packed[f"{field}_blob"] = strings.blob
+            packed[f"{field}_offsets"] = strings.offsets
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, version=np.array(CACHE_VERSION), source_digest=np.array(self.source_digest),
+                 vocabulary=self.vocabulary, idf=self.idf, col_ptr=self.col_ptr, rows=self.rows,
+                 values=self.values, attendee_weight=self.attendee_weight,
+                 sponsor_weight=self.sponsor_weight, **packed)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ContactVectors"]:
+        """Vectors cached at ``path``, or None if missing or from another version."""
+        try:
+            with np.load(path, allow_pickle=False) as cached:
+                if int(cached["version"]) != CACHE_VERSION:
+                    return None
+                fields = {field: PackedStrings(cached[f"{field}_blob"], cached[f"{field}_offsets"])
+                          for field in cls.FIELDS}
+                return cls(cached["vocabulary"], cached["idf"], cached["col_ptr"], cached["rows"],
+                           cached["values"], fields, cached["attendee_weight"], cached["sponsor_weight"],
+                           str(cached["source_digest"]))
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def from_contacts(cls, contacts_path: str = DEFAULT_CONTACTS,
+                      cache_path: str = DEFAULT_CACHE_PATH) -> "ContactVectors":
+        """Load cached vectors for ``contacts_path``, rebuilding when the file changed.
+
+        The file is hashed in blocks and, on a cache miss, parsed one record
+        at a time, so memory use doesn't grow with the size of the export.
+        """
+        digest = hashlib.sha256()
+        with open(contacts_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        digest = digest.hexdigest()
+        vectors = cls.load(cache_path)
+        if vectors is not None and vectors.source_digest == digest:
+            return vectors
+        vectors = cls.build(iter_json_contacts(contacts_path), digest)
+        vectors.save(cache_path)
+        return vectors
+
+    def query_weights(self, text: str) -> Dict[int, float]:
+        """L2-normalized TF-IDF weights of the terms in ``text`` that contacts use."""
+        weights = {}
+        for term, count in _term_counts(text).items():
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                weights[term_id] = (1 + math.log(count)) * float(self.idf[term_id])
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term_id: weight / norm for term_id, weight in weights.items()} if norm else {}
+
+    def score(self, text: str) -> np.ndarray:
+        """Cosine similarity of every contact to ``text``."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        col_ptr, rows, values = self.col_ptr, self.rows, self.values
+        for term_id, weight in self.query_weights(text).items():
+            start, end = col_ptr[term_id], col_ptr[term_id + 1]
+            # A contact appears at most once per column, so fancy-index += is safe
+            scores[rows[start:end]] += np.float32(weight) * values[start:end]
+        return scores
+
+    def rank(self, scores: np.ndarray, audience: str = "attendee", limit: int = 20) -> List[Dict]:
+        """Top ``limit`` contacts for ``audience`` ("attendee" or "sponsor")."""
+        if audience == "attendee":
+            weighted = scores * self.attendee_weight
+        elif audience == "sponsor":
+            weighted = scores * self.sponsor_weight
+        else:
+            raise ValueError(f"Unknown audience '{audience}'. Use 'attendee' or 'sponsor'.")
+        limit = min(limit, len(weighted))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-weighted, limit - 1)[:limit]
+        top = top[np.argsort(-weighted[top], kind="stable")]
+        fields = self.fields
+        return [{
+            **{field: fields[field][i] for field in self.FIELDS},
+            "relevance": round(float(scores[i]), 4),
+            "score": round(float(weighted[i]), 4),
+        } for i in top if weighted[i] > 0]
+
+
+def report_text(path: Optional[str] = None) -> str:
+    """Body of a report (default: the newest in the news catalog), without its header.
+
+    Reports moved into the archive are read from there.
+    """
+    from generate_invitation import get_latest_news_file
+    from news_archive import DEFAULT_ARCHIVE_PATH, read_report
+
+    path = path or get_latest_news_file()
+    return strip_report_header(read_report(path, os.getenv("NEWS_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank contacts by relevance to the latest news report")
+    parser.add_argument("--contacts", default=DEFAULT_CONTACTS, help="contacts.json to score")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help=f"Vector cache (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--report", help="Report to score against (default: latest in news_database)")
+    parser.add_argument("--audience", choices=["attendee", "sponsor", "both"], default="both",
+                        help="Which ranked list to print (default: both)")
+    parser.add_argument("--limit", type=int, default=20, help="Contacts per list (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    vectors = ContactVectors.from_contacts(args.contacts, args.cache)
+    scores = vectors.score(report_text(args.report))
+    audiences = ["attendee", "sponsor"] if args.audience == "both" else [args.audience]
+    ranked = {audience: vectors.rank(scores, audience, args.limit) for audience in audiences}
+
+    if args.json:
+        print(json.dumps(ranked, indent=2))
+        return
+    for audience, entries in ranked.items():
+        print(f"\nTop {audience}s:")
+        for entry in entries:
+            print(f"  {entry['score']:.3f}  {entry['name']:<28} {entry['title']} @ {entry['company']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Multi-worker production server for app.py
+The master process binds the listening socket and does the one-time startup
+work (schema version check, page warmup, the shared duplicate-email set), then
+forks worker processes that each run uvicorn on the inherited socket; the
+kernel spreads connections across them. Dead workers are replaced, and
+SIGTERM/SIGINT shut every worker down gracefully. Workers share metrics
+snapshots through a temporary directory, so /metrics covers all of them.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+
+import uvicorn
+
+# A worker that dies sooner than this after starting is restarted with a delay
+MIN_WORKER_UPTIME = 1.0
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY, or the number of CPUs this process may run on."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+def run_worker(app_module, sock: socket.socket, index: int, log_level: str, metrics_dir: str):
+    """Serve requests in a forked worker until uvicorn shuts down."""
+    # The master forwards SIGTERM; ignore the terminal's Ctrl-C so it isn't
+    # seen twice (uvicorn treats a second SIGINT as "exit now")
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Forked workers would otherwise share the master's random state (retry jitter)
+    random.seed()
+    app_module.run_scheduler = index == 0
+    app_module.worker_index = index
+    app_module.metrics_dir = metrics_dir
+
+    config = uvicorn.Config(app_module.app, log_level=log_level, access_log=False, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info", backlog: int = 2048,
+          graceful_timeout: float = 30.0, email_capacity: int = 1_000_000) -> int:
+    """Run ``workers`` app processes on ``host:port`` until signalled; returns an exit code."""
+    import app as app_module
+
+    sock = socket.create_server((host, port), backlog=backlog)
+    started = time.perf_counter()
+    app_module.prepare_workers(email_capacity)
+    print(f"Startup work done in {time.perf_counter() - started:.2f}s; "
+          f"starting {workers} workers on http://{host}:{port}")
+    sys.stdout.flush()
+    metrics_dir = tempfile.mkdtemp(prefix="nikolay-metrics-")
+
+    children = {}  # pid -> (worker index, start time)
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(app_module, sock, index, log_level, metrics_dir)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = (index, time.monotonic())
+
+    def kill_remaining(signum, frame):
+        for pid in list(children):
+            print(f"Worker {pid} did not stop within {graceful_timeout:.0f}s; killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame):
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        signal.signal(signal.SIGALRM, kill_remaining)
+        signal.alarm(max(1, int(graceful_timeout)))
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index, started_at = children.pop(pid)
+        if stopping:
+            continue
+        print(f"Worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+        if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+            time.sleep(MIN_WORKER_UPTIME)
+        if not stopping:
+            spawn(index)
+
+    signal.alarm(0)
+    sock.close()
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve app.py with several worker processes")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")),
+                        help="Port (default: PORT or 8000)")
+    parser.add_argument("--workers", "-w", type=int, default=default_workers(),
+                        help="Worker processes (default: WEB_CONCURRENCY or the CPU count)")
+    parser.add_argument("--log-level", default="info", help="uvicorn log level (default: info)")
+    parser.add_argument("--backlog", type=int, default=2048, help="Listen backlog (default: 2048)")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0,
+                        help="Seconds workers get to finish after SIGTERM before being killed (default: 30)")
+    parser.add_argument("--email-capacity", type=int,
+                        default=int(os.getenv("WORKER_EMAIL_CAPACITY", "1000000")),
+                        help="Registrations the shared duplicate-email set can hold in write-behind mode "
+                             "(default: WORKER_EMAIL_CAPACITY or 1000000)")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not hasattr(os, "fork"):
+        parser.error("serve.py needs os.fork(); run 'uvicorn app:app' on this platform")
+    sys.exit(serve(args.host, args.port, args.workers, args.log_level, args.backlog,
+                   args.graceful_timeout, args.email_capacity))
+
+
+if __name__ == "__main__":
+    main()
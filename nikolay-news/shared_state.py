@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+State shared between forked worker processes
+Both structures live in anonymous shared memory created before the workers
+fork (see serve.py), so every worker sees the same values without a server
+round trip.
+"""
+
+import ctypes
+import hashlib
+import multiprocessing
+from typing import Iterable
+
+
+class SharedCounter:
+    """Monotonic counter, e.g. a generation number that invalidates per-process caches."""
+
+    def __init__(self):
+        self._value = multiprocessing.RawValue(ctypes.c_uint64, 0)
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def value(self) -> int:
+        # An aligned 64-bit read needs no lock
+        return self._value.value
+
+    def increment(self) -> int:
+        with self._lock:
+            self._value.value += 1
+            return self._value.value
+
+
+class SharedEmailSet:
+    """Fixed-capacity set of lower-cased emails shared by worker processes.
+
+    Stores 64-bit BLAKE2 hashes in an open-addressing table of 8-byte slots,
+    sized to the power of two that keeps ``capacity`` at most 75% full: about
+    11 to 21 bytes per email at ``capacity`` (16.8 at the default 1M, a 16 MiB
+    table). Two different emails collide with probability around n²/2⁶⁵,
+    which is negligible for registration-sized sets. ``add``
+    is atomic across processes, so exactly one worker claims a new email.
+    """
+
+    def __init__(self, capacity: int = 1_000_000):
+        self.capacity = capacity
+        # Power-of-two table kept at most 75% full so probe chains stay short
+        slots = 1
+        while slots * 3 < capacity * 4:
+            slots *= 2
+        self._mask = slots - 1
+        self._table = multiprocessing.RawArray(ctypes.c_uint64, slots)
+        self._count = multiprocessing.RawValue(ctypes.c_uint64, 0)
+        self._lock = multiprocessing.Lock()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+
+    def _slot(self, value: int) -> int:
+        """Slot holding ``value``, or the empty slot where it would go."""
+        table, mask = self._table, self._mask
+        i = value & mask
+        while table[i] and table[i] != value:
+            i = (i + 1) & mask
+        return i
+
+    def __contains__(self, key: str) -> bool:
+        value = self._hash(key)
+        return self._table[self._slot(value)] == value
+
+    def __len__(self) -> int:
+        return self._count.value
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; True if it was new, False if any process added it before.
+
+        Raises OverflowError once ``capacity`` emails are stored.
+        """
+        value = self._hash(key)
+        with self._lock:
+            i = self._slot(value)
+            if self._table[i] == value:
+                return False
+            if self._count.value >= self.capacity:
+                raise OverflowError(f"Shared email set is full ({self.capacity} emails)")
+            self._table[i] = value
+            self._count.value += 1
+            return True
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local SMTP sink for offline outreach runs
+Speaks enough SMTP (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) for
+smtplib, accepts every message and throws it away, counting connections and
+messages so throughput can be measured without sending real mail.
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+from typing import List, Tuple
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """One SMTP session; behaviour comes from ``self.server.config``."""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 smtp-sink ESMTP ready")
+        recipients: List[str] = []
+        sender = None
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+
+            if verb == "EHLO":
+                self.wfile.write(b"250-smtp-sink\r\n250-8BITMIME\r\n250-SMTPUTF8\r\n250 SIZE 52428800\r\n")
+                self.wfile.flush()
+            elif verb == "HELO":
+                self.reply("250 smtp-sink")
+            elif verb == "MAIL":
+                sender = command[10:].strip()
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:].strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                if sender is None or not recipients:
+                    self.reply("503 Need MAIL and RCPT first")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b".\r\n", b".\n"):
+                        break
+                    size += len(data)
+                time.sleep(server.config["delay"])
+                with server.lock:
+                    server.messages += 1
+                    server.bytes += size
+                    if server.config["keep"]:
+                        server.received.append((sender, list(recipients)))
+                if server.config["verbose"]:
+                    print(f"Accepted {size} bytes from {sender} to {', '.join(recipients)}")
+                sender, recipients = None, []
+                self.reply("250 OK queued")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], delay: float = 0.0, keep: bool = False,
+                 verbose: bool = False):
+        super().__init__(address, SMTPSinkHandler)
+        self.config = {"delay": delay, "keep": keep, "verbose": verbose}
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+        self.received: List[Tuple[str, List[str]]] = []
+
+    def stats(self):
+        return {"connections": self.connections, "messages": self.messages, "bytes": self.bytes}
+
+
+def start_sink(host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, keep: bool = False,
+               verbose: bool = False) -> SMTPSink:
+    """Start the sink on a background thread and return it.
+
+    Use ``port=0`` to pick a free port; the bound port is ``sink.server_address[1]``.
+    ``delay`` simulates per-message server latency. Call ``sink.shutdown()`` when done.
+    """
+    sink = SMTPSink((host, port), delay=delay, keep=keep, verbose=verbose)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    return sink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local SMTP server that discards mail")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=1025, help="Port (default: 1025)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to hold each message")
+    args = parser.parse_args()
+
+    sink = start_sink(args.host, args.port, delay=args.delay, verbose=True)
+    print(f"SMTP sink listening on {args.host}:{sink.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        sink.shutdown()
+        print(sink.stats())
+
+
+if __name__ == "__main__":
+    main()
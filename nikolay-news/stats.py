@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Small statistics helpers shared by the news tools and the benchmarks
+"""
+
+from typing import List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Registration storage backends (MySQL for production, SQLite for local runs)
+"""
+
+import base64
+import contextlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from db import ConnectionPool
+
+# Columns that may be requested through field projection
+REGISTRATION_FIELDS = ("id", "email", "name", "organization", "registration_date")
+
+# Keyset position: (registration_date, id) of the last row returned
+Cursor = Tuple[str, int]
+
+
+def encode_cursor(position: Cursor) -> str:
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = json.dumps([str(position[0]), position[1]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a token produced by ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        registration_date, row_id = json.loads(raw)
+        return str(registration_date), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+class RegistrationStore:
+    """Storage interface for hack event registrations.
+
+    Query methods take a connection as their first argument so they can be
+    handed straight to ``ConnectionPool.run``.
+    """
+
+    # Driver exception base class, caught by the API layer
+    Error = Exception
+
+    def connect(self):
+        """Open a new connection to the backing database."""
+        raise NotImplementedError
+
+    def validate(self, connection) -> bool:
+        """Return True if a connection is still usable after an error."""
+        return True
+
+    def setup(self) -> bool:
+        """Apply pending schema migrations (see migrations.py); True on success."""
+        from migrations import migrate
+        try:
+            migrate(self)
+            return True
+        except self.Error as e:
+            print(f"Error setting up database: {e}")
+            return False
+
+    def create_database(self):
+        """Create the database itself, for backends where it must exist before connecting."""
+
+    def table_exists(self, connection, table: str) -> bool:
+        raise NotImplementedError
+
+    def index_exists(self, connection, table: str, index: str) -> bool:
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def schema_lock(self, connection):
+        """Hold off other migration runs; commits on success, rolls back on error."""
+        raise NotImplementedError
+
+    def schema_version(self, connection) -> int:
+        """Newest migration applied to this database, 0 if none."""
+        if not self.table_exists(connection, "schema_version"):
+            return 0
+        rows = self._query(connection, "SELECT MAX(version) AS version FROM schema_version", ())
+        return int(rows[0]["version"] or 0)
+
+    def ping(self, connection) -> bool:
+        """Round-trip a trivial query, for readiness checks."""
+        return bool(self._query(connection, "SELECT 1 AS ok", ()))
+
+    def insert_registration(self, connection, email: str, name: Optional[str],
+                            organization: Optional[str]) -> bool:
+        """Insert a registration in one statement; return False if the email exists."""
+        raise NotImplementedError
+
+    def insert_registrations(self, connection, rows: Sequence[Tuple[str, Optional[str], Optional[str]]]) -> int:
+        """Insert (email, name, organization) rows with multi-row INSERTs in one transaction.
+
+        Emails that already exist are skipped; returns the number of rows inserted.
+        """
+        inserted = 0
+        p = self.placeholder
+        for start in range(0, len(rows), self.max_batch_rows):
+            chunk = rows[start:start + self.max_batch_rows]
+            values = ", ".join([f"({p}, {p}, {p})"] * len(chunk))
+            sql = (f"INSERT INTO registrations (email, name, organization) VALUES {values} "
+                   f"{self.skip_duplicates_clause}")
+            inserted += self._execute(connection, sql, tuple(v for row in chunk for v in row))
+        connection.commit()
+        return inserted
+
+    def load_emails(self, connection) -> set:
+        """Return every registered email, lower-cased, for duplicate checks."""
+        raise NotImplementedError
+
+    def fetch_registrations_page(self, connection, limit: int, after: Optional[Cursor] = None,
+                                 fields: Sequence[str] = REGISTRATION_FIELDS
+                                 ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """Return one page of registrations, newest first, and the next cursor.
+
+        Rows are ordered on (registration_date, id) and resumed with a keyset
+        condition, so every page is an index range scan regardless of depth.
+        """
+        columns = list(dict.fromkeys(list(fields) + ["registration_date", "id"]))
+        rows = self._query(connection, self._select_sql(columns, after, limit + 1),
+                           self._keyset_params(after))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (str(rows[-1]["registration_date"]), rows[-1]["id"])
+        return [{field: row[field] for field in fields} for row in rows], next_cursor
+
+    def iter_registrations(self, connection, after: Optional[Cursor] = None,
+                           fields: Sequence[str] = REGISTRATION_FIELDS,
+                           batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Yield registrations in batches straight off the cursor, newest first."""
+        raise NotImplementedError
+
+    def _select_sql(self, columns: Sequence[str], after: Optional[Cursor], limit: Optional[int] = None) -> str:
+        p = self.placeholder
+        sql = f"SELECT {', '.join(columns)} FROM registrations"
+        if after:
+            sql += f" WHERE registration_date < {p} OR (registration_date = {p} AND id < {p})"
+        sql += " ORDER BY registration_date DESC, id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return sql
+
+    @staticmethod
+    def _keyset_params(after: Optional[Cursor]) -> tuple:
+        return (after[0], after[0], after[1]) if after else ()
+
+    def _query(self, connection, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _execute(self, connection, sql: str, params: tuple) -> int:
+        raise NotImplementedError
+
+    def create_pool(self, size: int = 10, timeout: float = 5.0) -> ConnectionPool:
+        """Create a connection pool bound to this store."""
+        return ConnectionPool(self.connect, size=size, timeout=timeout,
+                              validate=self.validate, name=self.name)
+
+
+class MySQLRegistrationStore(RegistrationStore):
+    """Registrations stored in MySQL via mysql.connector."""
+
+    name = "mysql"
+    placeholder = "%s"
+    max_batch_rows = 1000
+    # No-op update: skips duplicate emails without hiding other errors like INSERT IGNORE would
+    skip_duplicates_clause = "ON DUPLICATE KEY UPDATE id = id"
+
+    def __init__(self, config: Dict[str, Any]):
+        import mysql.connector
+        from mysql.connector import errorcode
+
+        self._mysql = mysql.connector
+        self._duplicate_errno = errorcode.ER_DUP_ENTRY
+        self.Error = mysql.connector.Error
+        self.config = config
+
+    def connect(self):
+        return self._mysql.connect(**self.config)
+
+    def validate(self, connection) -> bool:
+        return connection.is_connected()
+
+    def create_database(self):
+        # Connect without selecting a database so it can be created first
+        config = {k: v for k, v in self.config.items() if k != "database"}
+        connection = self._mysql.connect(**config)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.config['database']}")
+            cursor.close()
+        finally:
+            connection.close()
+
+    def table_exists(self, connection, table):
+        return bool(self._query(
+            connection,
+            "SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+            (table,)))
+
+    def index_exists(self, connection, table, index):
+        return bool(self._query(
+            connection,
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+            (table, index)))
+
+    @contextlib.contextmanager
+    def schema_lock(self, connection):
+        # DDL commits implicitly in MySQL, so serialize runs with a named lock
+        # instead of a transaction; migrations must therefore be re-runnable
+        name = f"{self.config['database']}.schema_migrations"
+        rows = self._query(connection, "SELECT GET_LOCK(%s, 60) AS locked", (name,))
+        if not rows or rows[0]["locked"] != 1:
+            raise self._mysql.OperationalError(msg="Timed out waiting for another migration run")
+        try:
+            yield
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            self._query(connection, "SELECT RELEASE_LOCK(%s) AS released", (name,))
+
+    def insert_registration(self, connection, email, name, organization):
+        cursor = connection.cursor()
+        try:
+            # The UNIQUE constraint on email does the duplicate check atomically
+            cursor.execute(
+                "INSERT INTO registrations (email, name, organization) VALUES (%s, %s, %s)",
+                (email, name, organization),
+            )
+            connection.commit()
+            return True
+        except self._mysql.IntegrityError as e:
+            connection.rollback()
+            if e.errno == self._duplicate_errno:
+                return False
+            raise
+        finally:
+            cursor.close()
+
+    def _query(self, connection, sql, params):
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _execute(self, connection, sql, params):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def load_emails(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT email FROM registrations")
+            return {email.lower() for (email,) in cursor}
+        finally:
+            cursor.close()
+
+    def iter_registrations(self, connection, after=None, fields=REGISTRATION_FIELDS, batch_size=500):
+        # Unbuffered cursor: rows are read from the socket as each batch is fetched
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(self._select_sql(fields, after), self._keyset_params(after))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+
+class SQLiteRegistrationStore(RegistrationStore):
+    """Registrations stored in an embedded SQLite file, for local runs and benchmarks."""
+
+    name = "sqlite"
+    placeholder = "?"
+    # Stay under SQLite's default limit of 999 bound parameters per statement
+    max_batch_rows = 333
+    skip_duplicates_clause = "ON CONFLICT (email) DO NOTHING"
+    Error = sqlite3.Error
+
+    def __init__(self, path: str = "registrations.db"):
+        self.path = path
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def table_exists(self, connection, table):
+        return bool(self._query(
+            connection, "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)))
+
+    def index_exists(self, connection, table, index):
+        return bool(self._query(
+            connection, "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name = ?",
+            (table, index)))
+
+    @contextlib.contextmanager
+    def schema_lock(self, connection):
+        # SQLite DDL is transactional: the whole run commits or rolls back as one
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+
+    def insert_registration(self, connection, email, name, organization):
+        try:
+            # The UNIQUE constraint on email does the duplicate check atomically
+            connection.execute(
+                "INSERT INTO registrations (email, name, organization) VALUES (?, ?, ?)",
+                (email, name, organization),
+            )
+            connection.commit()
+            return True
+        except sqlite3.IntegrityError as e:
+            connection.rollback()
+            if "UNIQUE" in str(e):
+                return False
+            raise
+
+    def _query(self, connection, sql, params):
+        return [dict(row) for row in connection.execute(sql, params).fetchall()]
+
+    def _execute(self, connection, sql, params):
+        return connection.execute(sql, params).rowcount
+
+    def load_emails(self, connection):
+        return {row[0].lower() for row in connection.execute("SELECT email FROM registrations")}
+
+    def iter_registrations(self, connection, after=None, fields=REGISTRATION_FIELDS, batch_size=500):
+        cursor = connection.execute(self._select_sql(fields, after), self._keyset_params(after))
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+        finally:
+            cursor.close()
+
+
+def db_config_from_env() -> Dict[str, Any]:
+    """MySQL connection settings from the DB_* environment variables."""
+    return {
+        'host': os.getenv("DB_HOST", "localhost"),
+        'user': os.getenv("DB_USER", "root"),
+        'password': os.getenv("DB_PASSWORD", ""),
+        'database': os.getenv("DB_NAME", "nikolay_hack_event")
+    }
+
+
+def create_store(db_config: Dict[str, Any]) -> RegistrationStore:
+    """Pick the storage backend from the DB_BACKEND environment variable."""
+    backend = os.getenv("DB_BACKEND", "mysql").lower()
+    if backend == "mysql":
+        return MySQLRegistrationStore(db_config)
+    if backend == "sqlite":
+        return SQLiteRegistrationStore(os.getenv("SQLITE_PATH", "registrations.db"))
+    raise ValueError(f"Unknown DB_BACKEND '{backend}'. Use 'mysql' or 'sqlite'.")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Write-behind registration queue
+Acknowledges signups from memory and persists them in batched multi-row INSERTs.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the pending queue is at capacity and the signup cannot be accepted."""
+
+
+class RegistrationWriteBehind:
+    """In-process queue that batches registrations into multi-row INSERTs.
+
+    Duplicate emails are rejected from an in-memory set warmed from the table
+    at startup, so callers keep the same 400 semantics without a round trip.
+    Under serve.py every worker passes the same SharedEmailSet, already warmed
+    by the master, so a duplicate is caught whichever worker receives it.
+    Pending rows live only in memory: anything not yet flushed is lost if the
+    process dies, which is the trade-off for acknowledging before commit.
+    """
+
+    def __init__(self, pool, store, batch_size: int = 200, flush_interval: float = 0.5,
+                 max_pending: int = 10000, emails=None, warm_emails: bool = True):
+        self.pool = pool
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.emails = emails if emails is not None else set()
+        self.warm_emails = warm_emails
+        self._pending = deque()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.accepted = 0
+        self.duplicates = 0
+        self.flushed = 0
+        self.batches = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    async def start(self):
+        """Warm the duplicate set from the table (unless already warm) and start the flush task."""
+        if self.warm_emails:
+            self.emails.update(await self.pool.run(self.store.load_emails))
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, email: str, name: Optional[str], organization: Optional[str]) -> bool:
+        """Queue a registration; return False if the email is already registered."""
+        # Case-insensitive, matching MySQL's default collation on the UNIQUE column
+        key = email.lower()
+        if key in self.emails:
+            self.duplicates += 1
+            return False
+        if len(self._pending) >= self.max_pending:
+            raise QueueFullError(f"{len(self._pending)} registrations already pending")
+
+        try:
+            # A shared set also reports whether another worker claimed the
+            # email since the check above; a plain set.add returns None
+            if self.emails.add(key) is False:
+                self.duplicates += 1
+                return False
+        except OverflowError as e:
+            raise QueueFullError(str(e)) from e
+        self._pending.append((email, name, organization))
+        self.accepted += 1
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            while self._pending and not self._stopping:
+                if not await self._flush_batch():
+                    break
+
+    async def _flush_batch(self) -> bool:
+        """Write up to ``batch_size`` pending rows; on failure keep them queued for the next round."""
+        count = min(self.batch_size, len(self._pending))
+        batch = [self._pending.popleft() for _ in range(count)]
+        start = time.perf_counter()
+        try:
+            await self.pool.run(self.store.insert_registrations, batch)
+        except Exception as e:
+            self.flush_failures += 1
+            self._pending.extendleft(reversed(batch))
+            print(f"Error flushing {count} queued registrations: {e}")
+            return False
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        self.flushed += count
+        self.batches += 1
+        return True
+
+    async def stop(self):
+        """Stop the flush task and write out everything still pending."""
+        self._stopping = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+        while self._pending:
+            if not await self._flush_batch():
+                print(f"Warning: {len(self._pending)} queued registrations were not persisted")
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and flush metrics."""
+        return {
+            "pending": len(self._pending),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "known_emails": len(self.emails),
+        }